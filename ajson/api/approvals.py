@@ -13,6 +13,7 @@ from ajson.hands.approval import (
     ApprovalGrant,
     ApprovalStatus
 )
+from ajson.hands.grant_cache import revoke_grant as revoke_approval_grant
 from ajson.api.auth import verify_approval_auth
 
 router = APIRouter(prefix="/api/approvals", tags=["approvals"])
@@ -144,3 +145,14 @@ async def get_grant(grant_id: str):
     if not grant:
         raise HTTPException(status_code=404, detail="Grant not found or expired")
     return ApprovalGrantResponse(**grant.to_dict())
+
+
+@router.post("/grants/{grant_id}/revoke")
+async def revoke_grant(
+    grant_id: str,
+    _auth: bool = Depends(verify_approval_auth)
+):
+    """Revoke a grant before it expires (in every process, via the SSOT)"""
+    if not revoke_approval_grant(grant_id):
+        raise HTTPException(status_code=404, detail="Grant not found or expired")
+    return {"status": "revoked", "grant_id": grant_id}
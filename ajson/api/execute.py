@@ -3,8 +3,10 @@ API endpoint for limited execution with approval grants
 """
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, List
 
+from ajson.hands.grant_cache import get_grant_cache
+from ajson.hands.result_cache import get_result_cache
 from ajson.hands.runner import ToolRunner
 from ajson.hands.policy import PolicyDeniedError
 
@@ -18,6 +20,18 @@ class ExecuteLimitedRequest(BaseModel):
     args: Dict[str, Any]
 
 
+class BatchOperation(BaseModel):
+    """One operation of a batch"""
+    tool_name: str
+    args: Dict[str, Any]
+
+
+class ExecuteBatchRequest(BaseModel):
+    """Request to execute several operations under one approval grant"""
+    grant_id: str
+    operations: List[BatchOperation]
+
+
 @router.post("/execute_limited")
 async def execute_limited(req: ExecuteLimitedRequest):
     """
@@ -28,11 +42,14 @@ async def execute_limited(req: ExecuteLimitedRequest):
     - ALLOWLIST operations only
     - NETWORK always DENY
     - shell=False, timeout, cwd restrictions
+    
+    The command runs as an asyncio subprocess, so other requests keep being
+    served while it runs.
     """
     runner = ToolRunner(dry_run=False)
     
     try:
-        result = runner.execute_tool_limited(
+        result = await runner.execute_tool_limited_async(
             grant_id=req.grant_id,
             tool_name=req.tool_name,
             args=req.args
@@ -44,3 +61,49 @@ async def execute_limited(req: ExecuteLimitedRequest):
         raise HTTPException(status_code=403, detail=f"Operation denied: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Execution error: {e}")
+
+
+@router.post("/execute_batch")
+async def execute_batch(req: ExecuteBatchRequest):
+    """
+    Execute several operations with one approval grant (LIMITED mode)
+    
+    Every operation gets the execute_limited checks before any of them runs;
+    if one is rejected the whole batch is (400/403, naming the operation).
+    The commands then run in parallel, bounded by LIMITED_EXEC_CONCURRENCY.
+    
+    Returns:
+        {"grant_id": ..., "results": [...]} with results in request order
+    """
+    runner = ToolRunner(dry_run=False)
+    
+    try:
+        results = await runner.execute_batch_async(
+            grant_id=req.grant_id,
+            operations=[op.model_dump() for op in req.operations]
+        )
+        return {"grant_id": req.grant_id, "results": results}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PolicyDeniedError as e:
+        raise HTTPException(status_code=403, detail=f"Operation denied: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Execution error: {e}")
+
+
+@router.get("/result_cache")
+async def result_cache_stats():
+    """Hit/miss counters of the read-only result cache (TOOL_RESULT_CACHE=1)"""
+    cache = get_result_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.get("/grant_cache")
+async def grant_cache_stats():
+    """Hit ratio and invalidation counters of the verified-grant cache (GRANT_CACHE=1)"""
+    cache = get_grant_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
@@ -1,19 +1,48 @@
 """
 FastAPI application for AJSON MVP
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query
+from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
+from datetime import datetime
 from pathlib import Path
+from contextlib import asynccontextmanager
+import json
 import os
 import uuid
 
 from ajson import db, orchestrator
+from ajson.engine import ENGINE_MODE, get_engine, shutdown_engine, submit_mission
+from ajson.event_relay import start_event_relay, stop_event_relay
+from ajson.events import get_event_bus, Subscription
 from ajson.models import MissionStatus, MissionCreate
+from ajson.hands.approval_sqlite import close_approval_store
+from ajson.hands.audit_logger import close_audit_logger
+from ajson.tools.exec_pool import shutdown_exec_pool
 
-app = FastAPI(title="AJSON Mission API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan: migrate schema and resume queued/interrupted missions on startup; drain missions and release pooled DB connections on shutdown"""
+    db.migrate()
+    if ENGINE_MODE == "worker":
+        # Missions run in `python -m ajson.worker` processes; relay their events to SSE
+        start_event_relay()
+    else:
+        get_engine().start()
+    yield
+    stop_event_relay()
+    shutdown_engine()
+    shutdown_exec_pool()
+    close_approval_store()
+    close_audit_logger()
+    db.close_connections()
+
+
+app = FastAPI(title="AJSON Mission API", version="1.0.0", lifespan=lifespan)
 
 # CORS for development
 app.add_middleware(
@@ -59,45 +88,23 @@ class MessageOut(BaseModel):
 def run_to_terminal(mission_id: int):
     """
     Execute mission until terminal state (DONE, PENDING_APPROVAL, or ERROR)
-    """
-    max_iterations = 20  # Safety limit
-    iterations = 0
     
-    while iterations < max_iterations:
-        mission = db.get_mission(mission_id)
-        if not mission:
-            break
-        
-        status = mission["status"]
-        
-        # Terminal states
-        if status in [MissionStatus.DONE, MissionStatus.PENDING_APPROVAL, MissionStatus.ERROR]:
-            break
-        
-        try:
-            orchestrator.execute_mission(mission_id)
-        except Exception as e:
-            # Mark as error on failure
-            db.update_mission_status(mission_id, MissionStatus.ERROR)
-            break
-        
-        iterations += 1
+    Runs synchronously under the engine's per-mission lease.
+    """
+    return get_engine().run_to_terminal(mission_id)
 
 
 # API Endpoints
 @app.post("/missions")
-def create_mission(mission: MissionCreate, background_tasks: BackgroundTasks):
+def create_mission(mission: MissionCreate):
     """
-    Create a new mission and execute it in the background
+    Create a new mission and execute it on the mission engine
     
     Returns:
         { "mission_id": int }
     """
     from datetime import datetime
     
-    # Initialize database
-    db.init_db()
-    
     # Auto-generate title if empty
     title = mission.title
     if not title or title.strip() == "":
@@ -110,18 +117,58 @@ def create_mission(mission: MissionCreate, background_tasks: BackgroundTasks):
         description=mission.description
     )
     
-    # Run in background to avoid blocking UI
-    background_tasks.add_task(run_to_terminal, mission_id)
+    # Run on the engine to avoid blocking UI
+    submit_mission(mission_id)
     
     return {"mission_id": mission_id}
 
 
 
+@app.get("/missions")
+def list_missions(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+):
+    """
+    List missions (newest first) with cursor pagination
+    
+    Args:
+        limit: Page size (1-200)
+        cursor: next_cursor from the previous page
+        status: Filter by mission status
+        created_after / created_before: Filter by creation time
+    
+    Returns:
+        {
+            "missions": [{id, title, status, created_at, updated_at}, ...],
+            "next_cursor": str or null
+        }
+    """
+    try:
+        return db.list_missions_page(
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            created_after=created_after,
+            created_before=created_before
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.get("/missions/{mission_id}")
-def get_mission(mission_id: int):
+def get_mission(mission_id: int, include_content: bool = True):
     """
     Get mission status and details
     
+    Args:
+        include_content: If false, omit step input/output and artifact content
+            (fetch them via /missions/{id}/steps/{step_id} and
+            /missions/{id}/artifacts/{artifact_id})
+    
     Returns:
         {
             "mission": {...},
@@ -130,20 +177,108 @@ def get_mission(mission_id: int):
             "artifacts": [...]
         }
     """
-    mission = db.get_mission(mission_id)
-    if not mission:
+    snapshot = db.get_mission_snapshot(mission_id, include_content=include_content)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail=f"Mission {mission_id} not found")
+    
+    return snapshot
+
+
+# Mission event stream (SSE)
+SSE_HEARTBEAT_SECONDS = 15
+SSE_TERMINAL_STATUSES = (MissionStatus.DONE, MissionStatus.ERROR)
+
+
+def _sse(event_type: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Format one Server-Sent Event"""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _mission_event_stream(mission_id: int, subscription: Subscription, snapshot: Dict[str, Any]):
+    """
+    Yield the initial snapshot, then live mission events until a terminal status
+    
+    Events may repeat rows already in the snapshot (the subscription opens
+    first so nothing is missed); clients upsert by id.
+    """
+    try:
+        yield _sse("snapshot", snapshot)
+        if snapshot["mission"]["status"] in SSE_TERMINAL_STATUSES:
+            return
+        
+        while True:
+            if subscription.overflowed:
+                # Events were dropped for this slow client: ask it to refetch
+                subscription.overflowed = False
+                yield _sse("resync", {"mission_id": mission_id})
+            
+            event = await subscription.get(timeout=SSE_HEARTBEAT_SECONDS)
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            
+            yield _sse(event["type"], {"mission_id": mission_id, **event["data"]}, event["id"])
+            if event["type"] == "mission_status" and event["data"]["status"] in SSE_TERMINAL_STATUSES:
+                return
+    finally:
+        get_event_bus().unsubscribe(subscription)
+
+
+@app.get("/missions/{mission_id}/events")
+async def mission_events(mission_id: int):
+    """
+    Stream mission changes as Server-Sent Events
+    
+    Event types:
+        snapshot: initial lightweight snapshot (same shape as GET /missions/{id}?include_content=false)
+        mission_status, step, step_updated, approval, approval_updated,
+        artifact, chat_message: incremental changes as they are committed
+        tool_output: live output chunks of a running tool command
+        resync: events were dropped; refetch the snapshot
+    
+    The stream ends after DONE or ERROR.
+    """
+    bus = get_event_bus()
+    subscription = bus.subscribe(mission_id)
+    snapshot = await run_in_threadpool(db.get_mission_snapshot, mission_id, False)
+    if not snapshot:
+        bus.unsubscribe(subscription)
         raise HTTPException(status_code=404, detail=f"Mission {mission_id} not found")
     
-    steps = db.get_steps_by_mission(mission_id)
-    approvals = db.get_pending_approvals(mission_id)
-    artifacts = db.get_artifacts_by_mission(mission_id)
+    return StreamingResponse(
+        _mission_event_stream(mission_id, subscription, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/missions/{mission_id}/steps/{step_id}")
+def get_mission_step(mission_id: int, step_id: int):
+    """
+    Get a single step with its full input/output
+    
+    Returns:
+        {id, mission_id, role, input_data, output_data, status, created_at}
+    """
+    step = db.get_step(step_id)
+    if not step or step["mission_id"] != mission_id:
+        raise HTTPException(status_code=404, detail=f"Step {step_id} not found in mission {mission_id}")
+    return step
+
+
+@app.get("/missions/{mission_id}/artifacts/{artifact_id}")
+def get_mission_artifact(mission_id: int, artifact_id: int):
+    """
+    Get a single artifact with its content
     
-    return {
-        "mission": mission,
-        "steps": steps,
-        "approvals": approvals,
-        "artifacts": artifacts
-    }
+    Returns:
+        {id, mission_id, artifact_type, path, content, created_at}
+    """
+    artifact = db.get_artifact(artifact_id)
+    if not artifact or artifact["mission_id"] != mission_id:
+        raise HTTPException(status_code=404, detail=f"Artifact {artifact_id} not found in mission {mission_id}")
+    return artifact
 
 
 @app.get("/healthz")
@@ -158,7 +293,7 @@ def healthz():
 
 
 @app.post("/missions/{mission_id}/approve")
-def approve_mission(mission_id: int, decision: ApprovalDecision, background_tasks: BackgroundTasks):
+def approve_mission(mission_id: int, decision: ApprovalDecision):
     """
     Approve or reject a pending mission
     
@@ -182,8 +317,8 @@ def approve_mission(mission_id: int, decision: ApprovalDecision, background_task
         # Approve and resume
         orchestrator.approve_mission(mission_id)
         
-        # Continue execution in background
-        background_tasks.add_task(run_to_terminal, mission_id)
+        # Continue execution on the engine
+        submit_mission(mission_id)
         
         return {
             "status": "approved",
@@ -216,8 +351,6 @@ def get_mission_messages(mission_id: int):
             "messages": [...]
         }
     """
-    db.init_db()
-    
     # Verify mission exists
     mission = db.get_mission(mission_id)
     if not mission:
@@ -232,7 +365,7 @@ def get_mission_messages(mission_id: int):
 
 
 @app.post("/missions/{mission_id}/messages")
-def create_mission_message(mission_id: int, message: MessageCreate, background_tasks: BackgroundTasks):
+def create_mission_message(mission_id: int, message: MessageCreate):
     """
     Send a message and trigger orchestrator
     
@@ -241,8 +374,6 @@ def create_mission_message(mission_id: int, message: MessageCreate, background_t
     """
     import json
     
-    db.init_db()
-    
     # Verify mission exists
     mission = db.get_mission(mission_id)
     if not mission:
@@ -257,10 +388,9 @@ def create_mission_message(mission_id: int, message: MessageCreate, background_t
         attachments_json=attachments_json
     )
     
-    # Trigger orchestrator in background
-    # Note: Check for existing lock to prevent double execution
-    # For MVP, run_to_terminal already has max iteration protection
-    background_tasks.add_task(run_to_terminal, mission_id)
+    # Trigger orchestrator; the engine's per-mission lease prevents double
+    # execution (a mission already running just goes round once more)
+    submit_mission(mission_id)
     
     return {"message_id": msg_id, "mission_id": mission_id}
 
@@ -316,7 +446,6 @@ async def upload_file(file: UploadFile = File(...)):
         f.write(content)
     
     # Store in database
-    db.init_db()
     db.create_upload(
         upload_id=upload_id,
         original_name=safe_filename,
@@ -865,6 +994,8 @@ def console():
         <script>
             let currentMissionId = null;
             let pollInterval = null;
+            let eventSource = null;
+            let missionState = null;  // Latest snapshot, kept current by push events
             
             // Initialize on page load
             document.addEventListener('DOMContentLoaded', () => {
@@ -877,7 +1008,7 @@ def console():
                     if (!isNaN(parsedId) && parsedId > 0) {
                         currentMissionId = parsedId;
                         updateMissionStatusDisplay();
-                        startPolling();
+                        startUpdates();
                         loadMessages();
                     } else {
                         console.error('Invalid mission_id in URL:', missionIdFromUrl);
@@ -1073,8 +1204,8 @@ def console():
                         // Update mission status display
                         updateMissionStatusDisplay();
                         
-                        // Start polling (with guard)
-                        startPolling();
+                        // Start mission updates (with guard)
+                        startUpdates();
                     }
                     
                     // Send message
@@ -1369,8 +1500,8 @@ def console():
                     document.getElementById('missionId').textContent = currentMissionId;
                     document.getElementById('missionTitle').textContent = title;
                     
-                    // Start polling
-                    startPolling();
+                    // Start mission updates
+                    startUpdates();
                     
                     // Load messages for chat UI
                     loadMessages();
@@ -1382,6 +1513,78 @@ def console():
                 }
             });
             
+            // Mission updates: push events (SSE) first, 1s polling only as fallback
+            function startUpdates() {
+                if (window.EventSource) {
+                    startEvents();
+                } else {
+                    startPolling();
+                }
+            }
+            
+            function stopUpdates() {
+                if (eventSource) {
+                    eventSource.close();
+                    eventSource = null;
+                }
+                if (pollInterval) {
+                    clearInterval(pollInterval);
+                    pollInterval = null;
+                }
+            }
+            
+            function startEvents() {
+                // Guard: one stream (or fallback poller) per page
+                if (eventSource || pollInterval) {
+                    return;
+                }
+                
+                eventSource = new EventSource(`/missions/${currentMissionId}/events`);
+                
+                eventSource.addEventListener('snapshot', (e) => {
+                    missionState = JSON.parse(e.data);
+                    renderStatus(missionState);
+                });
+                eventSource.addEventListener('mission_status', (e) => applyEvent(e, (ev) => {
+                    missionState.mission.status = ev.status;
+                }));
+                eventSource.addEventListener('step', (e) => applyEvent(e, (ev) => upsertById(missionState.steps, ev)));
+                eventSource.addEventListener('step_updated', (e) => applyEvent(e, (ev) => upsertById(missionState.steps, ev)));
+                eventSource.addEventListener('approval', (e) => applyEvent(e, (ev) => {
+                    if (ev.status === 'PENDING') upsertById(missionState.approvals, ev);
+                }));
+                eventSource.addEventListener('approval_updated', (e) => applyEvent(e, (ev) => {
+                    missionState.approvals = missionState.approvals.filter(a => a.id !== ev.id);
+                }));
+                eventSource.addEventListener('artifact', (e) => applyEvent(e, (ev) => upsertById(missionState.artifacts, ev)));
+                eventSource.addEventListener('chat_message', () => loadMessages());
+                eventSource.addEventListener('resync', () => updateStatus());
+                
+                eventSource.onerror = () => {
+                    // Stream unavailable or dropped: fall back to polling
+                    if (eventSource) {
+                        eventSource.close();
+                        eventSource = null;
+                    }
+                    startPolling();
+                };
+            }
+            
+            function applyEvent(e, apply) {
+                if (!missionState) return;
+                apply(JSON.parse(e.data));
+                renderStatus(missionState);
+            }
+            
+            function upsertById(list, item) {
+                const index = list.findIndex(x => x.id === item.id);
+                if (index >= 0) {
+                    list[index] = { ...list[index], ...item };
+                } else {
+                    list.push(item);
+                }
+            }
+            
             function startPolling() {
                 // Polling guard (補強①): prevent double intervals
                 if (pollInterval) {
@@ -1401,65 +1604,67 @@ def console():
                 if (!currentMissionId) return;
                 
                 try {
-                    const response = await fetch(`/missions/${currentMissionId}`);
-                    const data = await response.json();
-                    
-                    const mission = data.mission;
-                    const status = mission.status.toLowerCase().replace(/_/g, '_');
-                    
-                    // Japanese status mapping
-                    const statusLabels = {
-                        'CREATED': '作成済(CREATED)',
-                        'PLANNED': '計画済(PLANNED)',
-                        'PRE_AUDIT': '事前監査中(PRE_AUDIT)',
-                        'EXECUTE': '実行中(EXECUTE)',
-                        'POST_AUDIT': '事後監査中(POST_AUDIT)',
-                        'FINALIZE': '最終処理中(FINALIZE)',
-                        'DONE': '完了(DONE)',
-                        'PENDING_APPROVAL': '承認待ち(PENDING_APPROVAL)',
-                        'ERROR': 'エラー(ERROR)'
-                    };
-                    
-                    const displayStatus = statusLabels[mission.status] || mission.status;
-                    
-                    // Update status badge
-                    document.getElementById('missionStatus').innerHTML = 
-                        `<span class="status-badge ${status}">${displayStatus}</span>`;
-                    
-                    // Update steps
-                    const stepsList = document.getElementById('stepsList');
-                    stepsList.innerHTML = data.steps.map(step => `
-                        <div class="step-item">
-                            <strong>${step.role}</strong>: ${step.status}
-                        </div>
-                    `).join('');
-                    
-                    // Check for approvals
-                    const approvalSection = document.getElementById('approvalSection');
-                    if (data.approvals && data.approvals.length > 0) {
-                        const approval = data.approvals[0];
-                        document.getElementById('approvalType').textContent = approval.gate_type;
-                        document.getElementById('approvalReason').textContent = approval.reason;
-                        approvalSection.style.display = 'block';
-                    } else {
-                        approvalSection.style.display = 'none';
-                    }
-                    
-                    // Stop polling if done
-                    if (mission.status === 'DONE' || mission.status === 'ERROR') {
-                        clearInterval(pollInterval);
-                        
-                        // Re-enable submit button
-                        const submitBtn = document.getElementById('submitBtn');
-                        submitBtn.disabled = false;
-                        submitBtn.textContent = 'ミッション作成';
-                    }
-                    
+                    const response = await fetch(`/missions/${currentMissionId}?include_content=false`);
+                    missionState = await response.json();
+                    renderStatus(missionState);
                 } catch (error) {
                     console.error('Error updating status:', error);
                 }
             }
             
+            function renderStatus(data) {
+                const mission = data.mission;
+                const status = mission.status.toLowerCase().replace(/_/g, '_');
+                
+                // Japanese status mapping
+                const statusLabels = {
+                    'CREATED': '作成済(CREATED)',
+                    'PLANNED': '計画済(PLANNED)',
+                    'PRE_AUDIT': '事前監査中(PRE_AUDIT)',
+                    'EXECUTE': '実行中(EXECUTE)',
+                    'POST_AUDIT': '事後監査中(POST_AUDIT)',
+                    'FINALIZE': '最終処理中(FINALIZE)',
+                    'DONE': '完了(DONE)',
+                    'PENDING_APPROVAL': '承認待ち(PENDING_APPROVAL)',
+                    'ERROR': 'エラー(ERROR)'
+                };
+                
+                const displayStatus = statusLabels[mission.status] || mission.status;
+                
+                // Update status badge
+                document.getElementById('missionStatus').innerHTML = 
+                    `<span class="status-badge ${status}">${displayStatus}</span>`;
+                
+                // Update steps
+                const stepsList = document.getElementById('stepsList');
+                stepsList.innerHTML = data.steps.map(step => `
+                    <div class="step-item">
+                        <strong>${step.role}</strong>: ${step.status}
+                    </div>
+                `).join('');
+                
+                // Check for approvals
+                const approvalSection = document.getElementById('approvalSection');
+                if (data.approvals && data.approvals.length > 0) {
+                    const approval = data.approvals[0];
+                    document.getElementById('approvalType').textContent = approval.gate_type;
+                    document.getElementById('approvalReason').textContent = approval.reason;
+                    approvalSection.style.display = 'block';
+                } else {
+                    approvalSection.style.display = 'none';
+                }
+                
+                // Stop updates if done
+                if (mission.status === 'DONE' || mission.status === 'ERROR') {
+                    stopUpdates();
+                    
+                    // Re-enable submit button
+                    const submitBtn = document.getElementById('submitBtn');
+                    submitBtn.disabled = false;
+                    submitBtn.textContent = 'ミッション作成';
+                }
+            }
+            
             async function approve(decision) {
                 if (!currentMissionId) return;
                 
@@ -1473,11 +1678,11 @@ def console():
                     const data = await response.json();
                     
                     if (decision === 'yes') {
-                        // Resume polling
-                        startPolling();
+                        // Resume mission updates
+                        startUpdates();
                     } else {
-                        // Stop polling if rejected
-                        clearInterval(pollInterval);
+                        // Stop updates if rejected
+                        stopUpdates();
                     }
                     
                 } catch (error) {
@@ -2,28 +2,217 @@
 SQLite database operations for AJSON MVP
 """
 import sqlite3
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import threading
+import time
+import base64
+import json
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Iterator
 import os
 
+from ajson.events import get_event_bus
+
 
 DB_PATH = os.getenv("DB_PATH", "./ajson.db")
 
+# Connection tuning (applied once per pooled connection)
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL").upper()
+DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "16384"))
+DB_BUSY_TIMEOUT = float(os.getenv("DB_BUSY_TIMEOUT", "5.0"))
+
+# Also record mission events in the mission_events outbox table, for
+# subscribers in other processes (set by worker processes)
+EVENT_OUTBOX = os.getenv("EVENT_OUTBOX", "0") == "1"
+
+_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+class ConnectionPool:
+    """
+    Per-thread pool of long-lived SQLite connections
+
+    Each thread reuses one connection for its lifetime instead of paying a
+    connect/teardown per CRUD call. Connections owned by threads that have
+    exited are reclaimed when a new one is opened, so the pool stays bounded
+    by the number of live worker threads.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: Dict[int, tuple] = {}  # thread ident -> (thread, conn)
+        # In-memory databases are private to each connection, so every
+        # connection needs its own schema
+        self._schema_ready = False
+        self._per_connection_schema = db_path == ":memory:"
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        # check_same_thread=False only so close_all() can run from the
+        # shutdown thread; each connection is still used by its owner only
+        conn = sqlite3.connect(self.db_path, timeout=DB_BUSY_TIMEOUT, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        synchronous = DB_SYNCHRONOUS if DB_SYNCHRONOUS in _SYNCHRONOUS_MODES else "NORMAL"
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={synchronous}")
+        conn.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KB}")
+        return conn
+
+    def get(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        conn = self._open()
+        if self._per_connection_schema or not self._schema_ready:
+            _apply_migrations(conn)
+            self._schema_ready = True
+        current = threading.current_thread()
+        with self._lock:
+            self._reap_dead_threads()
+            self._connections[current.ident] = (current, conn)
+        self._local.conn = conn
+        return conn
+
+    def _reap_dead_threads(self):
+        """Close connections whose owning thread has exited (lock held)"""
+        for ident, (thread, conn) in list(self._connections.items()):
+            if not thread.is_alive():
+                conn.close()
+                del self._connections[ident]
+
+    def size(self) -> int:
+        """Number of open pooled connections"""
+        with self._lock:
+            return len(self._connections)
+
+    def close_all(self):
+        """Close every pooled connection (shutdown hook)"""
+        with self._lock:
+            for _, conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+        # Threads that call get() again will transparently reconnect
+        self._local = threading.local()
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Get the process-wide connection pool for the current DB_PATH"""
+    global _pool
+    pool = _pool
+    if pool is not None and pool.db_path == DB_PATH:
+        return pool
+
+    with _pool_lock:
+        if _pool is None or _pool.db_path != DB_PATH:
+            if _pool is not None:
+                _pool.close_all()
+            _pool = ConnectionPool(DB_PATH)
+        return _pool
+
 
 def get_connection():
-    """Get database connection"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get the calling thread's pooled database connection"""
+    return get_pool().get()
 
 
-def init_db():
-    """Initialize database schema"""
+# Per-thread transaction nesting depth and events deferred until commit
+_tx_state = threading.local()
+
+
+def _in_transaction() -> bool:
+    """True if the calling thread is inside db.transaction()"""
+    return getattr(_tx_state, "depth", 0) > 0
+
+
+def _commit(conn: sqlite3.Connection):
+    """Commit unless the write is part of an enclosing transaction()"""
+    if not _in_transaction():
+        conn.commit()
+
+
+def _wants_events(mission_id: Optional[int] = None) -> bool:
+    """True if a change event would reach anyone (local subscriber or outbox)"""
+    return EVENT_OUTBOX or get_event_bus().has_subscribers(mission_id)
+
+
+def _emit(mission_id: int, event_type: str, data: Dict[str, Any]):
+    """Publish a committed change; inside transaction() wait for the commit"""
+    if EVENT_OUTBOX:
+        # Written with the change when inside transaction(), so the outbox
+        # never shows an event that was rolled back
+        conn = get_connection()
+        conn.execute(
+            "INSERT INTO mission_events (mission_id, event_type, data_json, created_at) VALUES (?, ?, ?, ?)",
+            (mission_id, event_type, json.dumps(data), time.time())
+        )
+        _commit(conn)
+    if not get_event_bus().has_subscribers(mission_id):
+        return
+    if _in_transaction():
+        _tx_state.events.append((mission_id, event_type, data))
+    else:
+        get_event_bus().publish(mission_id, event_type, data)
+
+
+@contextmanager
+def transaction():
+    """
+    Unit-of-work: batch all CRUD writes in the block into one commit
+
+    Usage:
+        with db.transaction() as tx:
+            step_id = db.create_step(...)
+            db.update_mission_status(...)
+
+    The write lock is taken up front (BEGIN IMMEDIATE). Nested blocks join
+    the outermost transaction; an exception rolls back everything. Mission
+    events raised by the writes are published only after the commit.
+    """
     conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Missions table
-    cursor.execute("""
+    depth = getattr(_tx_state, "depth", 0)
+    if depth == 0:
+        conn.execute("BEGIN IMMEDIATE")
+        _tx_state.events = []
+    _tx_state.depth = depth + 1
+    try:
+        yield conn
+    except BaseException:
+        _tx_state.depth = depth
+        if depth == 0:
+            conn.rollback()
+            _tx_state.events = []
+        raise
+    _tx_state.depth = depth
+    if depth == 0:
+        conn.commit()
+        pending, _tx_state.events = _tx_state.events, []
+        for mission_id, event_type, data in pending:
+            get_event_bus().publish(mission_id, event_type, data)
+
+
+def close_connections():
+    """Close all pooled connections (called on application shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
+
+
+# Versioned schema migrations: (version, description, statements)
+# Append new entries; never edit a migration that has shipped.
+MIGRATIONS = [
+    (1, "initial schema", [
+        # Missions table
+        """
         CREATE TABLE IF NOT EXISTS missions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             title TEXT NOT NULL,
@@ -32,10 +221,9 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
-    """)
-    
-    # Steps table
-    cursor.execute("""
+        """,
+        # Steps table
+        """
         CREATE TABLE IF NOT EXISTS steps (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             mission_id INTEGER NOT NULL,
@@ -46,10 +234,9 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (mission_id) REFERENCES missions (id)
         )
-    """)
-    
-    # Tool runs table
-    cursor.execute("""
+        """,
+        # Tool runs table
+        """
         CREATE TABLE IF NOT EXISTS tool_runs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             step_id INTEGER NOT NULL,
@@ -60,10 +247,9 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (step_id) REFERENCES steps (id)
         )
-    """)
-    
-    # Approvals table
-    cursor.execute("""
+        """,
+        # Approvals table
+        """
         CREATE TABLE IF NOT EXISTS approvals (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             mission_id INTEGER NOT NULL,
@@ -74,10 +260,9 @@ def init_db():
             approved_at TIMESTAMP,
             FOREIGN KEY (mission_id) REFERENCES missions (id)
         )
-    """)
-    
-    # Artifacts table
-    cursor.execute("""
+        """,
+        # Artifacts table
+        """
         CREATE TABLE IF NOT EXISTS artifacts (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             mission_id INTEGER NOT NULL,
@@ -87,10 +272,9 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (mission_id) REFERENCES missions (id)
         )
-    """)
-    
-    # Memories table
-    cursor.execute("""
+        """,
+        # Memories table
+        """
         CREATE TABLE IF NOT EXISTS memories (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             mission_id INTEGER NOT NULL,
@@ -99,10 +283,9 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (mission_id) REFERENCES missions (id)
         )
-    """)
-    
-    # Uploads table
-    cursor.execute("""
+        """,
+        # Uploads table
+        """
         CREATE TABLE IF NOT EXISTS uploads (
             id TEXT PRIMARY KEY,
             original_name TEXT NOT NULL,
@@ -111,10 +294,9 @@ def init_db():
             mime_type TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
-    """)
-    
-    # Messages table (Phase6B)
-    cursor.execute("""
+        """,
+        # Messages table (Phase6B)
+        """
         CREATE TABLE IF NOT EXISTS messages (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             mission_id INTEGER NOT NULL,
@@ -124,10 +306,157 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (mission_id) REFERENCES missions (id)
         )
+        """,
+    ]),
+    (2, "indexes for mission/step lookups", [
+        # Hot-query indexes: every per-mission read filters on mission_id
+        # and orders by created_at (messages order by id, i.e. rowid, which
+        # a plain mission_id index already covers)
+        "CREATE INDEX IF NOT EXISTS idx_steps_mission_created ON steps (mission_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_artifacts_mission_created ON artifacts (mission_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_memories_mission_created ON memories (mission_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_messages_mission ON messages (mission_id)",
+        "CREATE INDEX IF NOT EXISTS idx_approvals_mission_status ON approvals (mission_id, status, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tool_runs_step_created ON tool_runs (step_id, created_at)",
+    ]),
+    (3, "indexes for keyset mission listing", [
+        "CREATE INDEX IF NOT EXISTS idx_missions_created_id ON missions (created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_missions_status_created_id ON missions (status, created_at, id)",
+    ]),
+    (4, "durable mission job queue", [
+        # One row per pending run request; claimed rows carry the worker
+        # that holds them and an epoch-seconds heartbeat
+        """
+        CREATE TABLE IF NOT EXISTS mission_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mission_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            claimed_by TEXT,
+            heartbeat_at REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (mission_id) REFERENCES missions (id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_mission_jobs_status_id ON mission_jobs (status, id)",
+        "CREATE INDEX IF NOT EXISTS idx_mission_jobs_mission_status ON mission_jobs (mission_id, status)",
+    ]),
+    (5, "mission event outbox", [
+        # Events written by worker processes, tailed by the API process for
+        # its SSE subscribers; created_at is epoch seconds (for pruning)
+        """
+        CREATE TABLE IF NOT EXISTS mission_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mission_id INTEGER NOT NULL,
+            event_type TEXT NOT NULL,
+            data_json TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_mission_events_created ON mission_events (created_at)",
+    ]),
+    (6, "incremental post-audit verdicts", [
+        # One row per post-audit step: the verdict and the last tool run it
+        # covered, so a re-audit only scans runs after that checkpoint
+        """
+        CREATE TABLE IF NOT EXISTS audit_verdicts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mission_id INTEGER NOT NULL,
+            step_id INTEGER NOT NULL,
+            last_tool_run_id INTEGER NOT NULL,
+            runs_audited INTEGER NOT NULL,
+            approved INTEGER NOT NULL,
+            reason TEXT,
+            gate_type TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (mission_id) REFERENCES missions (id),
+            FOREIGN KEY (step_id) REFERENCES steps (id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_audit_verdicts_mission ON audit_verdicts (mission_id, id)",
+    ]),
+    (7, "tool run output spill files", [
+        # result holds capped output (head + tail); the full streams, when
+        # capped, are in these files
+        "ALTER TABLE tool_runs ADD COLUMN output_bytes INTEGER",
+        "ALTER TABLE tool_runs ADD COLUMN stdout_path TEXT",
+        "ALTER TABLE tool_runs ADD COLUMN stderr_path TEXT",
+    ]),
+    (8, "grant revocations", [
+        # Append-only log tailed by every process's verified-grant cache
+        """
+        CREATE TABLE IF NOT EXISTS grant_revocations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            grant_id TEXT NOT NULL,
+            revoked_at REAL NOT NULL
+        )
+        """,
+    ]),
+]
+
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    """Current schema version recorded in schema_version (0 if none)"""
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def _apply_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Apply pending migrations on conn and return the resulting version
+
+    Safe to race: the version is re-read under the write lock, so concurrent
+    callers (threads or processes) apply each migration exactly once.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
     """)
-    
-    conn.commit()
-    conn.close()
+    latest = MIGRATIONS[-1][0]
+    if _schema_version(conn) >= latest:
+        return latest
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        current = _schema_version(conn)
+        for version, description, statements in MIGRATIONS:
+            if version <= current:
+                continue
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (version, description)
+            )
+            current = version
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return current
+
+
+def migrate() -> int:
+    """
+    Bring the schema up to date (run once at application startup)
+
+    Returns:
+        Schema version after migrating
+    """
+    return _apply_migrations(get_connection())
+
+
+def get_schema_version() -> int:
+    """Get the schema version of the current database"""
+    return _schema_version(get_connection())
+
+
+def init_db():
+    """Initialize database schema (kept for callers predating migrate())"""
+    migrate()
 
 
 # Mission CRUD
@@ -140,8 +469,8 @@ def create_mission(title: str, description: str) -> int:
         (title, description, "CREATED")
     )
     mission_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    _commit(conn)
+    cursor.close()
     return mission_id
 
 
@@ -151,7 +480,7 @@ def get_mission(mission_id: int) -> Optional[Dict[str, Any]]:
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM missions WHERE id = ?", (mission_id,))
     row = cursor.fetchone()
-    conn.close()
+    cursor.close()
     return dict(row) if row else None
 
 
@@ -163,8 +492,9 @@ def update_mission_status(mission_id: int, status: str):
         "UPDATE missions SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
         (status, mission_id)
     )
-    conn.commit()
-    conn.close()
+    _commit(conn)
+    cursor.close()
+    _emit(mission_id, "mission_status", {"status": status})
 
 
 def list_missions() -> List[Dict[str, Any]]:
@@ -173,10 +503,105 @@ def list_missions() -> List[Dict[str, Any]]:
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM missions ORDER BY created_at DESC")
     rows = cursor.fetchall()
-    conn.close()
+    cursor.close()
     return [dict(row) for row in rows]
 
 
+# Columns returned by the mission listing (description is left out on purpose)
+MISSION_LIST_COLUMNS = ("id", "title", "status", "created_at", "updated_at")
+
+
+def encode_mission_cursor(created_at: str, mission_id: int) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor"""
+    raw = f"{created_at}|{mission_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_mission_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor from encode_mission_cursor()
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, mission_id = base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+        return created_at, int(mission_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def _sql_timestamp(value: datetime) -> str:
+    """Format a datetime the way SQLite CURRENT_TIMESTAMP stores it (UTC)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def list_missions_page(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    List missions newest first with keyset pagination on (created_at, id)
+
+    Every page is a bounded index range scan, so page N costs the same as
+    page 1.
+
+    Args:
+        limit: Page size
+        cursor: next_cursor from the previous page (None for the first page)
+        status: Only missions in this status
+        created_after: Only missions created at or after this time
+        created_before: Only missions created before this time
+
+    Returns:
+        { "missions": [...], "next_cursor": str or None }
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    clauses = []
+    params: List[Any] = []
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    if created_after:
+        clauses.append("created_at >= ?")
+        params.append(_sql_timestamp(created_after))
+    if created_before:
+        clauses.append("created_at < ?")
+        params.append(_sql_timestamp(created_before))
+    if cursor:
+        clauses.append("(created_at, id) < (?, ?)")
+        params.extend(decode_mission_cursor(cursor))
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    columns = ", ".join(MISSION_LIST_COLUMNS)
+
+    conn = get_connection()
+    cur = conn.cursor()
+    # Fetch one extra row to know whether another page exists
+    cur.execute(
+        f"SELECT {columns} FROM missions {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+        (*params, limit + 1)
+    )
+    rows = cur.fetchall()
+    cur.close()
+
+    missions = [dict(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = missions[-1]
+        next_cursor = encode_mission_cursor(last["created_at"], last["id"])
+
+    return {"missions": missions, "next_cursor": next_cursor}
+
+
 # Step CRUD
 def create_step(mission_id: int, role: str, input_data: str, status: str = "PENDING") -> int:
     """Create a new step"""
@@ -187,8 +612,9 @@ def create_step(mission_id: int, role: str, input_data: str, status: str = "PEND
         (mission_id, role, input_data, status)
     )
     step_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    _commit(conn)
+    cursor.close()
+    _emit(mission_id, "step", {"id": step_id, "role": role, "status": status})
     return step_id
 
 
@@ -200,8 +626,15 @@ def update_step(step_id: int, output_data: str, status: str):
         "UPDATE steps SET output_data = ?, status = ? WHERE id = ?",
         (output_data, status, step_id)
     )
-    conn.commit()
-    conn.close()
+    if _wants_events():
+        cursor.execute("SELECT mission_id, role FROM steps WHERE id = ?", (step_id,))
+        row = cursor.fetchone()
+    else:
+        row = None
+    _commit(conn)
+    cursor.close()
+    if row:
+        _emit(row["mission_id"], "step_updated", {"id": step_id, "role": row["role"], "status": status})
 
 
 def get_steps_by_mission(mission_id: int) -> List[Dict[str, Any]]:
@@ -210,33 +643,50 @@ def get_steps_by_mission(mission_id: int) -> List[Dict[str, Any]]:
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM steps WHERE mission_id = ? ORDER BY created_at", (mission_id,))
     rows = cursor.fetchall()
-    conn.close()
+    cursor.close()
     return [dict(row) for row in rows]
 
 
 # ToolRun CRUD
 def create_tool_run(step_id: int, command: str, result: Optional[str] = None, 
-                   blocked: bool = False, block_reason: Optional[str] = None) -> int:
-    """Create a new tool run"""
+                   blocked: bool = False, block_reason: Optional[str] = None,
+                   output_bytes: Optional[int] = None, stdout_path: Optional[str] = None,
+                   stderr_path: Optional[str] = None) -> int:
+    """
+    Create a new tool run
+    
+    Args:
+        result: Output as stored (capped to head + tail for large output)
+        output_bytes: Full output size
+        stdout_path, stderr_path: Spill files with the full streams, if capped
+    """
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
-        "INSERT INTO tool_runs (step_id, command, result, blocked, block_reason) VALUES (?, ?, ?, ?, ?)",
-        (step_id, command, result, blocked, block_reason)
+        """
+        INSERT INTO tool_runs (step_id, command, result, blocked, block_reason, output_bytes, stdout_path, stderr_path)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (step_id, command, result, blocked, block_reason, output_bytes, stdout_path, stderr_path)
     )
     run_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    _commit(conn)
+    cursor.close()
     return run_id
 
 
+def publish_tool_output(mission_id: int, command: str, stream: str, chunk: str):
+    """Publish a live output chunk of a running tool command (event only; the tool run keeps the capped result)"""
+    _emit(mission_id, "tool_output", {"command": command, "stream": stream, "chunk": chunk})
+
+
 def get_tool_runs_by_step(step_id: int) -> List[Dict[str, Any]]:
     """Get all tool runs for a step"""
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM tool_runs WHERE step_id = ? ORDER BY created_at", (step_id,))
     rows = cursor.fetchall()
-    conn.close()
+    cursor.close()
     return [dict(row) for row in rows]
 
 
@@ -251,10 +701,70 @@ def get_tool_runs_by_mission(mission_id: int) -> List[Dict[str, Any]]:
         ORDER BY tr.created_at
     """, (mission_id,))
     rows = cursor.fetchall()
-    conn.close()
+    cursor.close()
     return [dict(row) for row in rows]
 
 
+def iter_tool_runs_by_mission(mission_id: int, after_id: int = 0,
+                              page_size: int = 100) -> Iterator[Dict[str, Any]]:
+    """
+    Stream a mission's tool runs with id > after_id, oldest first
+
+    Reads in keyset pages so only one page is held in memory at a time.
+    """
+    while True:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT tr.* FROM tool_runs tr
+            JOIN steps s ON tr.step_id = s.id
+            WHERE s.mission_id = ? AND tr.id > ?
+            ORDER BY tr.id
+            LIMIT ?
+        """, (mission_id, after_id, page_size))
+        rows = cursor.fetchall()
+        cursor.close()
+        for row in rows:
+            yield dict(row)
+        if len(rows) < page_size:
+            return
+        after_id = rows[-1]["id"]
+
+
+# Audit verdict CRUD
+def create_audit_verdict(mission_id: int, step_id: int, last_tool_run_id: int, runs_audited: int,
+                         approved: bool, reason: Optional[str], gate_type: Optional[str]) -> int:
+    """Record the verdict of a post-audit step and the tool runs it covered"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO audit_verdicts
+            (mission_id, step_id, last_tool_run_id, runs_audited, approved, reason, gate_type)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (mission_id, step_id, last_tool_run_id, runs_audited, int(approved), reason, gate_type))
+    verdict_id = cursor.lastrowid
+    _commit(conn)
+    cursor.close()
+    return verdict_id
+
+
+def get_latest_audit_verdict(mission_id: int) -> Optional[Dict[str, Any]]:
+    """Get the most recent post-audit verdict of a mission"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT * FROM audit_verdicts WHERE mission_id = ? ORDER BY id DESC LIMIT 1",
+        (mission_id,)
+    )
+    row = cursor.fetchone()
+    cursor.close()
+    if not row:
+        return None
+    verdict = dict(row)
+    verdict["approved"] = bool(verdict["approved"])
+    return verdict
+
+
 # Approval CRUD
 def create_approval(mission_id: int, gate_type: str, reason: str) -> int:
     """Create a new approval request"""
@@ -265,8 +775,11 @@ def create_approval(mission_id: int, gate_type: str, reason: str) -> int:
         (mission_id, gate_type, reason, "PENDING")
     )
     approval_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    _commit(conn)
+    cursor.close()
+    _emit(mission_id, "approval", {
+        "id": approval_id, "gate_type": gate_type, "reason": reason, "status": "PENDING"
+    })
     return approval_id
 
 
@@ -278,8 +791,15 @@ def approve_approval(approval_id: int):
         "UPDATE approvals SET status = ?, approved_at = CURRENT_TIMESTAMP WHERE id = ?",
         ("APPROVED", approval_id)
     )
-    conn.commit()
-    conn.close()
+    if _wants_events():
+        cursor.execute("SELECT mission_id FROM approvals WHERE id = ?", (approval_id,))
+        row = cursor.fetchone()
+    else:
+        row = None
+    _commit(conn)
+    cursor.close()
+    if row:
+        _emit(row["mission_id"], "approval_updated", {"id": approval_id, "status": "APPROVED"})
 
 
 def get_pending_approvals(mission_id: int) -> List[Dict[str, Any]]:
@@ -291,7 +811,7 @@ def get_pending_approvals(mission_id: int) -> List[Dict[str, Any]]:
         (mission_id, "PENDING")
     )
     rows = cursor.fetchall()
-    conn.close()
+    cursor.close()
     return [dict(row) for row in rows]
 
 
@@ -305,8 +825,9 @@ def create_artifact(mission_id: int, artifact_type: str, path: str, content: str
         (mission_id, artifact_type, path, content)
     )
     artifact_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    _commit(conn)
+    cursor.close()
+    _emit(mission_id, "artifact", {"id": artifact_id, "artifact_type": artifact_type, "path": path})
     return artifact_id
 
 
@@ -316,7 +837,7 @@ def get_artifacts_by_mission(mission_id: int) -> List[Dict[str, Any]]:
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM artifacts WHERE mission_id = ? ORDER BY created_at", (mission_id,))
     rows = cursor.fetchall()
-    conn.close()
+    cursor.close()
     return [dict(row) for row in rows]
 
 
@@ -330,8 +851,8 @@ def create_memory(mission_id: int, key: str, value: str) -> int:
         (mission_id, key, value)
     )
     memory_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    _commit(conn)
+    cursor.close()
     return memory_id
 
 
@@ -341,10 +862,92 @@ def get_memories_by_mission(mission_id: int) -> List[Dict[str, Any]]:
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM memories WHERE mission_id = ? ORDER BY created_at", (mission_id,))
     rows = cursor.fetchall()
-    conn.close()
+    cursor.close()
     return [dict(row) for row in rows]
 
 
+# Mission snapshot (console polling)
+# Columns kept in lightweight snapshots; the large ones (step input/output,
+# artifact content) are fetched on demand via get_step / get_artifact
+STEP_SUMMARY_COLUMNS = ("id", "mission_id", "role", "status", "created_at")
+ARTIFACT_SUMMARY_COLUMNS = ("id", "mission_id", "artifact_type", "path", "created_at")
+
+
+@contextmanager
+def _read_snapshot():
+    """Run reads against one consistent snapshot (joins an open transaction)"""
+    conn = get_connection()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.commit()
+
+
+def get_mission_snapshot(mission_id: int, include_content: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Load a mission aggregate (mission, steps, pending approvals, artifacts)
+    in a single read transaction
+
+    Args:
+        mission_id: Mission ID
+        include_content: If False, leave out step input_data/output_data and
+            artifact content to keep polling payloads small
+
+    Returns:
+        { "mission", "steps", "approvals", "artifacts" } or None if not found
+    """
+    step_columns = "*" if include_content else ", ".join(STEP_SUMMARY_COLUMNS)
+    artifact_columns = "*" if include_content else ", ".join(ARTIFACT_SUMMARY_COLUMNS)
+
+    with _read_snapshot() as conn:
+        mission = conn.execute("SELECT * FROM missions WHERE id = ?", (mission_id,)).fetchone()
+        if not mission:
+            return None
+        steps = conn.execute(
+            f"SELECT {step_columns} FROM steps WHERE mission_id = ? ORDER BY created_at",
+            (mission_id,)
+        ).fetchall()
+        approvals = conn.execute(
+            "SELECT * FROM approvals WHERE mission_id = ? AND status = ? ORDER BY created_at",
+            (mission_id, "PENDING")
+        ).fetchall()
+        artifacts = conn.execute(
+            f"SELECT {artifact_columns} FROM artifacts WHERE mission_id = ? ORDER BY created_at",
+            (mission_id,)
+        ).fetchall()
+
+    return {
+        "mission": dict(mission),
+        "steps": [dict(row) for row in steps],
+        "approvals": [dict(row) for row in approvals],
+        "artifacts": [dict(row) for row in artifacts]
+    }
+
+
+def get_step(step_id: int) -> Optional[Dict[str, Any]]:
+    """Get step by ID"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM steps WHERE id = ?", (step_id,))
+    row = cursor.fetchone()
+    cursor.close()
+    return dict(row) if row else None
+
+
+def get_artifact(artifact_id: int) -> Optional[Dict[str, Any]]:
+    """Get artifact by ID"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM artifacts WHERE id = ?", (artifact_id,))
+    row = cursor.fetchone()
+    cursor.close()
+    return dict(row) if row else None
+
+
 # Upload CRUD
 def create_upload(upload_id: str, original_name: str, stored_name: str, size: int, mime_type: str = None) -> str:
     """Create a new upload record"""
@@ -354,8 +957,8 @@ def create_upload(upload_id: str, original_name: str, stored_name: str, size: in
         "INSERT INTO uploads (id, original_name, stored_name, size, mime_type) VALUES (?, ?, ?, ?, ?)",
         (upload_id, original_name, stored_name, size, mime_type)
     )
-    conn.commit()
-    conn.close()
+    _commit(conn)
+    cursor.close()
     return upload_id
 
 
@@ -365,7 +968,7 @@ def get_upload(upload_id: str) -> Optional[Dict[str, Any]]:
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM uploads WHERE id = ?", (upload_id,))
     row = cursor.fetchone()
-    conn.close()
+    cursor.close()
     return dict(row) if row else None
 
 
@@ -379,7 +982,7 @@ def get_uploads_by_ids(upload_ids: List[str]) -> List[Dict[str, Any]]:
     placeholders = ','.join('?' * len(upload_ids))
     cursor.execute(f"SELECT * FROM uploads WHERE id IN ({placeholders})", upload_ids)
     rows = cursor.fetchall()
-    conn.close()
+    cursor.close()
     return [dict(row) for row in rows]
 
 
@@ -393,8 +996,9 @@ def create_message(mission_id: int, role: str, content: str, attachments_json: O
         VALUES (?, ?, ?, ?)
     """, (mission_id, role, content, attachments_json))
     message_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    _commit(conn)
+    cursor.close()
+    _emit(mission_id, "chat_message", {"id": message_id, "role": role})
     return message_id
 
 
@@ -408,5 +1012,324 @@ def get_messages(mission_id: int) -> List[Dict[str, Any]]:
         ORDER BY id ASC
     """, (mission_id,))
     rows = cursor.fetchall()
-    conn.close()
+    cursor.close()
     return [dict(row) for row in rows]
+
+
+# Mission job queue
+JOB_QUEUED = "QUEUED"
+JOB_CLAIMED = "CLAIMED"
+
+# Mission statuses a job is still needed for (anything but a stop state)
+ACTIVE_MISSION_STATUSES = ("CREATED", "PLANNED", "PRE_AUDIT", "EXECUTE", "POST_AUDIT", "FINALIZE")
+
+
+def enqueue_mission_job(mission_id: int) -> int:
+    """
+    Queue a run of the mission (idempotent while a run is already queued)
+
+    A mission whose job is currently claimed gets a second, queued job so
+    that it runs again once the current run is acked.
+
+    Returns:
+        Job ID
+    """
+    with transaction() as conn:
+        row = conn.execute(
+            "SELECT id FROM mission_jobs WHERE mission_id = ? AND status = ?",
+            (mission_id, JOB_QUEUED)
+        ).fetchone()
+        if row:
+            return row["id"]
+        cur = conn.execute(
+            "INSERT INTO mission_jobs (mission_id, status) VALUES (?, ?)",
+            (mission_id, JOB_QUEUED)
+        )
+        return cur.lastrowid
+
+
+def claim_mission_job(worker_id: str, mission_id: Optional[int] = None,
+                      now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Claim the oldest queued job (optionally for one mission)
+
+    Jobs of a mission that already has a claimed job are skipped, so at most
+    one worker advances a mission at a time.
+
+    Args:
+        worker_id: Identity of the claiming worker
+        mission_id: Only claim a job for this mission
+        now: Epoch seconds for the initial heartbeat (default: time.time())
+
+    Returns:
+        Claimed job row, or None if nothing is claimable
+    """
+    now = time.time() if now is None else now
+    sql = """
+        SELECT * FROM mission_jobs AS j
+        WHERE j.status = ?
+          AND NOT EXISTS (
+            SELECT 1 FROM mission_jobs AS c
+            WHERE c.mission_id = j.mission_id AND c.status = ?
+          )
+    """
+    params: List[Any] = [JOB_QUEUED, JOB_CLAIMED]
+    if mission_id is not None:
+        sql += " AND j.mission_id = ?"
+        params.append(mission_id)
+    sql += " ORDER BY j.id LIMIT 1"
+
+    with transaction() as conn:
+        row = conn.execute(sql, params).fetchone()
+        if not row:
+            return None
+        conn.execute("""
+            UPDATE mission_jobs
+            SET status = ?, claimed_by = ?, heartbeat_at = ?, attempts = attempts + 1
+            WHERE id = ?
+        """, (JOB_CLAIMED, worker_id, now, row["id"]))
+        job = dict(row)
+    job.update(status=JOB_CLAIMED, claimed_by=worker_id, heartbeat_at=now, attempts=job["attempts"] + 1)
+    return job
+
+
+def heartbeat_mission_jobs(worker_id: str, job_ids: List[int], now: Optional[float] = None) -> int:
+    """
+    Refresh the heartbeat of jobs held by worker_id
+
+    Returns:
+        Number of jobs still held (fewer than len(job_ids) if some were
+        re-queued as stale in the meantime)
+    """
+    if not job_ids:
+        return 0
+    now = time.time() if now is None else now
+    placeholders = ",".join("?" * len(job_ids))
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        UPDATE mission_jobs SET heartbeat_at = ?
+        WHERE claimed_by = ? AND status = ? AND id IN ({placeholders})
+    """, (now, worker_id, JOB_CLAIMED, *job_ids))
+    held = cursor.rowcount
+    _commit(conn)
+    cursor.close()
+    return held
+
+
+def ack_mission_job(job_id: int, worker_id: str) -> bool:
+    """
+    Remove a finished job
+
+    Returns:
+        False if the job was no longer held by worker_id
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "DELETE FROM mission_jobs WHERE id = ? AND claimed_by = ? AND status = ?",
+        (job_id, worker_id, JOB_CLAIMED)
+    )
+    acked = cursor.rowcount > 0
+    _commit(conn)
+    cursor.close()
+    return acked
+
+
+def release_mission_job(job_id: int, worker_id: str) -> bool:
+    """
+    Hand an unfinished job back to the queue (worker shutting down)
+
+    Returns:
+        False if the job was no longer held by worker_id
+    """
+    with transaction() as conn:
+        job = conn.execute(
+            "SELECT mission_id FROM mission_jobs WHERE id = ? AND claimed_by = ? AND status = ?",
+            (job_id, worker_id, JOB_CLAIMED)
+        ).fetchone()
+        if not job:
+            return False
+        queued = conn.execute(
+            "SELECT 1 FROM mission_jobs WHERE mission_id = ? AND status = ?",
+            (job["mission_id"], JOB_QUEUED)
+        ).fetchone()
+        if queued:
+            conn.execute("DELETE FROM mission_jobs WHERE id = ?", (job_id,))
+        else:
+            conn.execute("""
+                UPDATE mission_jobs SET status = ?, claimed_by = NULL, heartbeat_at = NULL
+                WHERE id = ?
+            """, (JOB_QUEUED, job_id))
+    return True
+
+
+def requeue_stale_mission_jobs(stale_after: float, max_attempts: int,
+                               now: Optional[float] = None) -> Dict[str, int]:
+    """
+    Recover jobs whose worker stopped heartbeating (crash or restart)
+
+    Stale jobs go back to the queue, unless the mission already has a queued
+    job (then the stale one is dropped) or the job has been claimed
+    max_attempts times (then the mission is marked ERROR, so a mission that
+    keeps killing its worker cannot loop forever).
+
+    Returns:
+        {"requeued": n, "dropped": n, "failed": n}
+    """
+    now = time.time() if now is None else now
+    counts = {"requeued": 0, "dropped": 0, "failed": 0}
+    with transaction() as conn:
+        stale = conn.execute(
+            "SELECT * FROM mission_jobs WHERE status = ? AND heartbeat_at < ? ORDER BY id",
+            (JOB_CLAIMED, now - stale_after)
+        ).fetchall()
+        for job in stale:
+            queued = conn.execute(
+                "SELECT 1 FROM mission_jobs WHERE mission_id = ? AND status = ?",
+                (job["mission_id"], JOB_QUEUED)
+            ).fetchone()
+            if job["attempts"] >= max_attempts:
+                conn.execute("DELETE FROM mission_jobs WHERE mission_id = ?", (job["mission_id"],))
+                update_mission_status(job["mission_id"], "ERROR")
+                counts["failed"] += 1
+            elif queued:
+                conn.execute("DELETE FROM mission_jobs WHERE id = ?", (job["id"],))
+                counts["dropped"] += 1
+            else:
+                conn.execute("""
+                    UPDATE mission_jobs SET status = ?, claimed_by = NULL, heartbeat_at = NULL
+                    WHERE id = ?
+                """, (JOB_QUEUED, job["id"]))
+                counts["requeued"] += 1
+    return counts
+
+
+def enqueue_orphaned_missions() -> int:
+    """
+    Queue active missions that have no job (e.g. created before the queue
+    existed, or interrupted between create and enqueue)
+
+    Returns:
+        Number of jobs queued
+    """
+    placeholders = ",".join("?" * len(ACTIVE_MISSION_STATUSES))
+    with transaction() as conn:
+        cur = conn.execute(f"""
+            INSERT INTO mission_jobs (mission_id, status)
+            SELECT m.id, ? FROM missions AS m
+            WHERE m.status IN ({placeholders})
+              AND NOT EXISTS (SELECT 1 FROM mission_jobs AS j WHERE j.mission_id = m.id)
+            ORDER BY m.id
+        """, (JOB_QUEUED, *ACTIVE_MISSION_STATUSES))
+        return cur.rowcount
+
+
+def count_mission_jobs(status: Optional[str] = None) -> int:
+    """Count queue rows (optionally by status)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    if status is None:
+        cursor.execute("SELECT COUNT(*) FROM mission_jobs")
+    else:
+        cursor.execute("SELECT COUNT(*) FROM mission_jobs WHERE status = ?", (status,))
+    count = cursor.fetchone()[0]
+    cursor.close()
+    return count
+
+
+# Mission event outbox (cross-process events)
+def get_latest_mission_event_id() -> int:
+    """Highest outbox event ID (0 if empty)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT MAX(id) FROM mission_events")
+    latest = cursor.fetchone()[0] or 0
+    cursor.close()
+    return latest
+
+
+def get_mission_events_after(after_id: int, limit: int = 500) -> List[Dict[str, Any]]:
+    """
+    Outbox events with id > after_id, oldest first
+
+    Returns:
+        [{id, mission_id, type, data}]
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id, mission_id, event_type, data_json FROM mission_events
+        WHERE id > ? ORDER BY id LIMIT ?
+    """, (after_id, limit))
+    rows = cursor.fetchall()
+    cursor.close()
+    return [
+        {"id": row["id"], "mission_id": row["mission_id"], "type": row["event_type"], "data": json.loads(row["data_json"])}
+        for row in rows
+    ]
+
+
+# Grant revocations (cross-process broadcast)
+def record_grant_revocation(grant_id: str) -> int:
+    """
+    Record that an approval grant was revoked
+
+    Returns:
+        Revocation ID (increasing; see get_grant_revocations_after)
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO grant_revocations (grant_id, revoked_at) VALUES (?, ?)",
+        (grant_id, time.time())
+    )
+    revocation_id = cursor.lastrowid
+    _commit(conn)
+    cursor.close()
+    return revocation_id
+
+
+def get_latest_grant_revocation_id() -> int:
+    """Highest revocation ID (0 if none)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT MAX(id) FROM grant_revocations")
+    latest = cursor.fetchone()[0] or 0
+    cursor.close()
+    return latest
+
+
+def get_grant_revocations_after(after_id: int, limit: int = 500) -> List[Dict[str, Any]]:
+    """
+    Revocations with id > after_id, oldest first
+
+    Returns:
+        [{id, grant_id}]
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT id, grant_id FROM grant_revocations WHERE id > ? ORDER BY id LIMIT ?",
+        (after_id, limit)
+    )
+    rows = cursor.fetchall()
+    cursor.close()
+    return [{"id": row["id"], "grant_id": row["grant_id"]} for row in rows]
+
+
+def prune_mission_events(older_than: float, now: Optional[float] = None) -> int:
+    """
+    Delete outbox events older than `older_than` seconds
+
+    Returns:
+        Number of events deleted
+    """
+    now = time.time() if now is None else now
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM mission_events WHERE created_at < ?", (now - older_than,))
+    deleted = cursor.rowcount
+    _commit(conn)
+    cursor.close()
+    return deleted
@@ -0,0 +1,296 @@
+"""
+Mission execution engine for AJSON MVP
+
+Drives missions from their current status to a stop state (DONE,
+PENDING_APPROVAL, ERROR) on a bounded worker pool, fed by the durable
+mission_jobs queue in the SSOT:
+- submit() only enqueues; a dispatcher thread claims jobs while workers are free
+- At most one worker advances a given mission (enforced by the queue claim)
+- Claimed jobs are heartbeated; jobs of a crashed/restarted process go stale
+  and are re-queued, so interrupted missions resume automatically
+- The mission is loaded once per run; each transition hands the new status
+  to the next in memory instead of re-reading the SSOT
+- shutdown() stops claiming and drains in-flight runs; queued jobs stay in
+  the SSOT for the next start
+
+ENGINE_MODE selects where missions run:
+- "inline" (default): the API process runs its own engine
+- "worker": the API process only enqueues; `python -m ajson.worker`
+  processes claim and run the jobs (see ajson/worker.py)
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from ajson import db, orchestrator
+from ajson.models import MissionStatus
+
+
+ENGINE_MODE = os.getenv("ENGINE_MODE", "inline")
+ENGINE_WORKERS = int(os.getenv("ENGINE_WORKERS", "4"))
+MAX_TRANSITIONS = 20  # Safety limit per run
+
+# Queue tuning (seconds)
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1.0"))
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "5.0"))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "30.0"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+# How long outbox events are kept (only written in worker processes)
+EVENT_RETENTION_SECONDS = float(os.getenv("EVENT_RETENTION_SECONDS", "3600"))
+
+STOP_STATUSES = (MissionStatus.DONE, MissionStatus.PENDING_APPROVAL, MissionStatus.ERROR)
+
+logger = logging.getLogger("ajson.engine")
+
+
+def make_worker_id() -> str:
+    """Unique identity for this engine's queue claims (host:pid:nonce)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class MissionEngine:
+    """Bounded worker pool that runs queued missions to a stop state"""
+
+    def __init__(self, max_workers: int = ENGINE_WORKERS, worker_id: Optional[str] = None):
+        """
+        Initialize engine
+
+        Args:
+            max_workers: Number of missions advanced concurrently
+            worker_id: Identity recorded on claimed jobs (default: generated)
+        """
+        self.max_workers = max_workers
+        self.worker_id = worker_id or make_worker_id()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ajson-mission")
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._active: Dict[int, int] = {}  # Claimed job_id -> mission_id
+        self._accepting = True
+        self._stopping = threading.Event()
+        self._wake = threading.Event()
+        self._dispatcher: Optional[threading.Thread] = None
+
+    def start(self, recover: bool = True) -> Dict[str, int]:
+        """
+        Start dispatching queued jobs
+
+        Args:
+            recover: Re-queue stale claims and queue orphaned missions first
+
+        Returns:
+            Recovery counts (empty if recover is False)
+        """
+        counts = self.recover() if recover else {}
+        self._ensure_dispatcher()
+        self._wake.set()
+        return counts
+
+    def recover(self) -> Dict[str, int]:
+        """Re-queue jobs of dead workers and queue active missions without a job"""
+        counts = db.requeue_stale_mission_jobs(JOB_STALE_SECONDS, JOB_MAX_ATTEMPTS)
+        counts["orphaned"] = db.enqueue_orphaned_missions()
+        if any(counts.values()):
+            logger.info("Recovered mission jobs: %s", counts)
+        return counts
+
+    def submit(self, mission_id: int) -> bool:
+        """
+        Queue a mission run
+
+        If the mission is already running, the queued job runs once the
+        current one is acked instead of a second worker starting.
+
+        Returns:
+            False if the engine is shutting down
+        """
+        with self._lock:
+            if not self._accepting:
+                return False
+        db.enqueue_mission_job(mission_id)
+        self._ensure_dispatcher()
+        self._wake.set()
+        return True
+
+    def run_to_terminal(self, mission_id: int) -> Optional[str]:
+        """
+        Run a mission synchronously on the calling thread
+
+        Returns:
+            Final status, or None if another worker holds the mission
+        """
+        with self._lock:
+            if not self._accepting:
+                return None
+        db.enqueue_mission_job(mission_id)
+        job = db.claim_mission_job(self.worker_id, mission_id=mission_id)
+        if job is None:
+            return None
+        with self._lock:
+            self._active[job["id"]] = mission_id
+        self._ensure_dispatcher()  # Keeps the claim heartbeated
+        return self._run(job)
+
+    def is_active(self, mission_id: int) -> bool:
+        """True if this engine currently runs the mission"""
+        with self._lock:
+            return mission_id in self._active.values()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no mission is running; False on timeout"""
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._active, timeout)
+
+    def _ensure_dispatcher(self):
+        """Start the dispatcher thread on first use"""
+        with self._lock:
+            if self._dispatcher is None and not self._stopping.is_set():
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch_loop, name="ajson-dispatcher", daemon=True
+                )
+                self._dispatcher.start()
+
+    def _dispatch_loop(self):
+        """Claim jobs into free workers; heartbeat claims and reap stale ones"""
+        last_maintenance = 0.0
+        while not self._stopping.is_set():
+            self._wake.wait(JOB_POLL_SECONDS)
+            self._wake.clear()
+            try:
+                now = time.time()
+                if now - last_maintenance >= JOB_HEARTBEAT_SECONDS:
+                    self._maintain()
+                    last_maintenance = now
+                self._fill()
+            except Exception:
+                logger.exception("Mission dispatcher error")
+
+    def _maintain(self):
+        """Refresh our claims and re-queue claims of dead workers"""
+        with self._lock:
+            job_ids = list(self._active)
+        held = db.heartbeat_mission_jobs(self.worker_id, job_ids)
+        if held < len(job_ids):
+            logger.warning("Lost %d mission job claim(s) to stale recovery", len(job_ids) - held)
+        db.requeue_stale_mission_jobs(JOB_STALE_SECONDS, JOB_MAX_ATTEMPTS)
+        if db.EVENT_OUTBOX:
+            db.prune_mission_events(EVENT_RETENTION_SECONDS)
+
+    def _fill(self):
+        """Claim queued jobs until every worker is busy or the queue is empty"""
+        while True:
+            with self._lock:
+                if not self._accepting or len(self._active) >= self.max_workers:
+                    return
+            job = db.claim_mission_job(self.worker_id)
+            if job is None:
+                return
+            with self._lock:
+                self._active[job["id"]] = job["mission_id"]
+            self._executor.submit(self._run, job)
+
+    def _run(self, job: Dict[str, Any]) -> Optional[str]:
+        """Drive the job's mission, ack (or release) the job, free the worker"""
+        mission_id = job["mission_id"]
+        status = None
+        try:
+            status = self._drive(mission_id)
+            if self._stopping.is_set() and status is not None and status not in STOP_STATUSES:
+                # Interrupted by shutdown: hand the mission back to the queue
+                db.release_mission_job(job["id"], self.worker_id)
+            else:
+                db.ack_mission_job(job["id"], self.worker_id)
+        except Exception:
+            # Left claimed: stale recovery retries it (up to JOB_MAX_ATTEMPTS)
+            logger.exception("Mission %s job %s failed", mission_id, job["id"])
+        finally:
+            with self._lock:
+                self._active.pop(job["id"], None)
+                self._idle.notify_all()
+            self._wake.set()  # A worker is free; a re-queued run may be claimable
+        return status
+
+    def _drive(self, mission_id: int) -> Optional[str]:
+        """Advance the mission until it reaches a stop state"""
+        mission = db.get_mission(mission_id)
+        if not mission:
+            return None
+
+        for _ in range(MAX_TRANSITIONS):
+            if mission["status"] in STOP_STATUSES or self._stopping.is_set():
+                break
+            try:
+                mission["status"] = orchestrator.advance_mission(mission)
+            except Exception:
+                # Mark as error on failure
+                logger.exception("Mission %s failed in %s", mission_id, mission["status"])
+                db.update_mission_status(mission_id, MissionStatus.ERROR)
+                mission["status"] = MissionStatus.ERROR
+                break
+
+        return mission["status"]
+
+    def shutdown(self, timeout: float = 30.0) -> bool:
+        """
+        Stop claiming jobs and drain in-flight runs
+
+        Queued jobs stay in the SSOT for the next start. Runs still going
+        after `timeout` stop after their current transition (each transition
+        is committed) and their jobs are re-queued.
+
+        Returns:
+            True if every run finished within the timeout
+        """
+        with self._lock:
+            self._accepting = False
+        drained = self.wait_idle(timeout)
+        self._stopping.set()
+        self._wake.set()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+        return drained
+
+
+# Global engine instance
+_engine: Optional[MissionEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> MissionEngine:
+    """Get global mission engine (created on first use)"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = MissionEngine()
+        return _engine
+
+
+def submit_mission(mission_id: int) -> bool:
+    """
+    Request a mission run according to ENGINE_MODE
+
+    In "worker" mode the job is only queued for the worker processes.
+
+    Returns:
+        False if the local engine is shutting down
+    """
+    if ENGINE_MODE == "worker":
+        db.enqueue_mission_job(mission_id)
+        return True
+    return get_engine().submit(mission_id)
+
+
+def shutdown_engine(timeout: float = 30.0) -> bool:
+    """Drain and discard the global engine (application shutdown)"""
+    global _engine
+    with _engine_lock:
+        engine, _engine = _engine, None
+    if engine is None:
+        return True
+    return engine.shutdown(timeout)
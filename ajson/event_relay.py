@@ -0,0 +1,103 @@
+"""
+Outbox-to-bus event relay for AJSON MVP
+
+When missions run in separate worker processes (python -m ajson.worker),
+their changes are recorded in the mission_events outbox table instead of
+reaching this process's event bus. The relay tails the outbox and publishes
+those events to local subscribers (the SSE streams), so the console stays
+live regardless of where a mission runs.
+"""
+import logging
+import os
+import threading
+from typing import Optional
+
+from ajson import db
+from ajson.events import get_event_bus
+
+
+RELAY_POLL_SECONDS = float(os.getenv("RELAY_POLL_SECONDS", "0.5"))
+RELAY_BATCH_SIZE = 500
+
+logger = logging.getLogger("ajson.event_relay")
+
+
+class MissionEventRelay:
+    """Background thread publishing outbox events to the local event bus"""
+
+    def __init__(self, poll_seconds: float = RELAY_POLL_SECONDS):
+        """
+        Initialize relay
+
+        Args:
+            poll_seconds: Outbox polling interval
+        """
+        self.poll_seconds = poll_seconds
+        self._cursor = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start relaying events written from now on"""
+        self._cursor = db.get_latest_mission_event_id()
+        self._thread = threading.Thread(target=self._loop, name="ajson-event-relay", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the relay thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def poll(self) -> int:
+        """
+        Relay pending outbox events once
+
+        With nobody subscribed the cursor just skips ahead, so a new
+        subscriber is not flooded with history (it starts from a snapshot).
+
+        Returns:
+            Number of events published
+        """
+        bus = get_event_bus()
+        if not bus.has_subscribers():
+            self._cursor = db.get_latest_mission_event_id()
+            return 0
+
+        published = 0
+        while True:
+            events = db.get_mission_events_after(self._cursor, RELAY_BATCH_SIZE)
+            for event in events:
+                bus.publish(event["mission_id"], event["type"], event["data"])
+                self._cursor = event["id"]
+            published += len(events)
+            if len(events) < RELAY_BATCH_SIZE:
+                return published
+
+    def _loop(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Mission event relay error")
+
+
+# Global relay instance (only started when missions run in worker processes)
+_event_relay: Optional[MissionEventRelay] = None
+
+
+def start_event_relay() -> MissionEventRelay:
+    """Start the global relay (idempotent)"""
+    global _event_relay
+    if _event_relay is None:
+        _event_relay = MissionEventRelay()
+        _event_relay.start()
+    return _event_relay
+
+
+def stop_event_relay():
+    """Stop the global relay if running"""
+    global _event_relay
+    relay, _event_relay = _event_relay, None
+    if relay is not None:
+        relay.stop()
@@ -0,0 +1,100 @@
+"""
+In-process mission event bus for AJSON MVP
+
+Publishes SSOT changes (status transitions, steps, approvals, artifacts,
+messages) to live subscribers such as the SSE stream behind
+GET /missions/{id}/events. Publishers run on any thread; each subscriber is
+bound to the asyncio loop that consumes it.
+"""
+import asyncio
+import itertools
+import threading
+from typing import Any, Dict, Optional, Set
+
+
+# Per-subscriber buffer; a slow consumer that overflows it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class Subscription:
+    """A single consumer's view of one mission's events"""
+
+    def __init__(self, mission_id: int, loop: asyncio.AbstractEventLoop, maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        self.mission_id = mission_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def _deliver(self, event: Dict[str, Any]):
+        """Enqueue on the subscriber's loop (never blocks the publisher)"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next event
+
+        Returns:
+            Event dict, or None on timeout
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class MissionEventBus:
+    """Fan-out of mission events to subscribers, keyed by mission_id"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._seq = itertools.count(1)
+
+    def subscribe(self, mission_id: int) -> Subscription:
+        """Subscribe from a running event loop"""
+        sub = Subscription(mission_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(mission_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        """Remove a subscription"""
+        with self._lock:
+            subs = self._subscribers.get(sub.mission_id)
+            if subs:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.mission_id]
+
+    def has_subscribers(self, mission_id: Optional[int] = None) -> bool:
+        """True if anyone listens (to mission_id, or to any mission)"""
+        if mission_id is None:
+            return bool(self._subscribers)
+        return mission_id in self._subscribers
+
+    def publish(self, mission_id: int, event_type: str, data: Dict[str, Any]):
+        """Publish an event to every subscriber of mission_id (thread-safe)"""
+        with self._lock:
+            subs = list(self._subscribers.get(mission_id, ()))
+        if not subs:
+            return
+
+        event = {"id": next(self._seq), "type": event_type, "mission_id": mission_id, "data": data}
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub._deliver, event)
+            except RuntimeError:
+                # Subscriber's loop already closed
+                self.unsubscribe(sub)
+
+
+# Global event bus instance
+_event_bus = MissionEventBus()
+
+
+def get_event_bus() -> MissionEventBus:
+    """Get global mission event bus"""
+    return _event_bus
@@ -7,12 +7,23 @@ Provides:
 - ApprovalGrant: Approved permission with scope/expiry
 - ApprovalStore: In-memory storage for requests/grants
 """
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from enum import Enum
+import heapq
+import itertools
+import os
+import threading
+import time
 import uuid
 
+from ajson.hands.scope import compile_scope, literal
+
+
+# Decided (approved/denied) requests stay readable this long, then are evicted
+DECIDED_REQUEST_RETENTION_SECONDS = float(os.getenv("APPROVAL_DECIDED_RETENTION_SECONDS", "3600"))
+
 
 class ApprovalStatus(Enum):
     """Status of an approval request"""
@@ -67,36 +78,60 @@ class ApprovalGrant:
     granted_by: str = "admin"
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    def __post_init__(self):
+        # Epoch seconds, parsed once (expires_at stays the ISO form for the API)
+        self.expires_ts = datetime.fromisoformat(self.expires_at).timestamp()
+        self._scope = compile_scope(self.scope)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to JSON-serializable dict"""
         return asdict(self)
     
-    def is_expired(self) -> bool:
-        """Check if grant has expired"""
-        now = datetime.now()
-        expires = datetime.fromisoformat(self.expires_at)
-        return now > expires
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Check if grant has expired (now: epoch seconds, default current time)"""
+        return (time.time() if now is None else now) > self.expires_ts
     
     def matches_scope(self, operation: str) -> bool:
-        """Check if operation matches grant scope"""
-        if not self.scope:
-            return True  # Empty scope = matches original operation only
-        for pattern in self.scope:
-            if pattern.lower() in operation.lower():
-                return True
-        return False
+        """Check if operation matches grant scope (glob/prefix patterns, see ajson.hands.scope)"""
+        return self._scope.matches(operation)
 
 
 class ApprovalStore:
     """
     In-memory store for approval requests and grants
     
+    Indexed so that listing costs O(result), not O(history):
+    - pending requests are kept in their own (insertion-ordered) index
+    - grants and decided requests go on a min-heap keyed on the epoch time
+      they stop being served (grant expiry / decision + retention); the heap
+      is purged lazily at the start of each operation, so expired grants and
+      old decisions are evicted and memory stays bounded
+    
     Future: Replace with persistent storage (SQLite/Redis)
     """
     
-    def __init__(self):
+    def __init__(self, decided_retention_seconds: float = DECIDED_REQUEST_RETENTION_SECONDS):
+        self.decided_retention_seconds = decided_retention_seconds
         self.requests: Dict[str, ApprovalRequest] = {}
         self.grants: Dict[str, ApprovalGrant] = {}
+        self._pending: Dict[str, ApprovalRequest] = {}
+        # (evict_at, seq, kind, id) with kind "grant" or "request"
+        self._expiry: List[Tuple[float, int, str, str]] = []
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+    
+    def _schedule(self, evict_at: float, kind: str, item_id: str):
+        heapq.heappush(self._expiry, (evict_at, next(self._seq), kind, item_id))
+    
+    def _purge(self, now: float):
+        """Evict grants past expiry and decided requests past retention"""
+        expiry = self._expiry
+        while expiry and expiry[0][0] < now:
+            _, _, kind, item_id = heapq.heappop(expiry)
+            if kind == "grant":
+                self.grants.pop(item_id, None)
+            else:
+                self.requests.pop(item_id, None)
     
     def create_request(self, operation: str, category: str, reason: str, metadata: Optional[Dict[str, Any]] = None) -> ApprovalRequest:
         """Create a new approval request"""
@@ -112,68 +147,91 @@ class ApprovalStore:
             metadata=metadata or {}
         )
         
-        self.requests[request_id] = request
+        with self._lock:
+            self._purge(time.time())
+            self.requests[request_id] = request
+            self._pending[request_id] = request
         return request
     
     def get_request(self, request_id: str) -> Optional[ApprovalRequest]:
-        """Get approval request by ID"""
-        return self.requests.get(request_id)
+        """Get approval request by ID (decided requests until their retention ends)"""
+        with self._lock:
+            self._purge(time.time())
+            return self.requests.get(request_id)
     
     def list_pending_requests(self) -> List[ApprovalRequest]:
         """List all pending approval requests"""
-        return [r for r in self.requests.values() if r.status == ApprovalStatus.PENDING.value]
+        with self._lock:
+            return list(self._pending.values())
+    
+    def _decide(self, request_id: str) -> Optional[ApprovalRequest]:
+        """Take a request out of the pending index (None if not pending)"""
+        request = self._pending.pop(request_id, None)
+        if request is not None:
+            self._schedule(time.time() + self.decided_retention_seconds, "request", request_id)
+        return request
     
     def approve_request(self, request_id: str, decision: ApprovalDecision) -> Optional[ApprovalGrant]:
         """Approve a request and create grant"""
-        request = self.requests.get(request_id)
-        if not request or request.status != ApprovalStatus.PENDING.value:
-            return None
-        
-        # Update request status
-        request.status = ApprovalStatus.APPROVED.value
-        
-        # Create grant
-        grant_id = str(uuid.uuid4())
-        now = datetime.now()
-        expires = now + timedelta(seconds=decision.ttl_seconds)
-        
-        grant = ApprovalGrant(
-            grant_id=grant_id,
-            request_id=request_id,
-            operation=request.operation,
-            scope=decision.scope or [request.operation],
-            granted_at=now.isoformat(),
-            expires_at=expires.isoformat(),
-            granted_by=decision.decided_by,
-            metadata=request.metadata
-        )
-        
-        self.grants[grant_id] = grant
+        with self._lock:
+            self._purge(time.time())
+            request = self._decide(request_id)
+            if not request:
+                return None
+            
+            # Update request status
+            request.status = ApprovalStatus.APPROVED.value
+            
+            # Create grant
+            grant_id = str(uuid.uuid4())
+            now = datetime.fromtimestamp(time.time())  # Same clock as the expiry heap
+            expires = now + timedelta(seconds=decision.ttl_seconds)
+            
+            grant = ApprovalGrant(
+                grant_id=grant_id,
+                request_id=request_id,
+                operation=request.operation,
+                scope=decision.scope or [literal(request.operation)],
+                granted_at=now.isoformat(),
+                expires_at=expires.isoformat(),
+                granted_by=decision.decided_by,
+                metadata=request.metadata
+            )
+            
+            self.grants[grant_id] = grant
+            self._schedule(grant.expires_ts, "grant", grant_id)
         return grant
     
     def deny_request(self, request_id: str, decision: ApprovalDecision) -> bool:
         """Deny a request"""
-        request = self.requests.get(request_id)
-        if not request or request.status != ApprovalStatus.PENDING.value:
-            return False
-        
-        request.status = ApprovalStatus.DENIED.value
-        request.metadata["denial_reason"] = decision.reason
-        request.metadata["denied_by"] = decision.decided_by
-        request.metadata["denied_at"] = datetime.now().isoformat()
+        with self._lock:
+            self._purge(time.time())
+            request = self._decide(request_id)
+            if not request:
+                return False
+            
+            request.status = ApprovalStatus.DENIED.value
+            request.metadata["denial_reason"] = decision.reason
+            request.metadata["denied_by"] = decision.decided_by
+            request.metadata["denied_at"] = datetime.now().isoformat()
         return True
     
     def get_grant(self, grant_id: str) -> Optional[ApprovalGrant]:
         """Get grant by ID"""
-        grant = self.grants.get(grant_id)
-        if grant and grant.is_expired():
+        now = time.time()
+        with self._lock:
+            self._purge(now)
+            grant = self.grants.get(grant_id)
+        if grant and grant.is_expired(now):
             return None  # Expired grants are not returned
         return grant
     
     def list_active_grants(self) -> List[ApprovalGrant]:
         """List all active (non-expired) grants"""
-        now = datetime.now()
-        return [g for g in self.grants.values() if not g.is_expired()]
+        now = time.time()
+        with self._lock:
+            self._purge(now)  # Leaves only grants with expires_ts >= now
+            return list(self.grants.values())
     
     def verify_grant(self, grant_id: str, operation: str) -> bool:
         """Verify grant is valid for operation"""
@@ -181,6 +239,26 @@ class ApprovalStore:
         if not grant:
             return False
         return grant.matches_scope(operation)
+    
+    def verify_grant_until(self, grant_id: str, operation: str) -> Optional[float]:
+        """verify_grant that also says until when: grant expiry (epoch seconds), or None"""
+        grant = self.get_grant(grant_id)
+        if not grant or not grant.matches_scope(operation):
+            return None
+        return grant.expires_ts
+    
+    def revoke_grant(self, grant_id: str) -> bool:
+        """Revoke a grant before it expires (False if unknown or already expired)"""
+        with self._lock:
+            self._purge(time.time())
+            return self.grants.pop(grant_id, None) is not None
+    
+    def verify_grant_batch(self, grant_id: str, operations: List[str]) -> List[bool]:
+        """verify_grant for several operations with one grant lookup"""
+        grant = self.get_grant(grant_id)
+        if not grant:
+            return [False] * len(operations)
+        return [grant.matches_scope(operation) for operation in operations]
 
 
 # Global singleton instance (for now)
@@ -3,14 +3,31 @@ SQLite-backed approval store (opt-in persistence)
 
 Provides persistent storage for approval requests, grants, and decisions.
 Activated via APPROVAL_STORE_DB environment variable.
+
+One store per database path is shared process-wide (get_approval_store). It keeps
+a single WAL-mode connection, so statements stay in sqlite3's per-connection
+statement cache, and verify_grant is one primary-key read. Expired grants
+are deleted by a background sweeper (via the grants(expires_at) index).
 """
 import sqlite3
 import json
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass, asdict
+from functools import lru_cache
 import os
 
+from ajson.hands.scope import SCOPE_CACHE_SIZE, ScopeMatcher, compile_scope
+
+
+APPROVAL_SWEEP_SECONDS = float(os.getenv("APPROVAL_SWEEP_SECONDS", "60"))
+APPROVAL_DB_BUSY_TIMEOUT = 5.0
+STATEMENT_CACHE_SIZE = 64
+
+_SELECT_GRANT_SCOPE = "SELECT scope, expires_at FROM grants WHERE grant_id = ? AND expires_at > ?"
+_DELETE_EXPIRED_GRANTS = "DELETE FROM grants WHERE expires_at <= ?"
+
 
 @dataclass
 class ApprovalRequest:
@@ -45,21 +62,46 @@ class ApprovalGrant:
 class SQLiteApprovalStore:
     """SQLite-backed approval store"""
     
-    def __init__(self, db_path: str = "data/approvals.db"):
+    def __init__(self, db_path: str = "data/approvals.db", sweep_interval: Optional[float] = None):
         """
         Initialize SQLite approval store
         
         Args:
             db_path: Relative path to SQLite database file
+            sweep_interval: Seconds between expired-grant sweeps in a background
+                thread (None: no sweeper; call sweep_expired() as needed)
         """
         self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = self._open()
         self._ensure_db()
+        self._stop_sweeper = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        if sweep_interval:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, args=(sweep_interval,), name="approval-sweeper", daemon=True
+            )
+            self._sweeper.start()
+    
+    def _open(self) -> sqlite3.Connection:
+        """Open the shared connection (used under self._lock from any thread)"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=APPROVAL_DB_BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
     
     def _ensure_db(self):
         """Ensure database and tables exist"""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock, self._conn as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS requests (
                     request_id TEXT PRIMARY KEY,
@@ -88,7 +130,10 @@ class SQLiteApprovalStore:
                 ON requests(status)
             """)
             
-            conn.commit()
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_grants_expires_at
+                ON grants(expires_at)
+            """)
     
     def create_request(
         self,
@@ -110,7 +155,7 @@ class SQLiteApprovalStore:
             created_at=datetime.utcnow().isoformat()
         )
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock, self._conn as conn:
             conn.execute(
                 """INSERT INTO requests 
                    (request_id, operation, category, reason, status, metadata, created_at)
@@ -125,18 +170,15 @@ class SQLiteApprovalStore:
                     request.created_at
                 )
             )
-            conn.commit()
         
         return request
     
     def get_pending(self) -> List[ApprovalRequest]:
         """Get all pending approval requests"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        with self._lock:
+            rows = self._conn.execute(
                 "SELECT * FROM requests WHERE status = 'pending' ORDER BY created_at DESC"
-            )
-            rows = cursor.fetchall()
+            ).fetchall()
         
         return [
             ApprovalRequest(
@@ -163,7 +205,7 @@ class SQLiteApprovalStore:
             created_at=datetime.utcnow().isoformat()
         )
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock, self._conn as conn:
             # Update request status
             conn.execute(
                 "UPDATE requests SET status = 'approved' WHERE request_id = ?",
@@ -183,54 +225,64 @@ class SQLiteApprovalStore:
                     grant.created_at
                 )
             )
-            conn.commit()
         
         return grant
     
     def deny_request(self, request_id: str, reason: str):
         """Deny approval request"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock, self._conn as conn:
             conn.execute(
                 "UPDATE requests SET status = 'denied' WHERE request_id = ?",
                 (request_id,)
             )
-            conn.commit()
     
     def verify_grant(self, grant_id: str, operation: str) -> bool:
         """Verify grant is valid and operation is in scope"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                "SELECT * FROM grants WHERE grant_id = ?",
-                (grant_id,)
-            )
-            row = cursor.fetchone()
-        
+        return self.verify_grant_batch(grant_id, [operation])[0]
+    
+    def verify_grant_batch(self, grant_id: str, operations: List[str]) -> List[bool]:
+        """verify_grant for several operations with one grant lookup"""
+        row = self._live_grant(grant_id)
         if not row:
-            return False
-        
-        # Check expiration
-        expires_at = datetime.fromisoformat(row['expires_at'])
-        if datetime.utcnow() > expires_at:
-            return False
+            return [False] * len(operations)
         
-        # Check scope
-        scope = json.loads(row['scope'])
-        operation_tool = operation.split()[0] if ' ' in operation else operation
-        
-        return operation_tool in scope or '*' in scope
+        scope = _scope_matcher(row['scope'])
+        return [scope.matches(operation) for operation in operations]
+    
+    def verify_grant_until(self, grant_id: str, operation: str) -> Optional[float]:
+        """verify_grant that also says until when: grant expiry (epoch seconds), or None"""
+        row = self._live_grant(grant_id)
+        if not row or not _scope_matcher(row['scope']).matches(operation):
+            return None
+        # expires_at is naive UTC
+        return datetime.fromisoformat(row['expires_at']).replace(tzinfo=timezone.utc).timestamp()
+    
+    def _live_grant(self, grant_id: str) -> Optional[sqlite3.Row]:
+        """Scope and expiry of a non-expired grant"""
+        # Primary-key read; the expiry check is part of the same statement
+        with self._lock:
+            return self._conn.execute(
+                _SELECT_GRANT_SCOPE, (grant_id, datetime.utcnow().isoformat())
+            ).fetchone()
+    
+    def revoke_grant(self, grant_id: str) -> bool:
+        """Revoke a grant before it expires (False if unknown or already expired)"""
+        with self._lock, self._conn as conn:
+            cursor = conn.execute(
+                "DELETE FROM grants WHERE grant_id = ? AND expires_at > ?",
+                (grant_id, datetime.utcnow().isoformat())
+            )
+        return cursor.rowcount > 0
     
     def get_active_grants(self) -> List[ApprovalGrant]:
         """Get all active (non-expired) grants"""
         now = datetime.utcnow().isoformat()
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
+        with self._lock:
+            rows = self._conn.execute(
                 "SELECT * FROM grants WHERE expires_at > ? ORDER BY created_at DESC",
                 (now,)
-            )
-            rows = cursor.fetchall()
+            ).fetchall()
         
         return [
             ApprovalGrant(
@@ -242,15 +294,65 @@ class SQLiteApprovalStore:
             )
             for row in rows
         ]
+    
+    def sweep_expired(self) -> int:
+        """Delete expired grants; returns how many were removed"""
+        with self._lock, self._conn as conn:
+            cursor = conn.execute(_DELETE_EXPIRED_GRANTS, (datetime.utcnow().isoformat(),))
+        return cursor.rowcount
+    
+    def _sweep_loop(self, interval: float):
+        while not self._stop_sweeper.wait(interval):
+            try:
+                self.sweep_expired()
+            except sqlite3.Error:
+                pass  # Retried on the next interval (e.g. database busy)
+    
+    def close(self):
+        """Stop the sweeper and close the connection"""
+        self._stop_sweeper.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache(maxsize=SCOPE_CACHE_SIZE)
+def _scope_matcher(scope_json: str) -> ScopeMatcher:
+    """Compiled scope of a grant row (parsed and compiled once per distinct scope)"""
+    return compile_scope(json.loads(scope_json))
+
+
+# One store per database path; never closed while the process runs, since
+# callers may hold it (a changed APPROVAL_STORE_DB just opens another)
+_sqlite_stores: Dict[str, SQLiteApprovalStore] = {}
+_sqlite_store_lock = threading.Lock()
 
 
 def get_approval_store():
     """Get approval store (SQLite if env var set, else in-memory)"""
     db_path = os.environ.get('APPROVAL_STORE_DB')
     
-    if db_path:
-        return SQLiteApprovalStore(db_path=db_path)
-    else:
-        # Fallback to in-memory store
-        from ajson.hands.approval import ApprovalStore
-        return ApprovalStore()
+    if not db_path:
+        # Fallback to the global in-memory store
+        from ajson.hands.approval import get_approval_store as get_memory_store
+        return get_memory_store()
+    
+    store = _sqlite_stores.get(db_path)
+    if store is not None:
+        return store
+    with _sqlite_store_lock:
+        store = _sqlite_stores.get(db_path)
+        if store is None:
+            store = SQLiteApprovalStore(db_path=db_path, sweep_interval=APPROVAL_SWEEP_SECONDS)
+            _sqlite_stores[db_path] = store
+        return store
+
+
+def close_approval_store():
+    """Close every process-wide SQLite store opened so far (shutdown hook)"""
+    with _sqlite_store_lock:
+        stores = list(_sqlite_stores.values())
+        _sqlite_stores.clear()
+    for store in stores:
+        store.close()
@@ -4,61 +4,304 @@ Enhanced audit logging for approval workflow
 Provides structured logging for:
 - Approval request creation
 - Grant issuance
-- Denial decisions  
+- Denial decisions
 - Grant verification attempts
 - Execution with grants
+
+Events are written as JSONL, one file per local day
+(audit_YYYYMMDD.jsonl, chosen per event, so files rotate at midnight).
+Logging only enqueues the event; a background writer thread serializes
+queued events and writes them in batches, flushing after AUDIT_FLUSH_LINES
+events or AUDIT_FLUSH_SECONDS, whichever comes first.
+
+Knobs:
+- AUDIT_FSYNC: "never" (default; like a plain file handler, the OS decides)
+  or "batch" (fsync after every batch written)
+- AUDIT_QUEUE_MAX: bound of the event queue
+- AUDIT_BACKPRESSURE when the queue is full: "drop" (default; the caller
+  never waits, and an audit_events_dropped event records how many were
+  lost) or "block" (the caller waits for room; nothing is lost)
+
+Event payloads are serialized on the writer thread: don't mutate dicts or
+lists after passing them in.
 """
-import logging
 import json
+import logging
+import os
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 
 
+AUDIT_FLUSH_LINES = int(os.getenv("AUDIT_FLUSH_LINES", "256"))
+AUDIT_FLUSH_SECONDS = float(os.getenv("AUDIT_FLUSH_SECONDS", "1.0"))
+AUDIT_FSYNC = os.getenv("AUDIT_FSYNC", "never")
+AUDIT_QUEUE_MAX = int(os.getenv("AUDIT_QUEUE_MAX", "10000"))
+AUDIT_BACKPRESSURE = os.getenv("AUDIT_BACKPRESSURE", "drop")
+
+FSYNC_POLICIES = ("never", "batch")
+BACKPRESSURE_MODES = ("drop", "block")
+PUT_RETRY_SECONDS = 0.01  # Poll interval while waiting for room in a full queue
+
+logger = logging.getLogger("ajson.audit_writer")
+
+
+class _FlushRequest:
+    """Queue marker: write everything queued before it, then signal"""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class AuditWriter:
+    """Background thread writing queued audit events to daily JSONL files"""
+
+    def __init__(self, log_dir: Path, flush_lines: int = AUDIT_FLUSH_LINES,
+                 flush_seconds: float = AUDIT_FLUSH_SECONDS, fsync: str = AUDIT_FSYNC,
+                 queue_max: int = AUDIT_QUEUE_MAX, backpressure: str = AUDIT_BACKPRESSURE):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"AUDIT_FSYNC must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        if backpressure not in BACKPRESSURE_MODES:
+            raise ValueError(f"AUDIT_BACKPRESSURE must be one of {BACKPRESSURE_MODES}, got {backpressure!r}")
+        self.log_dir = log_dir
+        self.flush_lines = max(flush_lines, 1)
+        self.flush_seconds = flush_seconds
+        self.fsync = fsync
+        self.backpressure = backpressure
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_max)
+        # Held while checking _closed and queueing, so nothing lands after _STOP
+        self._state_lock = threading.Lock()
+        self._file = None
+        self._day: Optional[str] = None
+        self._counter_lock = threading.Lock()
+        self._unreported_drops = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self._closed = False
+        # Serializes close() calls; _STOP may need several attempts on a full queue
+        self._close_lock = threading.Lock()
+        self._stop_queued = False
+        self._thread = threading.Thread(target=self._run, name="ajson-audit-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, event: Dict[str, Any], ts: Optional[float] = None) -> bool:
+        """
+        Queue an event (ts: epoch seconds choosing its daily file, default now)
+
+        Returns:
+            False if the event was dropped (queue full in "drop" mode, or closed)
+        """
+        item = (time.time() if ts is None else ts, event)
+        if self._put(item, wait=self.backpressure == "block"):
+            return True
+        if not self._closed:
+            with self._counter_lock:
+                self.dropped += 1
+                self._unreported_drops += 1
+        return False
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Wait until every event queued so far is written (False on timeout)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        request = _FlushRequest()
+        if not self._put(request, wait=True, deadline=deadline):
+            # Closed: everything is written once the writer has exited
+            return self._closed and not self._thread.is_alive()
+        return request.done.wait(None if deadline is None else max(deadline - time.monotonic(), 0))
+
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Write what is queued, stop the thread and close the file
+
+        Stops accepting events at once. If the writer cannot be stopped in
+        time (full queue, slow disk), call close() again to retry.
+
+        Returns:
+            True once the writer thread has exited
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._close_lock:
+            with self._state_lock:
+                self._closed = True
+            # No submit can queue anything now, so _STOP is the last item
+            if not self._stop_queued:
+                try:
+                    self._queue.put(_STOP, timeout=timeout)
+                except queue.Full:
+                    logger.warning("Audit writer queue still full; close() not finished")
+                    return False
+                self._stop_queued = True
+            self._thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+            return not self._thread.is_alive()
+
+    def _put(self, item: Any, wait: bool, deadline: Optional[float] = None) -> bool:
+        """
+        Queue item unless closed, never holding the lock while the queue is full
+
+        Returns:
+            False if closed, or the queue is full (and stayed full until deadline when waiting)
+        """
+        while True:
+            with self._state_lock:
+                if self._closed:
+                    return False
+                try:
+                    self._queue.put_nowait(item)
+                    return True
+                except queue.Full:
+                    if not wait or (deadline is not None and time.monotonic() >= deadline):
+                        return False
+            time.sleep(PUT_RETRY_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "errors": self.errors,
+        }
+
+    def _run(self):
+        batch: List[Tuple[float, Dict[str, Any]]] = []
+        first_at = 0.0
+        while True:
+            timeout = None
+            if batch:
+                timeout = max(self.flush_seconds - (time.monotonic() - first_at), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write(batch)
+                batch = []
+                continue
+            if isinstance(item, _FlushRequest) or item is _STOP:
+                self._write(batch)
+                batch = []
+                if item is _STOP:
+                    self._close_file()
+                    return
+                item.done.set()
+                continue
+            if not batch:
+                first_at = time.monotonic()
+            batch.append(item)
+            if len(batch) >= self.flush_lines:
+                self._write(batch)
+                batch = []
+
+    def _write(self, batch: List[Tuple[float, Dict[str, Any]]]):
+        """Append a batch (switching files on date change), then flush/fsync once"""
+        with self._counter_lock:
+            drops = self._unreported_drops
+        if drops:
+            batch = batch + [(time.time(), {
+                "timestamp": datetime.utcnow().isoformat(),
+                "event_type": "audit_events_dropped",
+                "count": drops,
+            })]
+        lines = []
+        for ts, event in batch:
+            try:
+                lines.append((ts, json.dumps(event, default=str) + "\n"))
+            except (TypeError, ValueError):
+                # Skip only the bad event, not the rest of the batch
+                self.errors += 1
+                logger.exception("Audit event not serializable, skipped (event_type=%r)", event.get("event_type"))
+        if not lines:
+            return
+        try:
+            chunk = []
+            for ts, line in lines:
+                day = time.strftime("%Y%m%d", time.localtime(ts))
+                if day != self._day:
+                    self._append(chunk)
+                    chunk = []
+                    self._rotate(day)
+                chunk.append(line)
+            self._append(chunk)
+            self._file.flush()
+            if self.fsync == "batch":
+                os.fsync(self._file.fileno())
+        except OSError:
+            # Drops stay unreported, so the next batch records them again
+            self.errors += 1
+            logger.exception("Audit log write failed (%d events)", len(lines))
+            return
+        with self._counter_lock:
+            self._unreported_drops -= drops
+        self.written += len(lines)
+        self.batches += 1
+
+    def _append(self, lines: List[str]):
+        if lines:
+            self._file.write("".join(lines))
+
+    def _rotate(self, day: str):
+        """Switch to the file of another day"""
+        self._close_file()
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.log_dir / f"audit_{day}.jsonl", "a", encoding="utf-8")
+        self._day = day
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.flush()
+            if self.fsync == "batch":
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+            self._day = None
+
+
 class AuditLogger:
     """Structured audit logger for approval workflow"""
-    
-    def __init__(self, log_dir: str = "data/audit"):
+
+    def __init__(self, log_dir: str = "data/audit", flush_lines: int = AUDIT_FLUSH_LINES,
+                 flush_seconds: float = AUDIT_FLUSH_SECONDS, fsync: str = AUDIT_FSYNC,
+                 queue_max: int = AUDIT_QUEUE_MAX, backpressure: str = AUDIT_BACKPRESSURE):
         """
         Initialize audit logger
-        
+
         Args:
             log_dir: Directory for audit logs (relative path)
+            flush_lines / flush_seconds: Batch size / age that triggers a write
+            fsync: "never" or "batch"
+            queue_max: Bound of the event queue
+            backpressure: "drop" or "block" when the queue is full
         """
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Configure logger
-        self.logger = logging.getLogger("ajson.audit")
-        self.logger.setLevel(logging.INFO)
-        
-        # File handler (daily rotation)
-        log_file = self.log_dir / f"audit_{datetime.now().strftime('%Y%m%d')}.jsonl"
-        handler = logging.FileHandler(log_file)
-        handler.setLevel(logging.INFO)
-        
-        # JSON formatter
-        formatter = logging.Formatter('%(message)s')
-        handler.setFormatter(formatter)
-        
-        if not self.logger.handlers:
-            self.logger.addHandler(handler)
-        else:
-            # Clear existing handlers to prevent duplication/leaks in tests
-            for h in self.logger.handlers[:]:
-                self.logger.removeHandler(h)
-                h.close()
-            self.logger.addHandler(handler)
-    
+        self.writer = AuditWriter(
+            self.log_dir, flush_lines=flush_lines, flush_seconds=flush_seconds,
+            fsync=fsync, queue_max=queue_max, backpressure=backpressure
+        )
+
     def _log(self, event_type: str, data: Dict[str, Any]):
-        """Log audit event"""
+        """Log audit event (queued for the writer thread)"""
         event = {
             "timestamp": datetime.utcnow().isoformat(),
             "event_type": event_type,
             **data
         }
-        self.logger.info(json.dumps(event))
-    
+        self.writer.submit(event)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Wait until logged events are written to disk"""
+        return self.writer.flush(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """Write queued events and stop the writer (False if it did not stop; retry)"""
+        return self.writer.close(timeout)
+
     def log_request_created(self, request_id: str, operation: str, category: str, reason: str):
         """Log approval request creation"""
         self._log("approval_request_created", {
@@ -67,7 +310,7 @@ class AuditLogger:
             "category": category,
             "reason": reason
         })
-    
+
     def log_request_approved(self, request_id: str, grant_id: str, scope: list, ttl_seconds: int, decided_by: str):
         """Log request approval and grant issuance"""
         self._log("approval_granted", {
@@ -77,7 +320,7 @@ class AuditLogger:
             "ttl_seconds": ttl_seconds,
             "decided_by": decided_by
         })
-    
+
     def log_request_denied(self, request_id: str, reason: str, decided_by: str):
         """Log request denial"""
         self._log("approval_denied", {
@@ -85,7 +328,7 @@ class AuditLogger:
             "reason": reason,
             "decided_by": decided_by
         })
-    
+
     def log_grant_verification(self, grant_id: str, operation: str, valid: bool, reason: Optional[str] = None):
         """Log grant verification attempt"""
         self._log("grant_verification", {
@@ -94,7 +337,7 @@ class AuditLogger:
             "valid": valid,
             "reason": reason
         })
-    
+
     def log_execution(self, grant_id: str, tool: str, args: Dict[str, Any], result: str, returncode: Optional[int] = None):
         """Log tool execution with grant"""
         self._log("tool_execution", {
@@ -104,7 +347,7 @@ class AuditLogger:
             "result": result,
             "returncode": returncode
         })
-    
+
     def log_security_violation(self, violation_type: str, details: str, context: Dict[str, Any]):
         """Log security policy violation"""
         self._log("security_violation", {
@@ -124,3 +367,20 @@ def get_audit_logger() -> AuditLogger:
     if _audit_logger is None:
         _audit_logger = AuditLogger()
     return _audit_logger
+
+
+def close_audit_logger() -> bool:
+    """
+    Write queued events and stop the global logger's writer (shutdown hook)
+
+    Returns:
+        False if the writer did not stop; the logger is kept (refusing new
+        events) so a later call retries instead of a second writer starting
+    """
+    global _audit_logger
+    if _audit_logger is None:
+        return True
+    if not _audit_logger.close():
+        return False
+    _audit_logger = None
+    return True
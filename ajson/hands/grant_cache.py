@@ -0,0 +1,199 @@
+"""
+Verified-grant cache for the LIMITED execute path
+
+Clients replay one approval grant for bursts of allowlisted commands, and
+each execute_tool_limited call looks the grant up, scans its scope and
+re-runs the policy evaluation. With the cache enabled, a (grant_id,
+operation) pair that passed those checks is remembered, and served without
+touching the store, until the earliest of:
+- the grant's expiry (its epoch expiry is compared on every hit)
+- GRANT_CACHE_TTL_SECONDS after it was verified
+- a revocation of the grant (revoke_grant): immediately in this process, and
+  within GRANT_REVOCATION_POLL_SECONDS in every other process (API workers,
+  mission workers), which tail the grant_revocations table in the SSOT
+- a reload of the policy rule file
+Only successful verifications are cached; failures always reach the store.
+
+Enabled with GRANT_CACHE=1 (default off). Hit/miss counters via stats().
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from ajson import db
+from ajson.policy_rules import get_rules
+
+
+GRANT_CACHE = os.getenv("GRANT_CACHE", "0") == "1"
+GRANT_CACHE_TTL_SECONDS = float(os.getenv("GRANT_CACHE_TTL_SECONDS", "30"))
+GRANT_CACHE_MAX_ENTRIES = int(os.getenv("GRANT_CACHE_MAX_ENTRIES", "1024"))
+GRANT_REVOCATION_POLL_SECONDS = float(os.getenv("GRANT_REVOCATION_POLL_SECONDS", "0.5"))
+REVOCATION_BATCH_SIZE = 500
+
+logger = logging.getLogger("ajson.grant_cache")
+
+# (decision, category, reason) of the policy evaluation
+Evaluation = Tuple[Any, Any, str]
+
+
+class VerifiedGrantCache:
+    """Cache of successful (grant_id, operation) verifications (thread-safe)"""
+
+    def __init__(self, ttl_seconds: float = GRANT_CACHE_TTL_SECONDS,
+                 max_entries: int = GRANT_CACHE_MAX_ENTRIES,
+                 poll_seconds: float = GRANT_REVOCATION_POLL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.poll_seconds = poll_seconds
+        # (grant_id, operation) -> (valid_until epoch, rule snapshot, evaluation)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any, Evaluation]]" = OrderedDict()
+        self._by_grant: Dict[str, Set[Tuple[str, str]]] = {}
+        # Revoked grant -> revocation time: refuses puts racing a revocation
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._cursor: Optional[int] = None
+        self._polled_at = float("-inf")
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.revocations = 0
+        self.evictions = 0
+
+    def get(self, grant_id: str, operation: str) -> Optional[Evaluation]:
+        """Cached evaluation of a verified operation, or None (verify with the store)"""
+        self._sync_revocations()
+        rules = get_rules()
+        now = time.time()
+        key = (grant_id, operation)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (now > entry[0] or entry[1] is not rules):
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, grant_id: str, operation: str, expires_ts: float, evaluation: Evaluation):
+        """Remember a successful verification (grant expiring at expires_ts)"""
+        rules = get_rules()
+        now = time.time()
+        valid_until = min(expires_ts, now + self.ttl_seconds)
+        key = (grant_id, operation)
+        with self._lock:
+            if grant_id in self._revoked or valid_until < now:
+                return
+            self._entries[key] = (valid_until, rules, evaluation)
+            self._entries.move_to_end(key)
+            self._by_grant.setdefault(grant_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_grant(self, grant_id: str):
+        """Forget a revoked grant, and refuse to cache it again"""
+        now = time.time()
+        with self._lock:
+            self._revoked[grant_id] = now
+            # Racing puts finish within the TTL; older marks can go
+            for revoked_id, revoked_at in list(self._revoked.items()):
+                if now - revoked_at > self.ttl_seconds:
+                    del self._revoked[revoked_id]
+            keys = self._by_grant.pop(grant_id, ())
+            for key in keys:
+                del self._entries[key]
+            if keys:
+                self.revocations += 1
+
+    def _drop(self, key: Tuple[str, str]):
+        """Remove one entry (lock held)"""
+        del self._entries[key]
+        keys = self._by_grant.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_grant[key[0]]
+
+    def _sync_revocations(self):
+        """Apply revocations recorded by any process since the last poll"""
+        if time.monotonic() - self._polled_at < self.poll_seconds:
+            return
+        try:
+            if self._cursor is None:
+                self._cursor = db.get_latest_grant_revocation_id()
+            while True:
+                revocations = db.get_grant_revocations_after(self._cursor, REVOCATION_BATCH_SIZE)
+                for revocation in revocations:
+                    self.invalidate_grant(revocation["grant_id"])
+                    self._cursor = revocation["id"]
+                if len(revocations) < REVOCATION_BATCH_SIZE:
+                    break
+        except sqlite3.Error:
+            # Revocations cannot be seen: serve nothing from the cache until they can
+            logger.exception("Grant revocation poll failed; clearing verified-grant cache")
+            self.clear()
+            return
+        self._polled_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_grant.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expirations": self.expirations,
+                "revocations": self.revocations,
+                "evictions": self.evictions,
+            }
+
+
+_grant_cache: Optional[VerifiedGrantCache] = None
+_grant_cache_lock = threading.Lock()
+
+
+def get_grant_cache() -> Optional[VerifiedGrantCache]:
+    """Get the global verified-grant cache, or None when caching is disabled"""
+    global _grant_cache
+    if not GRANT_CACHE:
+        return None
+    if _grant_cache is None:
+        with _grant_cache_lock:
+            if _grant_cache is None:
+                _grant_cache = VerifiedGrantCache()
+    return _grant_cache
+
+
+def revoke_grant(grant_id: str) -> bool:
+    """
+    Revoke an approval grant everywhere
+
+    Removes it from the approval store and this process's cache, and records
+    the revocation in the SSOT so other processes drop their cached entries.
+
+    Returns:
+        False if the grant was unknown or already expired
+    """
+    from ajson.hands.approval import get_approval_store
+    if not get_approval_store().revoke_grant(grant_id):
+        return False
+    cache = get_grant_cache()
+    if cache is not None:
+        cache.invalidate_grant(grant_id)
+    db.record_grant_revocation(grant_id)
+    return True
@@ -3,8 +3,42 @@ Approval Policy: Defines which operations require approval
 
 Expansion: allowlist/denylist + explicit policy decisions
 """
-from typing import Tuple, Optional
+from typing import Mapping, Optional, Sequence, Tuple
 from enum import Enum
+import functools
+import inspect
+
+from ajson.policy_rules import (
+    compile_patterns,
+    compile_prefixes,
+    compile_substrings,
+    get_rule_file,
+    get_rules,
+)
+
+
+# Memoized evaluate() results per compiled rule version
+POLICY_CACHE_SIZE = 4096
+
+# ApprovalPolicy attribute -> key in the rule file's "hands" section
+_RULE_ATTRS = {
+    "ALLOWLIST": "allowlist",
+    "DENYLIST": "denylist",
+    "DESTRUCTIVE_PATTERNS": "destructive_patterns",
+    "PAID_API_PATTERNS": "paid_api_patterns",
+    "IRREVERSIBLE_PATTERNS": "irreversible_patterns",
+    "NETWORK_PATTERNS": "network_patterns",
+}
+
+
+class _RuleList:
+    """Class attribute resolving to the current shared rule list"""
+    
+    def __init__(self, key: str):
+        self.key = key
+    
+    def __get__(self, obj, owner) -> Tuple[str, ...]:
+        return get_rules().hands[self.key]
 
 
 class PolicyDecision(Enum):
@@ -57,67 +91,80 @@ class ApprovalPolicy:
     Expansion: allowlist/denylist + explicit policy decisions
     """
     
+    # Rule lists come from the shared rule file (ajson/config/policy_rules.json,
+    # "hands" section) and follow it when it is reloaded. A subclass may
+    # override any of them with a plain list (call recompile() after
+    # assigning one to an existing class).
+    
     # Allowlist: safe, readonly operations that don't require approval
-    ALLOWLIST = [
-        # File operations (readonly)
-        "ls", "cat", "grep", "rg", "find",
-        # Testing
-        "pytest -q", "pytest --collect-only",
-        # Git readonly (support both "git status" and "git_status" forms)
-        "git status", "git log", "git diff", "git show",
-        "git_status",  # Legacy test format
-    ]
+    ALLOWLIST = _RuleList("allowlist")
     
     # Denylist: Forbidden operations
-    DENYLIST = [
-        "rm -rf",
-        "git push --force",
-        "git push -f",
-        "git tag -d",
-        "git reset --hard",
-        "docker rm",
-        "DROP DATABASE",
-        "DROP TABLE",
-    ]
+    DENYLIST = _RuleList("denylist")
     
     # Destructive patterns
-    DESTRUCTIVE_PATTERNS = [
-        r"rm\s+-rf",
-        r"git\s+push\s+.*--force",
-        r"git\s+reset\s+--hard",
-        r"docker\s+rm",
-        r"DROP\s+DATABASE",
-    ]
+    DESTRUCTIVE_PATTERNS = _RuleList("destructive_patterns")
     
     # Paid API patterns
-    PAID_API_PATTERNS = [
-        r"openai\.ChatCompletion",
-        r"anthropic\.Completion",
-        r"gemini\.generate",
-    ]
+    PAID_API_PATTERNS = _RuleList("paid_api_patterns")
     
     # Irreversible patterns
-    IRREVERSIBLE_PATTERNS = [
-        r"git\s+merge",  # Matches any "git merge" command
-        r"git\s+tag\s+-a",
-        r"npm\s+publish",
-    ]
+    IRREVERSIBLE_PATTERNS = _RuleList("irreversible_patterns")
     
     # Network patterns
-    NETWORK_PATTERNS = [
-        r"curl\s+",
-        r"wget\s+",
-        r"http://",
-        r"https://",
-        r"requests\.",
-        r"urllib\.",
-    ]
+    NETWORK_PATTERNS = _RuleList("network_patterns")
+    
+    # Rule attributes this class overrides (detected once per class, and by recompile())
+    _rule_overrides: Tuple[str, ...] = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._detect_overrides()
+    
+    @classmethod
+    def _detect_overrides(cls):
+        cls._rule_overrides = tuple(
+            attr for attr in _RULE_ATTRS
+            if not isinstance(inspect.getattr_static(cls, attr), _RuleList)
+        )
+    
+    @classmethod
+    def _compiled(cls) -> "_CompiledPolicy":
+        """
+        Compiled rules for this class
+        
+        Classes using the shared lists share one compiled engine per rule
+        file version; a subclass overriding lists compiles its own (rebuilt
+        when the rule file changes).
+        """
+        rules = get_rules()
+        if not cls._rule_overrides:
+            return rules.derived("hands.policy", _compile_shared)
+        
+        compiled = cls.__dict__.get("_compiled_policy")
+        if compiled is None or compiled.digest != rules.digest:
+            overrides = {_RULE_ATTRS[attr]: getattr(cls, attr) for attr in cls._rule_overrides}
+            compiled = _CompiledPolicy({**rules.hands, **overrides}, digest=rules.digest)
+            cls._compiled_policy = compiled
+        return compiled
+    
+    @classmethod
+    def recompile(cls):
+        """Pick up edited rules: re-check the rule file and drop this class's compiled overrides"""
+        get_rule_file().reload()
+        cls._detect_overrides()
+        if "_compiled_policy" in cls.__dict__:
+            del cls._compiled_policy
     
     @classmethod
     def evaluate(cls, operation: str, dry_run: bool = True) -> Tuple[PolicyDecision, OperationCategory, str]:
         """
         Evaluate operation and return policy decision
         
+        Each rule category is one precompiled regex, checked in priority
+        order (allowlist, network, denylist, destructive, paid, irreversible);
+        results are memoized per (operation, dry_run).
+        
         Args:
             operation: Command or operation string
             dry_run: If True, no actual execution (scaffold default)
@@ -125,62 +172,7 @@ class ApprovalPolicy:
         Returns:
             (PolicyDecision, OperationCategory, reason)
         """
-        import re
-        operation_lower = operation.lower()
-        
-        # 1. Check allowlist first (highest priority)
-        # Use strict matching to avoid false positives (e.g., "git status" shouldn't match "git merge origin/main")
-        for pattern in cls.ALLOWLIST:
-            pattern_lower = pattern.lower()
-            # Match if operation starts with pattern (exact command match)
-            if operation_lower.startswith(pattern_lower):
-                # Check that it's followed by space or end of string
-                if len(operation_lower) == len(pattern_lower) or operation_lower[len(pattern_lower)] in [' ', '\t', '\n']:
-                    return (PolicyDecision.ALLOW, OperationCategory.READONLY, f"Allowed: matches allowlist")
-        
-        # 2. Check network patterns BEFORE denylist (to get correct category=NETWORK)
-        for pattern in cls.NETWORK_PATTERNS:
-            if re.search(pattern, operation, re.IGNORECASE):
-                return (PolicyDecision.DENY, OperationCategory.NETWORK, f"Denied: network operation")
-        
-        # 3. Check denylist (immediate denial)
-        for pattern in cls.DENYLIST:
-            if pattern.lower() in operation_lower:
-                # Determine if destructive or irreversible based on pattern
-                if any(p in operation_lower for p in ["rm -rf", "drop database", "drop table"]):
-                    return (PolicyDecision.DENY, OperationCategory.DESTRUCTIVE, f"Destructive: matches denylist pattern '{pattern}'")
-                else:
-                    return (PolicyDecision.DENY, OperationCategory.IRREVERSIBLE, f"Denied: matches denylist pattern '{pattern}'")
-        
-        # 4. Check destructive patterns (require approval when not dry_run)
-        for pattern in cls.DESTRUCTIVE_PATTERNS:
-            if re.search(pattern, operation, re.IGNORECASE): # Use re.search for regex patterns
-                if dry_run:
-                    return (PolicyDecision.DRY_RUN_ONLY, OperationCategory.DESTRUCTIVE, f"Destructive: simulation only in DRY_RUN")
-                else:
-                    return (PolicyDecision.REQUIRE_APPROVAL, OperationCategory.DESTRUCTIVE, f"Destructive: requires approval")
-        
-        # 5. Check paid patterns (require approval when not dry_run)
-        for pattern in cls.PAID_API_PATTERNS: # Corrected to PAID_API_PATTERNS
-            if re.search(pattern, operation, re.IGNORECASE): # Use re.search for regex patterns
-                if dry_run:
-                    return (PolicyDecision.DRY_RUN_ONLY, OperationCategory.PAID, f"Paid API: simulation only in DRY_RUN")
-                else:
-                    return (PolicyDecision.REQUIRE_APPROVAL, OperationCategory.PAID, f"Paid API: requires approval")
-        
-        # 6. Check irreversible patterns (require approval when not dry_run)
-        for pattern in cls.IRREVERSIBLE_PATTERNS:
-            if re.search(pattern, operation, re.IGNORECASE): # Use re.search for regex patterns
-                if dry_run:
-                    return (PolicyDecision.DRY_RUN_ONLY, OperationCategory.IRREVERSIBLE, f"Irreversible: simulation only in DRY_RUN")
-                else:
-                    return (PolicyDecision.REQUIRE_APPROVAL, OperationCategory.IRREVERSIBLE, f"Irreversible: requires approval")
-        
-        # 7. Unknown operations: allow in dry_run, require approval otherwise
-        if dry_run:
-            return (PolicyDecision.DRY_RUN_ONLY, OperationCategory.UNKNOWN, f"Unknown operation: DRY_RUN only")
-        else:
-            return (PolicyDecision.REQUIRE_APPROVAL, OperationCategory.UNKNOWN, f"Unknown operation: requires approval")
+        return cls._compiled().evaluate(operation, dry_run)
     
     @classmethod
     def _normalize_operation(cls, operation: str) -> str:
@@ -191,24 +183,15 @@ class ApprovalPolicy:
     @classmethod
     def _classify_category(cls, operation: str) -> OperationCategory:
         """Classify operation into category"""
-        import re
-        
-        for pattern in cls.DESTRUCTIVE_PATTERNS:
-            if re.search(pattern, operation, re.IGNORECASE):
-                return OperationCategory.DESTRUCTIVE
-        
-        for pattern in cls.PAID_API_PATTERNS:
-            if re.search(pattern, operation, re.IGNORECASE):
-                return OperationCategory.PAID
-        
-        for pattern in cls.IRREVERSIBLE_PATTERNS:
-            if re.search(pattern, operation, re.IGNORECASE):
-                return OperationCategory.IRREVERSIBLE
-        
-        for pattern in cls.NETWORK_PATTERNS:
-            if re.search(pattern, operation, re.IGNORECASE):
-                return OperationCategory.NETWORK
-        
+        compiled = cls._compiled()
+        for regex, category in (
+            (compiled.destructive, OperationCategory.DESTRUCTIVE),
+            (compiled.paid, OperationCategory.PAID),
+            (compiled.irreversible, OperationCategory.IRREVERSIBLE),
+            (compiled.network, OperationCategory.NETWORK),
+        ):
+            if regex.search(operation):
+                return category
         return OperationCategory.UNKNOWN
     
     @classmethod
@@ -228,6 +211,22 @@ class ApprovalPolicy:
             return (False, "DRY_RUN mode: no actual execution", None)
         
         decision, category, reason = cls.evaluate(operation, dry_run=False)
+        return cls.legacy_approval(decision, category, reason, dry_run=False)
+    
+    @classmethod
+    def legacy_approval(cls, decision: PolicyDecision, category: OperationCategory, reason: str,
+                        dry_run: bool) -> Tuple[bool, str, Optional[ApprovalRequired]]:
+        """
+        Map an evaluate() result to the legacy check_approval_required tuple
+        
+        Lets callers that already evaluated the operation (with the same
+        dry_run) avoid evaluating it twice.
+        
+        Returns:
+            (requires_approval, reason, gate_type)
+        """
+        if dry_run:
+            return (False, "DRY_RUN mode: no actual execution", None)
         
         # Legacy behavior: DENY operations return (True, reason, DESTRUCTIVE/IRREVERSIBLE)
         # because denylist includes destructive/irreversible patterns
@@ -258,3 +257,61 @@ class ApprovalPolicy:
         
         # For unknown operations in non-dry-run, legacy behavior was to allow
         return (False, "Operation allowed", None)
+
+
+def _compile_shared(rules) -> "_CompiledPolicy":
+    return _CompiledPolicy(rules.hands)
+
+
+class _CompiledPolicy:
+    """Hands rule lists compiled to one regex per category, with memoized decisions"""
+    
+    def __init__(self, lists: Mapping[str, Sequence[str]], digest: str = ""):
+        self.digest = digest
+        # Allowlist: command prefix followed by whitespace or end of string
+        self.allow = compile_prefixes([p.lower() for p in lists["allowlist"]], boundary=True)
+        self.network = compile_patterns(lists["network_patterns"])
+        # Lowered patterns searched in the lowered operation, exactly like the
+        # substring test that picks the reported pattern (str.lower() and
+        # IGNORECASE disagree on some Unicode case folds)
+        self.denylist = [(p, p.lower()) for p in lists["denylist"]]
+        self.deny = compile_substrings([p_lower for _, p_lower in self.denylist])
+        self.destructive = compile_patterns(lists["destructive_patterns"])
+        self.paid = compile_patterns(lists["paid_api_patterns"])
+        self.irreversible = compile_patterns(lists["irreversible_patterns"])
+        self.evaluate = functools.lru_cache(maxsize=POLICY_CACHE_SIZE)(self._evaluate)
+    
+    def _evaluate(self, operation: str, dry_run: bool) -> Tuple[PolicyDecision, OperationCategory, str]:
+        operation_lower = operation.lower()
+        
+        # 1. Allowlist first (highest priority); strict prefix match so that
+        # "git status" doesn't match "git merge origin/main"
+        if self.allow.match(operation_lower):
+            return (PolicyDecision.ALLOW, OperationCategory.READONLY, "Allowed: matches allowlist")
+        
+        # 2. Network BEFORE denylist (to get correct category=NETWORK)
+        if self.network.search(operation):
+            return (PolicyDecision.DENY, OperationCategory.NETWORK, "Denied: network operation")
+        
+        # 3. Denylist (immediate denial); report the first listed pattern contained
+        if self.deny.search(operation_lower):
+            pattern = next(p for p, p_lower in self.denylist if p_lower in operation_lower)
+            if any(p in operation_lower for p in ("rm -rf", "drop database", "drop table")):
+                return (PolicyDecision.DENY, OperationCategory.DESTRUCTIVE, f"Destructive: matches denylist pattern '{pattern}'")
+            return (PolicyDecision.DENY, OperationCategory.IRREVERSIBLE, f"Denied: matches denylist pattern '{pattern}'")
+        
+        # 4-6. Approval categories (simulation only in dry_run)
+        for regex, category, label in (
+            (self.destructive, OperationCategory.DESTRUCTIVE, "Destructive"),
+            (self.paid, OperationCategory.PAID, "Paid API"),
+            (self.irreversible, OperationCategory.IRREVERSIBLE, "Irreversible"),
+        ):
+            if regex.search(operation):
+                if dry_run:
+                    return (PolicyDecision.DRY_RUN_ONLY, category, f"{label}: simulation only in DRY_RUN")
+                return (PolicyDecision.REQUIRE_APPROVAL, category, f"{label}: requires approval")
+        
+        # 7. Unknown operations: allow in dry_run, require approval otherwise
+        if dry_run:
+            return (PolicyDecision.DRY_RUN_ONLY, OperationCategory.UNKNOWN, "Unknown operation: DRY_RUN only")
+        return (PolicyDecision.REQUIRE_APPROVAL, OperationCategory.UNKNOWN, "Unknown operation: requires approval")
@@ -0,0 +1,149 @@
+"""
+Result cache for read-only LIMITED tool runs
+
+Successive missions re-run the same allowlisted probes (git status, git log,
+ls, cat, pytest --collect-only) within seconds against an unchanged
+workspace. With the cache enabled, a READONLY operation whose argv, cwd and
+workspace fingerprint match a recent run is answered from memory instead of
+spawning the command again.
+
+The fingerprint is cheap, not a proof of an unchanged workspace:
+- the cwd directory itself (entries added/removed/renamed)
+- each argv word that names an existing path (so `cat a.txt` sees a.txt change)
+- for a git work tree: .git/HEAD, .git/index and .git/logs/HEAD
+  (checkout, staging, commit, reset)
+An edit it cannot see (e.g. a tracked file rewritten in a subdirectory before
+`git diff`) is served stale until RESULT_CACHE_TTL_SECONDS expires, which is
+why the cache is opt-in and the TTL short.
+
+Enabled with TOOL_RESULT_CACHE=1 (default off). Entries expire after
+RESULT_CACHE_TTL_SECONDS; beyond RESULT_CACHE_MAX_ENTRIES the least recently
+used entry is evicted. Timeouts are never cached.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+TOOL_RESULT_CACHE = os.getenv("TOOL_RESULT_CACHE", "0") == "1"
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "5"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))
+
+FINGERPRINT_MAX_ARGS = 16  # argv words checked as paths
+_GIT_FILES = ("HEAD", "index", os.path.join("logs", "HEAD"))
+
+# (returncode, stdout, stderr)
+CachedRun = Tuple[int, str, str]
+
+
+def _stat_key(path: str):
+    """Identity of a path's current state, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _git_dir(cwd: str) -> Optional[str]:
+    """.git directory of the work tree containing cwd, if any"""
+    path = os.path.abspath(cwd)
+    while True:
+        candidate = os.path.join(path, ".git")
+        if os.path.isdir(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def workspace_fingerprint(argv: Sequence[str], cwd: str) -> Tuple:
+    """Cheap fingerprint of the workspace state a read-only command depends on"""
+    parts: List[Any] = [_stat_key(cwd)]
+    for word in argv[1:1 + FINGERPRINT_MAX_ARGS]:
+        if word and not word.startswith("-"):
+            parts.append(_stat_key(os.path.join(cwd, word)))
+    git_dir = _git_dir(cwd)
+    if git_dir is not None:
+        parts.extend(_stat_key(os.path.join(git_dir, name)) for name in _GIT_FILES)
+    return tuple(parts)
+
+
+class ResultCache:
+    """TTL + LRU cache of read-only command results (thread-safe)"""
+
+    def __init__(self, ttl_seconds: float = RESULT_CACHE_TTL_SECONDS,
+                 max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, CachedRun]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(argv: Sequence[str], cwd: str) -> Tuple:
+        """Cache key: command, cwd and the workspace fingerprint (taken now)"""
+        return (tuple(argv), cwd, workspace_fingerprint(argv, cwd))
+
+    def get(self, key: Tuple) -> Optional[CachedRun]:
+        """Cached result for key, or None (counted as a miss)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Tuple, run: CachedRun):
+        """Store a completed run under key"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), run)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Get the global result cache, or None when caching is disabled"""
+    global _result_cache
+    if not TOOL_RESULT_CACHE:
+        return None
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache()
+    return _result_cache
@@ -4,16 +4,78 @@ Tool Runner: Executes tools with approval gates + audit logging
 Expansion: JSON audit logs + PolicyDecision enforcement
 """
 from typing import Dict, Any, List, Optional
+import asyncio
 import json
+import os
 import subprocess
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from ajson.hands.policy import (
     ApprovalPolicy,
     PolicyDecision,
-   OperationCategory,
+    OperationCategory,
     ApprovalRequiredError,
     PolicyDeniedError,
     ApprovalRequired,  # Legacy compatibility
 )
+from ajson.hands.grant_cache import get_grant_cache
+from ajson.hands.result_cache import get_result_cache
+from ajson.tools.exec_pool import get_exec_pool
+from ajson.tools.output_capture import decode_output
+
+
+# LIMITED mode subprocess restrictions
+LIMITED_TIMEOUT_SECONDS = 10
+LIMITED_CWD = "/tmp"
+# Concurrent LIMITED commands per event loop on the async path
+LIMITED_EXEC_CONCURRENCY = int(os.getenv("LIMITED_EXEC_CONCURRENCY", "4"))
+# Operations accepted by one execute_batch call
+MAX_BATCH_OPERATIONS = int(os.getenv("MAX_BATCH_OPERATIONS", "32"))
+
+_limited_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _limited_semaphore() -> asyncio.Semaphore:
+    """The running loop's LIMITED concurrency semaphore"""
+    loop = asyncio.get_running_loop()
+    semaphore = _limited_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _limited_semaphores[loop] = asyncio.Semaphore(LIMITED_EXEC_CONCURRENCY)
+    return semaphore
+
+
+async def run_limited_async(argv: List[str], timeout: float = LIMITED_TIMEOUT_SECONDS,
+                            cwd: str = LIMITED_CWD):
+    """
+    Run argv (no shell) with asyncio under the LIMITED restrictions
+    
+    Returns:
+        (returncode, stdout, stderr), decoded as text=True would
+    
+    Raises:
+        subprocess.TimeoutExpired: If the command exceeded timeout (it is killed)
+        asyncio.CancelledError: If cancelled (the command is killed first)
+        OSError: As subprocess.run would (e.g. missing executable)
+    """
+    async with _limited_semaphore():
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            cwd=cwd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except BaseException as e:
+            if proc.returncode is None:
+                proc.kill()
+            await asyncio.shield(proc.wait())
+            if isinstance(e, asyncio.TimeoutError):
+                raise subprocess.TimeoutExpired(argv, timeout)
+            raise
+    return proc.returncode, decode_output(stdout), decode_output(stderr)
 
 
 class ToolRunner:
@@ -62,8 +124,8 @@ class ToolRunner:
         # Evaluate policy
         decision, category, reason = ApprovalPolicy.evaluate(operation_cmd, dry_run=self.dry_run)
         
-        # Legacy compatibility: use check_approval_required for requires_approval field
-        requires_approval, legacy_reason, gate_type = ApprovalPolicy.check_approval_required(operation_cmd, dry_run=self.dry_run)
+        # Legacy compatibility: requires_approval field, derived from the same evaluation
+        requires_approval, legacy_reason, gate_type = ApprovalPolicy.legacy_approval(decision, category, reason, dry_run=self.dry_run)
         
         # Handle DENY (legacy: convert to ApprovalRequiredError ONLY for destructive/irreversible denylist items)
         if decision == PolicyDecision.DENY:
@@ -177,16 +239,116 @@ class ToolRunner:
         - Verifies grant before execution
         - Enforces subprocess restrictions (shell=False, timeout, cwd)
         """
-        import subprocess
+        decision, category, reason = self._authorize_limited(grant_id, tool_name, args)
+        return self._run_limited(grant_id, tool_name, args, decision, category, reason)
+    
+    def execute_batch(self, grant_id: str, operations: List[Dict[str, Any]],
+                      max_parallel: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Execute several LIMITED operations under one approval grant
+        
+        The grant is looked up once and every operation is checked before any
+        runs: if one fails the checks, nothing is executed. The commands then
+        run in parallel (LIMITED operations are read-only, so independent) on
+        at most max_parallel threads.
+        
+        Args:
+            operations: [{"tool_name": str, "args": dict}, ...]
+            max_parallel: Concurrent commands (default LIMITED_EXEC_CONCURRENCY)
+        
+        Returns:
+            One execute_tool_limited result per operation, in order
+        
+        Raises:
+            ValueError: If the batch is empty/too large, or an operation fails
+                the grant or allowlist check
+            PolicyDeniedError: If an operation is a NETWORK operation
+        """
+        checked = self._authorize_batch(grant_id, operations)
+        workers = min(max_parallel or LIMITED_EXEC_CONCURRENCY, len(checked))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="limited-batch") as executor:
+            futures = [
+                executor.submit(self._run_limited, grant_id, tool_name, args, *evaluation)
+                for tool_name, args, evaluation in checked
+            ]
+            return [future.result() for future in futures]
+    
+    async def execute_batch_async(self, grant_id: str, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        execute_batch for async callers: the same checks and results, with the
+        commands run by asyncio (bounded by LIMITED_EXEC_CONCURRENCY per loop)
+        and the disk-touching checks in a worker thread
+        """
+        checked = await asyncio.to_thread(self._authorize_batch, grant_id, operations)
+        return list(await asyncio.gather(*(
+            self._run_limited_async(grant_id, tool_name, args, *evaluation)
+            for tool_name, args, evaluation in checked
+        )))
+    
+    def _authorize_limited(self, grant_id: str, tool_name: str, args: Dict[str, Any]):
+        """
+        Grant, NETWORK and allowlist checks of LIMITED mode
+        
+        Returns:
+            (decision, category, reason) of the policy evaluation
+        
+        Raises:
+            ValueError: If the grant is invalid/out of scope or the operation is not allowlisted
+            PolicyDeniedError: If the operation is a NETWORK operation
+        """
+        operation_cmd = f"{tool_name} {args}"
+        cache = get_grant_cache()
+        if cache is not None:
+            evaluation = cache.get(grant_id, operation_cmd)
+            if evaluation is not None:
+                return evaluation
         
         # Verify grant
         from ajson.hands.approval import get_approval_store
         store = get_approval_store()
         
-        operation_cmd = f"{tool_name} {args}"
-        if not store.verify_grant(grant_id, operation_cmd):
+        if cache is None:
+            if not store.verify_grant(grant_id, operation_cmd):
+                raise ValueError(f"Invalid or expired grant, or operation not in scope: {grant_id}")
+            return self._check_limited_policy(operation_cmd)
+        
+        expires_ts = store.verify_grant_until(grant_id, operation_cmd)
+        if expires_ts is None:
             raise ValueError(f"Invalid or expired grant, or operation not in scope: {grant_id}")
+        evaluation = self._check_limited_policy(operation_cmd)
+        cache.put(grant_id, operation_cmd, expires_ts, evaluation)
+        return evaluation
+    
+    def _authorize_batch(self, grant_id: str, operations: List[Dict[str, Any]]):
+        """
+        _authorize_limited for a batch, with a single grant lookup
+        
+        Returns:
+            [(tool_name, args, (decision, category, reason)), ...] in order
+        """
+        if not operations:
+            raise ValueError("Batch has no operations")
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            raise ValueError(f"Batch has {len(operations)} operations (max {MAX_BATCH_OPERATIONS})")
         
+        from ajson.hands.approval import get_approval_store
+        store = get_approval_store()
+        
+        commands = [f"{op['tool_name']} {op['args']}" for op in operations]
+        in_scope = store.verify_grant_batch(grant_id, commands)
+        checked = []
+        for index, (op, operation_cmd) in enumerate(zip(operations, commands)):
+            if not in_scope[index]:
+                raise ValueError(f"operations[{index}]: Invalid or expired grant, or operation not in scope: {grant_id}")
+            try:
+                evaluation = self._check_limited_policy(operation_cmd)
+            except ValueError as e:
+                raise ValueError(f"operations[{index}]: {e}") from e
+            checked.append((op["tool_name"], op["args"], evaluation))
+        return checked
+    
+    def _check_limited_policy(self, operation_cmd: str):
+        """NETWORK and allowlist checks of LIMITED mode (after the grant check)"""
         # Evaluate policy using correct API
         decision, category, reason = ApprovalPolicy.evaluate(operation_cmd, dry_run=False)
         
@@ -209,30 +371,102 @@ class ToolRunner:
                 f"Operation not in allowlist: {operation_cmd}",
             )
         
-        # Execute with subprocess restrictions
+        return decision, category, reason
+    
+    def _run_limited(self, grant_id: str, tool_name: str, args: Dict[str, Any],
+                     decision: PolicyDecision, category: OperationCategory, reason: str) -> Dict[str, Any]:
+        """Run an authorized LIMITED operation (on a warm pooled worker if enabled)"""
+        argv = [tool_name] + [str(v) for v in args.values()]
+        started = time.monotonic()
+        cache, cache_key, cached = self._cached_run(argv, category)
+        if cached is not None:
+            return self._limited_result(grant_id, tool_name, args, *cached, started, cached=True)
+        pool = get_exec_pool()
         try:
-            result = subprocess.run(
-                [tool_name] + [str(v) for v in args.values()],
-                capture_output=True,
-                text=True,
-                shell=False,  # Security: no shell injection
-                timeout=10,   # Safety: prevent infinite hangs
-                cwd="/tmp"    # Isolation: fixed working directory
-            )
-            
-            return {
-                "executed": True,
-                "tool": tool_name,
-                "args": args,
-                "grant_id": grant_id,
-                "returncode": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr
-            }
+            if pool is not None:
+                result = pool.run(argv, cwd=LIMITED_CWD, timeout=LIMITED_TIMEOUT_SECONDS, shell=False)
+            else:
+                result = subprocess.run(
+                    argv,
+                    capture_output=True,
+                    text=True,
+                    shell=False,  # Security: no shell injection
+                    timeout=LIMITED_TIMEOUT_SECONDS,  # Safety: prevent infinite hangs
+                    cwd=LIMITED_CWD                   # Isolation: fixed working directory
+                )
+        except subprocess.TimeoutExpired:
+            error_data = {"error": "timeout", "grant_id": grant_id}
+            self._log_audit(f"{tool_name} {args}", decision, category, reason, error="timeout", result=error_data)
+            return error_data
+        
+        if cache is not None:
+            cache.put(cache_key, (result.returncode, result.stdout, result.stderr))
+        return self._limited_result(grant_id, tool_name, args, result.returncode,
+                                    result.stdout, result.stderr, started)
+    
+    async def execute_tool_limited_async(self, grant_id: str, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        execute_tool_limited for async callers: the same checks and result,
+        with the command run by asyncio (never blocks the event loop)
+        
+        Grant verification (approval store, revocation poll) and the result
+        cache lookup (workspace stat calls) can touch disk, so they run in a
+        worker thread (asyncio.to_thread). At most LIMITED_EXEC_CONCURRENCY commands run at once per event loop;
+        cancelling the call kills the command.
+        """
+        decision, category, reason = await asyncio.to_thread(self._authorize_limited, grant_id, tool_name, args)
+        return await self._run_limited_async(grant_id, tool_name, args, decision, category, reason)
+    
+    async def _run_limited_async(self, grant_id: str, tool_name: str, args: Dict[str, Any],
+                                 decision: PolicyDecision, category: OperationCategory, reason: str) -> Dict[str, Any]:
+        """_run_limited with the command run by asyncio"""
+        argv = [tool_name] + [str(v) for v in args.values()]
+        started = time.monotonic()
+        cache, cache_key, cached = await asyncio.to_thread(self._cached_run, argv, category)
+        if cached is not None:
+            return self._limited_result(grant_id, tool_name, args, *cached, started, cached=True)
+        try:
+            returncode, stdout, stderr = await run_limited_async(argv)
         except subprocess.TimeoutExpired:
             error_data = {"error": "timeout", "grant_id": grant_id}
             self._log_audit(f"{tool_name} {args}", decision, category, reason, error="timeout", result=error_data)
             return error_data
+        
+        if cache is not None:
+            cache.put(cache_key, (returncode, stdout, stderr))
+        return self._limited_result(grant_id, tool_name, args, returncode, stdout, stderr, started)
+    
+    @staticmethod
+    def _cached_run(argv: List[str], category: OperationCategory):
+        """
+        Result cache lookup for a READONLY operation
+        
+        Returns:
+            (cache, key, cached run); cache is None when caching does not apply
+        """
+        cache = get_result_cache() if category == OperationCategory.READONLY else None
+        if cache is None:
+            return None, None, None
+        key = cache.key(argv, LIMITED_CWD)
+        return cache, key, cache.get(key)
+    
+    @staticmethod
+    def _limited_result(grant_id: str, tool_name: str, args: Dict[str, Any], returncode: int,
+                        stdout: str, stderr: str, started: float, cached: bool = False) -> Dict[str, Any]:
+        """Result dict of a LIMITED execution (with "cached": True if served from the result cache)"""
+        result = {
+            "executed": True,
+            "tool": tool_name,
+            "args": args,
+            "grant_id": grant_id,
+            "returncode": returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+            "latency_ms": round((time.monotonic() - started) * 1000, 3)
+        }
+        if cached:
+            result["cached"] = True
+        return result
     
     def _execute_actual(
         self,
@@ -0,0 +1,89 @@
+"""
+Approval grant scopes: one scope language, compiled once per grant
+
+A scope is a list of patterns; an operation is in scope if any pattern
+matches it. Operations and patterns are compared case-insensitively with
+runs of whitespace collapsed to one space.
+- "*" matches every operation
+- A pattern with glob characters (*, ?, [...]) must match the whole
+  operation, fnmatch-style ("git *", "pytest tests/test_*.py")
+- Any other pattern is a command prefix on word boundaries: "git status"
+  matches "git status" and "git status --short", not "git statusx";
+  "ls" matches "ls -la", not "lsblk"
+An empty scope matches nothing. literal() turns an operation into a pattern
+for that operation, with its glob characters taken literally (the default
+scope of a grant is its own requested operation).
+
+ScopeMatcher answers a match with one set lookup per leading word of the
+operation (up to the longest prefix pattern) plus at most one regex search,
+independent of how many patterns the scope has. Both approval stores use it.
+"""
+import fnmatch
+import glob
+import re
+from functools import lru_cache
+from typing import Iterable, Optional, Pattern
+
+SCOPE_CACHE_SIZE = 1024
+_GLOB_CHARS = frozenset("*?[")
+
+
+def normalize(text: str) -> str:
+    """Lowercase with whitespace runs collapsed (the form patterns match against)"""
+    return " ".join(text.lower().split())
+
+
+def literal(operation: str) -> str:
+    """Pattern matching the operation itself ("cat data[1].csv" is not a glob)"""
+    return glob.escape(operation)
+
+
+class ScopeMatcher:
+    """Compiled scope: prefix patterns in a set, glob patterns in one regex"""
+
+    __slots__ = ("match_all", "_prefixes", "_max_words", "_globs")
+
+    def __init__(self, patterns: Iterable[str]):
+        self.match_all = False
+        self._prefixes = set()
+        self._max_words = 0
+        globs = []
+        for pattern in patterns:
+            pattern = normalize(pattern)
+            if not pattern:
+                continue
+            if pattern == "*":
+                self.match_all = True
+            elif _GLOB_CHARS.intersection(pattern):
+                globs.append(fnmatch.translate(pattern))
+            else:
+                self._prefixes.add(pattern)
+                self._max_words = max(self._max_words, pattern.count(" ") + 1)
+        self._globs: Optional[Pattern[str]] = re.compile("|".join(globs)) if globs else None
+
+    def matches(self, operation: str) -> bool:
+        """True if the operation is in scope"""
+        if self.match_all:
+            return True
+        lowered = operation.lower()
+        if self._prefixes:
+            # split() with no separator also collapses whitespace runs
+            words = lowered.split(None, self._max_words)
+            prefix = None
+            for word in words[:self._max_words]:
+                prefix = word if prefix is None else f"{prefix} {word}"
+                if prefix in self._prefixes:
+                    return True
+        if self._globs is None:
+            return False
+        return self._globs.match(" ".join(lowered.split())) is not None
+
+
+@lru_cache(maxsize=SCOPE_CACHE_SIZE)
+def _compile(patterns: tuple) -> ScopeMatcher:
+    return ScopeMatcher(patterns)
+
+
+def compile_scope(patterns: Iterable[str]) -> ScopeMatcher:
+    """Compiled matcher for a scope (shared by grants with the same patterns)"""
+    return _compile(tuple(patterns))
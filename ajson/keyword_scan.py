@@ -0,0 +1,143 @@
+"""
+Multi-pattern keyword scanner for AJSON MVP
+
+One Aho–Corasick automaton over every keyword table used for text screening
+(tools denylist, approval-gate keywords, pre-audit danger keywords), so a
+text is scanned once, in a single linear pass, however many tables and
+keywords there are. Each hit reports its keyword, category and offset.
+
+The shared scanner is built from the policy rule file (ajson/policy_rules.py)
+once per rule version.
+"""
+import functools
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ajson.policy_rules import RuleSet, get_rules
+
+
+# Categories of the shared scanner
+CATEGORY_DENY = "deny"  # tools.runner denylist
+CATEGORY_DANGER = "danger"  # pre-audit dangerous keywords
+GATE_CATEGORY_PREFIX = "gate:"  # approval gates: "gate:deploy", "gate:delete", ...
+
+# Distinct texts whose hits are memoized per scanner
+SCAN_CACHE_SIZE = 256
+
+
+class KeywordHit(NamedTuple):
+    """One keyword occurrence"""
+    keyword: str
+    category: str
+    rank: int  # Position of the keyword in its category's table
+    start: int  # Offsets into the lowercased text
+    end: int
+
+
+class KeywordScanner:
+    """Aho–Corasick automaton over (keyword, category) pairs, case-insensitive"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        """
+        Build the automaton
+
+        Args:
+            entries: (keyword, category) pairs; a keyword may appear in several
+                categories. Rank is the keyword's order within its category.
+        """
+        self._delta: List[Dict[str, int]] = [{}]
+        self._outputs: List[List[Tuple[str, str, int]]] = [[]]
+        ranks: Dict[str, int] = {}
+
+        for keyword, category in entries:
+            rank = ranks.get(category, 0)
+            ranks[category] = rank + 1
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = self._delta[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._delta)
+                    self._delta[state][ch] = nxt
+                    self._delta.append({})
+                    self._outputs.append([])
+                state = nxt
+            self._outputs[state].append((keyword, category, rank))
+
+        self._build_failure_links()
+        self.scan = functools.lru_cache(maxsize=SCAN_CACHE_SIZE)(self._scan)
+
+    def _build_failure_links(self):
+        """Complete goto into a DFA (breadth-first) and merge suffix outputs"""
+        delta = self._delta
+        fail = [0] * len(delta)
+        queue = deque(delta[0].values())  # Depth-1 states fail to the root
+        while queue:
+            state = queue.popleft()
+            # Failure states are shallower, so already complete when reached here
+            self._outputs[state] = self._outputs[state] + self._outputs[fail[state]]
+            for ch, nxt in delta[state].items():
+                if state:
+                    fail[nxt] = delta[fail[state]].get(ch, 0)
+                queue.append(nxt)
+            # Inherit the failure state's transitions: no failure walks at scan time
+            if state:
+                for ch, target in delta[fail[state]].items():
+                    delta[state].setdefault(ch, target)
+
+    def _scan(self, text: str) -> Tuple[KeywordHit, ...]:
+        """
+        Every keyword occurrence in text (overlapping), in order of end offset
+
+        Memoized per text (scan() is the cached entry point).
+        """
+        hits = []
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for i, ch in enumerate(text.lower()):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for keyword, category, rank in outputs[state]:
+                    hits.append(KeywordHit(keyword, category, rank, i + 1 - len(keyword), i + 1))
+        return tuple(hits)
+
+    def first(self, text: str, category: str, whole_words: bool = False) -> Optional[KeywordHit]:
+        """
+        Hit of `category` whose keyword comes first in its table (None if no hit)
+
+        Args:
+            whole_words: Only count hits not touching a letter, digit or "_"
+                on either side (e.g. "rm" in "rm -rf" but not in "--norm")
+        """
+        hits = (h for h in self.scan(text) if h.category == category)
+        if whole_words:
+            text = text.lower()
+            hits = (h for h in hits if _is_whole_word(text, h.start, h.end))
+        return min(hits, key=lambda h: h.rank, default=None)
+
+    def categories(self, text: str) -> List[str]:
+        """Distinct categories hit, in order of first occurrence"""
+        return list(dict.fromkeys(h.category for h in self.scan(text)))
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    if start > 0 and (text[start - 1].isalnum() or text[start - 1] == "_"):
+        return False
+    return end >= len(text) or not (text[end].isalnum() or text[end] == "_")
+
+
+def build_scanner(rules: RuleSet) -> KeywordScanner:
+    """Shared scanner over every keyword table of a rule snapshot"""
+    entries = [(k, CATEGORY_DENY) for k in rules.tools["denylist"]]
+    entries += [(k, CATEGORY_DANGER) for k in rules.keywords["pre_audit_danger"]]
+    for gate_type, keywords in rules.keywords["approval_gates"].items():
+        entries += [(k, GATE_CATEGORY_PREFIX + gate_type) for k in keywords]
+    return KeywordScanner(entries)
+
+
+def get_keyword_scanner() -> KeywordScanner:
+    """Get the shared scanner for the current rules (built once per rule version)"""
+    return get_rules().derived("keyword_scanner", build_scanner)
@@ -1,6 +1,7 @@
 """
 Mock LLM responses for DRY_RUN mode
 """
+from ajson.keyword_scan import CATEGORY_DANGER, get_keyword_scanner
 
 
 def get_jarvis_plan(mission_description: str) -> str:
@@ -48,15 +49,14 @@ def get_cody_pre_audit(plan: str) -> dict:
         description_part = plan_lower
     
     # 承認ゲートキーワードの検出（descriptionで検査）
-    dangerous_keywords = ["deploy", "delete", "drop", "public", "external", "sudo", "rm", "production"]
-    
-    for keyword in dangerous_keywords:
-        if keyword in description_part:
-            return {
-                "approved": False,
-                "reason": f"Approval required: Detected potentially dangerous operation '{keyword}'",
-                "gate_type": "security"
-            }
+    # Keywords: shared rule file, "keywords.pre_audit_danger" (first listed is reported)
+    hit = get_keyword_scanner().first(description_part, CATEGORY_DANGER)
+    if hit is not None:
+        return {
+            "approved": False,
+            "reason": f"Approval required: Detected potentially dangerous operation '{hit.keyword}'",
+            "gate_type": "security"
+        }
     
     return {
         "approved": True,
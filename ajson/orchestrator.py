@@ -1,13 +1,15 @@
 """
 State machine orchestrator for AJSON MVP
 """
+from typing import Dict, Any
+
 from ajson import db
 from ajson.models import MissionStatus, StepStatus
 from ajson.roles import jarvis, cody
 from ajson.tools import runner
 
 
-def execute_mission(mission_id: int):
+def execute_mission(mission_id: int) -> str:
     """
     Execute mission through state transitions
     
@@ -15,68 +17,82 @@ def execute_mission(mission_id: int):
     CREATED → PLANNED → PRE_AUDIT → EXECUTE → POST_AUDIT → FINALIZE → DONE
                                       ↓
                               PENDING_APPROVAL (if approval needed)
+    
+    Returns:
+        Mission status after the transition
     """
     mission = db.get_mission(mission_id)
     if not mission:
         raise ValueError(f"Mission {mission_id} not found")
     
+    return advance_mission(mission)
+
+
+def advance_mission(mission: Dict[str, Any]) -> str:
+    """
+    Run one state transition for an already-loaded mission
+    
+    Lets a caller that drives the mission repeatedly (see ajson.engine) hand
+    the status over in memory instead of re-reading the mission each step.
+    
+    Returns:
+        Mission status after the transition
+    """
+    mission_id = mission["id"]
     status = mission["status"]
     
     # State transition logic
     if status == MissionStatus.CREATED:
-        _transition_to_planned(mission_id, mission["description"])
+        return _transition_to_planned(mission_id, mission["description"])
     elif status == MissionStatus.PLANNED:
-        _transition_to_pre_audit(mission_id)
+        return _transition_to_pre_audit(mission_id, mission["description"])
     elif status == MissionStatus.PRE_AUDIT:
-        _transition_to_execute(mission_id)
+        return _transition_to_execute(mission_id)
     elif status == MissionStatus.EXECUTE:
-        _transition_to_post_audit(mission_id)
+        return _transition_to_post_audit(mission_id)
     elif status == MissionStatus.POST_AUDIT:
-        _transition_to_finalize(mission_id)
+        return _transition_to_finalize(mission_id)
     elif status == MissionStatus.FINALIZE:
-        _transition_to_done(mission_id)
+        return _transition_to_done(mission_id)
     elif status == MissionStatus.PENDING_APPROVAL:
         # Wait for manual approval
-        return
+        return status
     elif status == MissionStatus.DONE:
         # Already complete
-        return
+        return status
     else:
         raise ValueError(f"Unknown status: {status}")
 
 
-def _transition_to_planned(mission_id: int, description: str):
+def _transition_to_planned(mission_id: int, description: str) -> str:
     """CREATED → PLANNED"""
     # Jarvis creates plan
     plan = jarvis.plan_mission(description)
     
-    # Create step record
-    step_id = db.create_step(
-        mission_id=mission_id,
-        role="jarvis",
-        input_data=description,
-        status=StepStatus.COMPLETED
-    )
-    db.update_step(step_id, plan, StepStatus.COMPLETED)
-    
-    # Create artifact
-    db.create_artifact(
-        mission_id=mission_id,
-        artifact_type="plan",
-        path=f"mission_{mission_id}_plan.md",
-        content=plan
-    )
-    
-    # Update mission status
-    db.update_mission_status(mission_id, MissionStatus.PLANNED)
+    # Record step, artifact and status in one commit
+    with db.transaction():
+        step_id = db.create_step(
+            mission_id=mission_id,
+            role="jarvis",
+            input_data=description,
+            status=StepStatus.COMPLETED
+        )
+        db.update_step(step_id, plan, StepStatus.COMPLETED)
+        
+        db.create_artifact(
+            mission_id=mission_id,
+            artifact_type="plan",
+            path=f"mission_{mission_id}_plan.md",
+            content=plan
+        )
+        
+        db.update_mission_status(mission_id, MissionStatus.PLANNED)
+    return MissionStatus.PLANNED
 
 
-def _transition_to_pre_audit(mission_id: int):
+def _transition_to_pre_audit(mission_id: int, description: str) -> str:
     """PLANNED → PRE_AUDIT (or PENDING_APPROVAL)"""
-    # Get mission description and plan
-    mission = db.get_mission(mission_id)
-    description = mission["description"]
-    
+    # Get plan
     steps = db.get_steps_by_mission(mission_id)
     plan_step = [s for s in steps if s["role"] == "jarvis"][-1]
     plan = plan_step["output_data"]
@@ -85,82 +101,110 @@ def _transition_to_pre_audit(mission_id: int):
     combined_input = f"Description: {description}\n\nPlan: {plan}"
     audit_result = cody.pre_audit(combined_input)
     
-    # Create step record
-    step_id = db.create_step(
-        mission_id=mission_id,
-        role="cody_pre_audit",
-        input_data=combined_input,
-        status=StepStatus.COMPLETED
-    )
-    db.update_step(step_id, str(audit_result), StepStatus.COMPLETED)
-    
-    if not audit_result["approved"]:
-        # Approval required
-        db.create_approval(
+    with db.transaction():
+        step_id = db.create_step(
             mission_id=mission_id,
-            gate_type=audit_result["gate_type"],
-            reason=audit_result["reason"]
+            role="cody_pre_audit",
+            input_data=combined_input,
+            status=StepStatus.COMPLETED
         )
-        db.update_mission_status(mission_id, MissionStatus.PENDING_APPROVAL)
-    else:
-        db.update_mission_status(mission_id, MissionStatus.PRE_AUDIT)
+        db.update_step(step_id, str(audit_result), StepStatus.COMPLETED)
+        
+        if not audit_result["approved"]:
+            # Approval required
+            db.create_approval(
+                mission_id=mission_id,
+                gate_type=audit_result["gate_type"],
+                reason=audit_result["reason"]
+            )
+            next_status = MissionStatus.PENDING_APPROVAL
+        else:
+            next_status = MissionStatus.PRE_AUDIT
+        db.update_mission_status(mission_id, next_status)
+    return next_status
 
 
-def _transition_to_execute(mission_id: int):
+def _transition_to_execute(mission_id: int) -> str:
     """PRE_AUDIT → EXECUTE"""
-    # Execute test command (mock execution)
-    step_id = db.create_step(
-        mission_id=mission_id,
-        role="ants_worker",
-        input_data="Execute pytest",
-        status=StepStatus.RUNNING
-    )
-    
-    # Run safe command
-    success, result, error = runner.run_tool("echo 'Mock test execution: All tests passed'")
-    
-    # Record tool run
-    db.create_tool_run(
-        step_id=step_id,
-        command="echo 'Mock test execution: All tests passed'",
-        result=result,
-        blocked=not success,
-        block_reason=error
+    # Run safe command (mock execution) before taking the write lock;
+    # output streams to the console while it runs
+    command = "echo 'Mock test execution: All tests passed'"
+    run = runner.run_tool_captured(
+        command,
+        on_output=lambda stream, chunk: db.publish_tool_output(mission_id, command, stream, chunk)
     )
+    success, result, error = run.success, run.result, run.error
     
-    db.update_step(step_id, result, StepStatus.COMPLETED if success else StepStatus.FAILED)
-    db.update_mission_status(mission_id, MissionStatus.EXECUTE)
+    with db.transaction():
+        step_id = db.create_step(
+            mission_id=mission_id,
+            role="ants_worker",
+            input_data="Execute pytest",
+            status=StepStatus.RUNNING
+        )
+        
+        # Record tool run
+        db.create_tool_run(
+            step_id=step_id,
+            command=command,
+            result=result,
+            blocked=not success,
+            block_reason=error,
+            output_bytes=run.output_bytes,
+            stdout_path=run.stdout_path,
+            stderr_path=run.stderr_path
+        )
+        
+        db.update_step(step_id, result, StepStatus.COMPLETED if success else StepStatus.FAILED)
+        db.update_mission_status(mission_id, MissionStatus.EXECUTE)
+    return MissionStatus.EXECUTE
 
 
-def _transition_to_post_audit(mission_id: int):
+def _transition_to_post_audit(mission_id: int) -> str:
     """EXECUTE → POST_AUDIT (or PENDING_APPROVAL)"""
-    # Get execution log
-    tool_runs = db.get_tool_runs_by_mission(mission_id)
-    execution_log = "\n".join([f"{tr['command']}: {tr['result']}" for tr in tool_runs])
+    # Only tool runs after the previous post-audit's checkpoint are scanned,
+    # streamed in bounded windows
+    previous = db.get_latest_audit_verdict(mission_id)
+    after_id = previous["last_tool_run_id"] if previous else 0
+    tool_runs = db.iter_tool_runs_by_mission(mission_id, after_id=after_id)
     
     # Cody post-audit
-    audit_result = cody.post_audit(execution_log)
+    audit_result = cody.post_audit_incremental(tool_runs)
+    last_tool_run_id = audit_result.pop("last_tool_run_id") or after_id
+    runs_audited = audit_result.pop("runs_audited")
     
-    step_id = db.create_step(
-        mission_id=mission_id,
-        role="cody_post_audit",
-        input_data=execution_log,
-        status=StepStatus.COMPLETED
-    )
-    db.update_step(step_id, str(audit_result), StepStatus.COMPLETED)
-    
-    if not audit_result["approved"]:
-        db.create_approval(
+    with db.transaction():
+        step_id = db.create_step(
             mission_id=mission_id,
-            gate_type=audit_result["gate_type"],
-            reason=audit_result["reason"]
+            role="cody_post_audit",
+            input_data=f"Audited {runs_audited} tool run(s) after #{after_id} (through #{last_tool_run_id})",
+            status=StepStatus.COMPLETED
         )
-        db.update_mission_status(mission_id, MissionStatus.PENDING_APPROVAL)
-    else:
-        db.update_mission_status(mission_id, MissionStatus.POST_AUDIT)
+        db.update_step(step_id, str(audit_result), StepStatus.COMPLETED)
+        db.create_audit_verdict(
+            mission_id=mission_id,
+            step_id=step_id,
+            last_tool_run_id=last_tool_run_id,
+            runs_audited=runs_audited,
+            approved=audit_result["approved"],
+            reason=audit_result["reason"],
+            gate_type=audit_result["gate_type"]
+        )
+        
+        if not audit_result["approved"]:
+            db.create_approval(
+                mission_id=mission_id,
+                gate_type=audit_result["gate_type"],
+                reason=audit_result["reason"]
+            )
+            next_status = MissionStatus.PENDING_APPROVAL
+        else:
+            next_status = MissionStatus.POST_AUDIT
+        db.update_mission_status(mission_id, next_status)
+    return next_status
 
 
-def _transition_to_finalize(mission_id: int):
+def _transition_to_finalize(mission_id: int) -> str:
     """POST_AUDIT → FINALIZE"""
     # Jarvis creates final report
     steps = db.get_steps_by_mission(mission_id)
@@ -168,27 +212,30 @@ def _transition_to_finalize(mission_id: int):
     
     final_report = jarvis.finalize_mission(mission_id, steps_summary)
     
-    step_id = db.create_step(
-        mission_id=mission_id,
-        role="jarvis_finalize",
-        input_data=steps_summary,
-        status=StepStatus.COMPLETED
-    )
-    db.update_step(step_id, final_report, StepStatus.COMPLETED)
-    
-    db.create_artifact(
-        mission_id=mission_id,
-        artifact_type="final_report",
-        path=f"mission_{mission_id}_report.md",
-        content=final_report
-    )
-    
-    db.update_mission_status(mission_id, MissionStatus.FINALIZE)
+    with db.transaction():
+        step_id = db.create_step(
+            mission_id=mission_id,
+            role="jarvis_finalize",
+            input_data=steps_summary,
+            status=StepStatus.COMPLETED
+        )
+        db.update_step(step_id, final_report, StepStatus.COMPLETED)
+        
+        db.create_artifact(
+            mission_id=mission_id,
+            artifact_type="final_report",
+            path=f"mission_{mission_id}_report.md",
+            content=final_report
+        )
+        
+        db.update_mission_status(mission_id, MissionStatus.FINALIZE)
+    return MissionStatus.FINALIZE
 
 
-def _transition_to_done(mission_id: int):
+def _transition_to_done(mission_id: int) -> str:
     """FINALIZE → DONE"""
     db.update_mission_status(mission_id, MissionStatus.DONE)
+    return MissionStatus.DONE
 
 
 def approve_mission(mission_id: int):
@@ -200,13 +247,6 @@ def approve_mission(mission_id: int):
     if not approvals:
         raise ValueError(f"No pending approvals for mission {mission_id}")
     
-    # Approve all pending
-    for approval in approvals:
-        db.approve_approval(approval["id"])
-    
-    # Resume from where we stopped
-    mission = db.get_mission(mission_id)
-    
     # Determine next state based on last step role
     steps = db.get_steps_by_mission(mission_id)
     if steps:
@@ -226,5 +266,9 @@ def approve_mission(mission_id: int):
         # No steps found, default to PRE_AUDIT
         resume_state = MissionStatus.PRE_AUDIT
     
-    db.update_mission_status(mission_id, resume_state)
+    # Approve all pending and resume in one commit
+    with db.transaction():
+        for approval in approvals:
+            db.approve_approval(approval["id"])
+        db.update_mission_status(mission_id, resume_state)
 
@@ -0,0 +1,273 @@
+"""
+Shared, hot-reloadable policy rules for AJSON MVP
+
+Single source of the rule lists used by both policy engines:
+- ajson.hands.policy.ApprovalPolicy ("hands" section)
+- ajson.tools.runner allow/deny checks ("tools" section)
+- ajson.keyword_scan keyword tables for approval-gate detection and the
+  pre-audit ("keywords" section)
+
+Rules live in a JSON file (ajson/config/policy_rules.json, or
+POLICY_RULES_PATH). Each version of the file is loaded into an immutable,
+fully compiled RuleSet snapshot:
+- Callers take the current snapshot via get_rules() and evaluate against it,
+  so a reload swapping in a new snapshot never disturbs in-flight evaluations
+- The file is re-checked (stat) at most every RULES_RELOAD_CHECK_SECONDS;
+  a changed file costs one compile, and content already seen (e.g. touched
+  or reverted) reuses its compiled snapshot
+- An invalid file is logged and ignored; the last good rules stay active
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Pattern, Sequence, Tuple
+
+
+RULES_PATH = os.getenv(
+    "POLICY_RULES_PATH",
+    os.path.join(os.path.dirname(__file__), "config", "policy_rules.json")
+)
+RULES_RELOAD_CHECK_SECONDS = float(os.getenv("RULES_RELOAD_CHECK_SECONDS", "1.0"))
+
+# Required list keys per section (order of entries in a list is significant:
+# the first matching entry is reported)
+RULE_SECTIONS = {
+    "hands": (
+        "allowlist", "denylist", "destructive_patterns",
+        "paid_api_patterns", "irreversible_patterns", "network_patterns",
+    ),
+    "tools": ("denylist", "allowlist"),
+    "keywords": ("pre_audit_danger",),
+}
+
+# Keys mapping a name to a list of strings (e.g. gate type -> keywords)
+MAPPING_KEYS = {"keywords": ("approval_gates",)}
+
+# Keys whose entries are regular expressions (validated on load)
+REGEX_KEYS = {"destructive_patterns", "paid_api_patterns", "irreversible_patterns", "network_patterns"}
+
+# Compiled snapshots kept by content digest
+SNAPSHOT_CACHE_SIZE = 4
+
+logger = logging.getLogger("ajson.policy_rules")
+
+NEVER = re.compile(r"(?!)")
+
+
+class PolicyRulesError(ValueError):
+    """Raised when a rule file is malformed"""
+
+
+def compile_patterns(patterns: Sequence[str]) -> Pattern:
+    """One case-insensitive alternation of regex patterns (never matches if empty)"""
+    if not patterns:
+        return NEVER
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+def compile_keywords(keywords: Sequence[str]) -> Pattern:
+    """One case-insensitive alternation of literal substrings"""
+    return compile_patterns([re.escape(k) for k in keywords])
+
+
+def compile_prefixes(prefixes: Sequence[str], boundary: bool = False) -> Pattern:
+    """
+    Anchored alternation of literal prefixes (case-sensitive; match lowercased text)
+
+    Args:
+        prefixes: Literal command prefixes
+        boundary: Require whitespace or end of text after the prefix
+    """
+    if not prefixes:
+        return NEVER
+    tail = r"(?:[ \t\n]|\Z)" if boundary else ""
+    return re.compile("^(?:" + "|".join(re.escape(p) for p in prefixes) + ")" + tail)
+
+
+def compile_substrings(substrings: Sequence[str]) -> Pattern:
+    """Unanchored alternation of literal substrings (case-sensitive; match lowercased text)"""
+    if not substrings:
+        return NEVER
+    return re.compile("|".join(re.escape(s) for s in substrings))
+
+
+def _is_string_list(values: Any) -> bool:
+    return isinstance(values, list) and all(isinstance(v, str) for v in values)
+
+
+class RuleSet:
+    """One version of the rule file, compiled (immutable once built)"""
+
+    def __init__(self, data: Dict[str, Any], digest: str = ""):
+        """
+        Validate and compile rule data
+
+        Raises:
+            PolicyRulesError: If a section/list is missing or a pattern is invalid
+        """
+        self.digest = digest
+        self.version = data.get("version", 1)
+        self.hands = self._section(data, "hands")
+        self.tools = self._section(data, "tools")
+        self.keywords = self._section(data, "keywords")
+
+        # tools.runner: denied keywords anywhere, allowed command prefixes
+        self.tools_deny = compile_keywords(self.tools["denylist"])
+        self.tools_allow = compile_prefixes(self.tools["allowlist"])
+
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.Lock()
+
+    @staticmethod
+    def _section(data: Dict[str, Any], name: str) -> Dict[str, Any]:
+        section = data.get(name)
+        if not isinstance(section, dict):
+            raise PolicyRulesError(f"Missing rule section '{name}'")
+        lists: Dict[str, Any] = {}
+        for key in RULE_SECTIONS[name]:
+            values = section.get(key)
+            if not _is_string_list(values):
+                raise PolicyRulesError(f"Rule list '{name}.{key}' must be a list of strings")
+            if key in REGEX_KEYS:
+                for pattern in values:
+                    try:
+                        re.compile(pattern)
+                    except re.error as e:
+                        raise PolicyRulesError(f"Invalid pattern in '{name}.{key}': {pattern!r} ({e})")
+            lists[key] = tuple(values)
+        for key in MAPPING_KEYS.get(name, ()):
+            mapping = section.get(key)
+            if not isinstance(mapping, dict) or not all(_is_string_list(v) for v in mapping.values()):
+                raise PolicyRulesError(f"Rule map '{name}.{key}' must map names to lists of strings")
+            lists[key] = {k: tuple(v) for k, v in mapping.items()}
+        return lists
+
+    def derived(self, key: str, build: Callable[["RuleSet"], Any]) -> Any:
+        """
+        Memoize an engine-specific compiled form of this snapshot
+
+        Lets each consumer compile once per rule version (e.g. the hands
+        policy engine), however many evaluations follow.
+        """
+        value = self._derived.get(key)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = build(self)
+                    self._derived[key] = value
+        return value
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "RuleSet":
+        """Parse and compile rule file contents"""
+        try:
+            data = json.loads(raw.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise PolicyRulesError(f"Rule file is not valid JSON: {e}")
+        if not isinstance(data, dict):
+            raise PolicyRulesError("Rule file must contain a JSON object")
+        return cls(data, hashlib.sha256(raw).hexdigest())
+
+
+class RuleFile:
+    """A rule file on disk with reload-on-change"""
+
+    def __init__(self, path: str, check_interval: float = RULES_RELOAD_CHECK_SECONDS):
+        """
+        Load the rule file (must be valid on first load)
+
+        Args:
+            path: JSON rule file
+            check_interval: Minimum seconds between file change checks
+
+        Raises:
+            PolicyRulesError: If the file is malformed
+            OSError: If the file cannot be read
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._snapshots: "OrderedDict[str, RuleSet]" = OrderedDict()
+        self._signature = self._stat()
+        self._rules = self._load()
+        self._checked_at = time.monotonic()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load(self) -> RuleSet:
+        """Read the file; compile unless this content was compiled before"""
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        rules = self._snapshots.get(digest)
+        if rules is None:
+            rules = RuleSet.from_bytes(raw)
+            self._snapshots[digest] = rules
+            while len(self._snapshots) > SNAPSHOT_CACHE_SIZE:
+                self._snapshots.popitem(last=False)
+        else:
+            self._snapshots.move_to_end(digest)
+        return rules
+
+    def get(self) -> RuleSet:
+        """Current rules (reloaded first if the file changed)"""
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.reload()
+        return self._rules
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reload if the file changed (or force)
+
+        Returns:
+            True if a different rule set is now active
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            signature = self._stat()
+            if not force and signature == self._signature:
+                return False
+            self._signature = signature
+            try:
+                rules = self._load()
+            except (OSError, PolicyRulesError) as e:
+                logger.error("Keeping previous policy rules; reload of %s failed: %s", self.path, e)
+                return False
+            if rules is self._rules:
+                return False
+            self._rules = rules
+            self.reloads += 1
+            logger.info("Policy rules reloaded from %s (%s)", self.path, rules.digest[:12])
+            return True
+
+
+# Global rule file (loaded on first use)
+_rule_file: Optional[RuleFile] = None
+_rule_file_lock = threading.Lock()
+
+
+def get_rule_file() -> RuleFile:
+    """Get the global rule file"""
+    global _rule_file
+    if _rule_file is None:
+        with _rule_file_lock:
+            if _rule_file is None:
+                _rule_file = RuleFile(RULES_PATH)
+    return _rule_file
+
+
+def get_rules() -> RuleSet:
+    """Get the current shared rule snapshot"""
+    return get_rule_file().get()
@@ -3,10 +3,15 @@ Cody role - Pre and post auditing
 """
 from ajson.llm import mock
 import os
+from typing import Any, Dict, Iterable, Iterator, List
 
 
 LLM_MODE = os.getenv("LLM_MODE", "DRY_RUN")
 
+# Bounds of one post-audit window (a single oversized tool run is its own window)
+POST_AUDIT_WINDOW_RUNS = int(os.getenv("POST_AUDIT_WINDOW_RUNS", "50"))
+POST_AUDIT_WINDOW_CHARS = int(os.getenv("POST_AUDIT_WINDOW_CHARS", "65536"))
+
 
 def pre_audit(plan: str) -> dict:
     """
@@ -44,3 +49,63 @@ def post_audit(execution_log: str) -> dict:
         raise NotImplementedError("OpenAI mode not yet implemented")
     else:
         raise ValueError(f"Unknown LLM_MODE: {LLM_MODE}")
+
+
+def iter_audit_windows(tool_runs: Iterable[Dict[str, Any]],
+                       max_runs: int = POST_AUDIT_WINDOW_RUNS,
+                       max_chars: int = POST_AUDIT_WINDOW_CHARS) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Group tool runs into bounded windows, never splitting a run
+
+    Args:
+        tool_runs: Tool runs in execution order (may be a generator)
+        max_runs: Maximum runs per window
+        max_chars: Soft maximum of "command: result" characters per window
+
+    Yields:
+        Lists of tool runs
+    """
+    window: List[Dict[str, Any]] = []
+    chars = 0
+    for run in tool_runs:
+        size = len(run["command"]) + len(run["result"] or "") + 3
+        if window and (len(window) >= max_runs or chars + size > max_chars):
+            yield window
+            window, chars = [], 0
+        window.append(run)
+        chars += size
+    if window:
+        yield window
+
+
+def post_audit_incremental(tool_runs: Iterable[Dict[str, Any]],
+                           max_runs: int = POST_AUDIT_WINDOW_RUNS,
+                           max_chars: int = POST_AUDIT_WINDOW_CHARS) -> dict:
+    """
+    Post-audit tool runs window by window with a running verdict
+
+    Each window is audited with post_audit(); the first rejecting window
+    decides the verdict and scanning stops there.
+
+    Args:
+        tool_runs: Tool runs not yet audited, in execution order
+        max_runs: Maximum runs per window
+        max_chars: Soft maximum of log characters per window
+
+    Returns:
+        dict with 'approved', 'reason', 'gate_type', plus 'runs_audited' and
+        'last_tool_run_id' (None if there was nothing to audit)
+    """
+    verdict = None
+    runs_audited = 0
+    last_tool_run_id = None
+    for window in iter_audit_windows(tool_runs, max_runs, max_chars):
+        verdict = post_audit("\n".join(f"{tr['command']}: {tr['result']}" for tr in window))
+        runs_audited += len(window)
+        last_tool_run_id = window[-1]["id"]
+        if not verdict["approved"]:
+            break
+
+    if verdict is None:
+        verdict = post_audit("")
+    return {**verdict, "runs_audited": runs_audited, "last_tool_run_id": last_tool_run_id}
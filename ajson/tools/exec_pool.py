@@ -0,0 +1,400 @@
+"""
+Warm subprocess executor pool for tool runs
+
+Missions issue hundreds of short commands (ls, cat, grep, pytest
+--collect-only), and forking the large, multi-threaded server process for
+each one dominates their cost. The pool keeps a few small, long-lived worker
+processes per workspace and streams commands to them over pipes; each
+worker runs the command with output_capture.run_streaming and sends back
+the result (and, on request, live output chunks while it runs).
+
+Guarantees are those of the direct subprocess.run calls it replaces:
+- Each command gets exactly the cwd, shell flag and timeout requested
+  (allow/deny checks stay with the caller, before anything is sent)
+- stdin of the command is /dev/null (the worker's stdin is its command pipe)
+- Output is captured with the same head/tail caps and spill files as direct
+  runs (ajson/tools/output_capture.py)
+- A worker that misses the deadline (timeout + grace) is killed and replaced;
+  workers retire after TOOL_POOL_MAX_COMMANDS commands
+- Per-command latency (round trip and in-worker exec time) is reported on
+  each result and aggregated per workspace in stats()
+
+Enabled with TOOL_EXEC_POOL=1 (default off: commands spawn directly).
+
+Protocol: one JSON object per line, each way.
+    request:  {"args": str | [str], "shell": bool, "cwd": str, "timeout": float,
+               "stream": bool, "head_bytes": int, "tail_bytes": int, "spill_dir": str}
+    chunk:    {"chunk": str, "stream": "stdout" | "stderr"}  (zero or more, if "stream")
+    response: {"returncode": int, "stdout": str, "stderr": str, "exec_ms": float,
+               "output_bytes": int, "stdout_path": str | null, "stderr_path": str | null}
+              {"timeout": true, "exec_ms": float}
+              {"error": str, "message": str, "errno": int | null,
+               "strerror": str | null, "filename": str | null}
+
+This file is also the worker's entry point (run as a script; it imports
+nothing outside the standard library but ajson.tools.output_capture).
+"""
+import json
+import os
+import select
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+
+TOOL_EXEC_POOL = os.getenv("TOOL_EXEC_POOL", "0") == "1"
+TOOL_POOL_WORKERS = int(os.getenv("TOOL_POOL_WORKERS", "2"))  # Per workspace
+TOOL_POOL_MAX_COMMANDS = int(os.getenv("TOOL_POOL_MAX_COMMANDS", "500"))
+TOOL_POOL_GRACE_SECONDS = 5.0  # Beyond the command timeout before a worker is killed
+
+WORKER_SCRIPT = os.path.abspath(__file__)
+
+
+class ExecutorPoolError(RuntimeError):
+    """Raised when a worker fails or dies (not when the command fails)"""
+
+
+class _WorkerGone(ExecutorPoolError):
+    """The worker was dead before the command was sent (safe to retry)"""
+
+
+class CommandResult(subprocess.CompletedProcess):
+    """CompletedProcess with the pool's latency measurements and capture details"""
+
+    def __init__(self, args, returncode: int, stdout: str, stderr: str, latency_ms: float, exec_ms: float,
+                 output_bytes: int = 0, stdout_path: Optional[str] = None, stderr_path: Optional[str] = None):
+        super().__init__(args, returncode, stdout, stderr)
+        self.latency_ms = latency_ms  # Round trip seen by the caller
+        self.exec_ms = exec_ms  # Inside the worker (spawn to exit of the command)
+        self.output_bytes = output_bytes
+        self.stdout_path = stdout_path
+        self.stderr_path = stderr_path
+
+
+class _Worker:
+    """One warm worker process"""
+
+    def __init__(self, cwd: str):
+        self.proc = subprocess.Popen(
+            [sys.executable, "-I", WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=cwd,
+        )
+        self.commands = 0
+        self._pending = bytearray()  # Read from stdout but not yet a full line
+
+    @property
+    def pid(self) -> int:
+        return self.proc.pid
+
+    def request(self, payload: Dict[str, Any], deadline: float,
+                on_chunk: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """Send one command and wait for its response until deadline (monotonic)"""
+        try:
+            self.proc.stdin.write(json.dumps(payload).encode() + b"\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, ValueError) as e:
+            raise _WorkerGone(f"Worker {self.pid} is gone: {e}")
+        self.commands += 1
+
+        while True:
+            message = json.loads(self._read_line(deadline))
+            if "chunk" not in message:
+                return message
+            if on_chunk is not None:
+                on_chunk(message["stream"], message["chunk"])
+
+    def _read_line(self, deadline: float) -> bytes:
+        """
+        Next line from the worker
+
+        Reads the raw pipe: a chunk line and the response can arrive in one
+        read, and select() cannot see data held in a file object's buffer.
+        """
+        fd = self.proc.stdout.fileno()
+        while True:
+            end = self._pending.find(b"\n")
+            if end >= 0:
+                line = bytes(self._pending[:end + 1])
+                del self._pending[:end + 1]
+                return line
+            remaining = deadline - time.monotonic()
+            ready, _, _ = select.select([fd], [], [], max(remaining, 0))
+            if not ready:
+                raise ExecutorPoolError(f"Worker {self.pid} missed its deadline")
+            data = os.read(fd, 65536)
+            if not data:
+                raise ExecutorPoolError(f"Worker {self.pid} exited (code {self.proc.poll()})")
+            self._pending += data
+
+    def close(self):
+        """Stop the worker (EOF ends its loop; kill if it does not exit)"""
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            self.kill()
+
+    def kill(self):
+        self.proc.kill()
+        self.proc.wait()
+        for pipe in (self.proc.stdin, self.proc.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+
+class WorkspacePool:
+    """Warm workers serving one workspace (cwd)"""
+
+    def __init__(self, cwd: str, size: int = TOOL_POOL_WORKERS, max_commands: int = TOOL_POOL_MAX_COMMANDS):
+        self.cwd = cwd
+        self.size = max(size, 1)
+        self.max_commands = max_commands
+        self._idle: List[_Worker] = []
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            "commands": 0, "timeouts": 0, "errors": 0, "spawned": 0,
+            "latency_ms_total": 0.0, "latency_ms_max": 0.0, "latency_ms_last": 0.0,
+        }
+
+    def _acquire(self) -> _Worker:
+        with self._cond:
+            while not self._idle and self._live >= self.size:
+                if self._closed:
+                    raise ExecutorPoolError("Executor pool is shut down")
+                self._cond.wait()
+            if self._closed:
+                raise ExecutorPoolError("Executor pool is shut down")
+            if self._idle:
+                return self._idle.pop()
+            self._live += 1
+        try:
+            worker = _Worker(self.cwd)
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["spawned"] += 1
+        return worker
+
+    def _release(self, worker: _Worker, healthy: bool):
+        keep = healthy and not self._closed and worker.commands < self.max_commands
+        if not keep:
+            if healthy:
+                worker.close()
+            else:
+                worker.kill()
+        with self._cond:
+            if keep:
+                self._idle.append(worker)
+            else:
+                self._live -= 1
+            self._cond.notify()
+
+    def run(self, args: Union[str, Sequence[str]], shell: bool, timeout: float,
+            cwd: Optional[str] = None, on_chunk: Optional[Callable[[str, str], None]] = None) -> CommandResult:
+        """
+        Run one command on a warm worker
+
+        Args:
+            on_chunk: Called with (stream, text) for live output while the command runs
+
+        Raises:
+            subprocess.TimeoutExpired: If the command exceeded timeout
+            OSError: As subprocess.run would (e.g. missing executable or cwd)
+            ExecutorPoolError: If the worker failed
+        """
+        payload = {
+            "args": args if isinstance(args, str) else list(args),
+            "shell": shell,
+            "cwd": cwd or self.cwd,
+            "timeout": timeout,
+            "stream": on_chunk is not None,
+            "head_bytes": output_capture.TOOL_OUTPUT_HEAD_BYTES,
+            "tail_bytes": output_capture.TOOL_OUTPUT_TAIL_BYTES,
+            "spill_dir": os.path.abspath(output_capture.TOOL_OUTPUT_DIR),
+        }
+        start = time.monotonic()
+        for attempt in (1, 2):
+            worker = self._acquire()
+            healthy = False
+            try:
+                response = worker.request(payload, start + timeout + TOOL_POOL_GRACE_SECONDS, on_chunk)
+                healthy = True
+                break
+            except _WorkerGone:
+                if attempt == 2:
+                    raise
+            finally:
+                self._release(worker, healthy)
+                if not healthy:
+                    with self._cond:
+                        self._stats["errors"] += 1
+        latency_ms = (time.monotonic() - start) * 1000
+
+        with self._cond:
+            stats = self._stats
+            stats["commands"] += 1
+            stats["latency_ms_total"] += latency_ms
+            stats["latency_ms_max"] = max(stats["latency_ms_max"], latency_ms)
+            stats["latency_ms_last"] = latency_ms
+            if response.get("timeout"):
+                stats["timeouts"] += 1
+
+        if response.get("timeout"):
+            raise subprocess.TimeoutExpired(args, timeout)
+        if "error" in response:
+            if response.get("errno") is not None:
+                raise OSError(response["errno"], response["strerror"], response["filename"])
+            raise ExecutorPoolError(f"{response['error']}: {response['message']}")
+        return CommandResult(
+            args, response["returncode"], response["stdout"], response["stderr"],
+            latency_ms=latency_ms, exec_ms=response["exec_ms"], output_bytes=response["output_bytes"],
+            stdout_path=response["stdout_path"], stderr_path=response["stderr_path"],
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats["workers"] = self._live
+            stats["idle"] = len(self._idle)
+        stats["latency_ms_mean"] = stats["latency_ms_total"] / stats["commands"] if stats["commands"] else 0.0
+        return stats
+
+    def shutdown(self):
+        """Stop idle workers now; busy ones stop when their command returns"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._cond.notify_all()
+        for worker in idle:
+            worker.close()
+
+
+class ExecutorPool:
+    """Warm worker pools keyed by workspace"""
+
+    def __init__(self, size: int = TOOL_POOL_WORKERS, max_commands: int = TOOL_POOL_MAX_COMMANDS):
+        self.size = size
+        self.max_commands = max_commands
+        self._pools: Dict[str, WorkspacePool] = {}
+        self._lock = threading.Lock()
+
+    def workspace(self, cwd: str) -> WorkspacePool:
+        """Get (or create) the pool of a workspace"""
+        key = os.path.abspath(cwd)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = WorkspacePool(key, self.size, self.max_commands)
+                self._pools[key] = pool
+        return pool
+
+    def run(self, args: Union[str, Sequence[str]], cwd: str, timeout: float, shell: bool = False,
+            on_chunk: Optional[Callable[[str, str], None]] = None) -> CommandResult:
+        """Run one command in the workspace `cwd` (see WorkspacePool.run)"""
+        return self.workspace(cwd).run(args, shell=shell, timeout=timeout, cwd=cwd, on_chunk=on_chunk)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-workspace counters and latency"""
+        with self._lock:
+            pools = list(self._pools.values())
+        return {pool.cwd: pool.stats() for pool in pools}
+
+    def shutdown(self):
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.shutdown()
+
+
+# Global pool (created on first use when TOOL_EXEC_POOL is set)
+_exec_pool: Optional[ExecutorPool] = None
+_exec_pool_lock = threading.Lock()
+
+
+def get_exec_pool() -> Optional[ExecutorPool]:
+    """Get the global executor pool, or None when pooling is disabled"""
+    global _exec_pool
+    if not TOOL_EXEC_POOL:
+        return None
+    if _exec_pool is None:
+        with _exec_pool_lock:
+            if _exec_pool is None:
+                _exec_pool = ExecutorPool()
+    return _exec_pool
+
+
+def shutdown_exec_pool():
+    """Stop all warm workers of the global pool"""
+    global _exec_pool
+    with _exec_pool_lock:
+        pool, _exec_pool = _exec_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def _serve():
+    """Worker loop: run each requested command, answer with its result"""
+    out = sys.stdout
+
+    def send(message: Dict[str, Any]):
+        out.write(json.dumps(message) + "\n")
+        out.flush()
+
+    def send_chunk(stream: str, text: str):
+        send({"chunk": text, "stream": stream})
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        start = time.monotonic()
+        try:
+            proc = output_capture.run_streaming(
+                request["args"],
+                shell=request["shell"],
+                cwd=request["cwd"],
+                timeout=request["timeout"],
+                on_chunk=send_chunk if request["stream"] else None,
+                head_bytes=request["head_bytes"],
+                tail_bytes=request["tail_bytes"],
+                spill_dir=request["spill_dir"],
+            )
+            response = {
+                "returncode": proc.returncode, "stdout": proc.stdout, "stderr": proc.stderr,
+                "output_bytes": proc.output_bytes, "stdout_path": proc.stdout_path, "stderr_path": proc.stderr_path,
+            }
+        except subprocess.TimeoutExpired:
+            response = {"timeout": True}
+        except Exception as e:
+            response = {
+                "error": type(e).__name__,
+                "message": str(e),
+                "errno": getattr(e, "errno", None),
+                "strerror": getattr(e, "strerror", None),
+                "filename": getattr(e, "filename", None),
+            }
+        response["exec_ms"] = (time.monotonic() - start) * 1000
+        send(response)
+
+
+if __name__ == "__main__":
+    # Run as a script (isolated mode): make the ajson package importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(WORKER_SCRIPT))))
+    from ajson.tools import output_capture
+    _serve()
+else:
+    from ajson.tools import output_capture
@@ -0,0 +1,216 @@
+"""
+Streaming, size-capped capture of tool output
+
+Replaces capture_output=True buffering for tool runs: stdout and stderr are
+read incrementally while the command runs, and only a bounded head and tail
+of each stream is kept in memory (and later stored in tool_runs.result /
+steps.output_data). Output beyond that budget is spilled, in full, to a
+file under TOOL_OUTPUT_DIR whose path is recorded with the tool run. Live
+chunks can be handed to a listener as they arrive.
+
+Stdlib only: also used inside executor pool workers (ajson/tools/exec_pool.py).
+"""
+import codecs
+import locale
+import os
+import selectors
+import subprocess
+import time
+import uuid
+from typing import Callable, List, Optional, Sequence, Union
+
+
+TOOL_OUTPUT_HEAD_BYTES = int(os.getenv("TOOL_OUTPUT_HEAD_BYTES", "32768"))
+TOOL_OUTPUT_TAIL_BYTES = int(os.getenv("TOOL_OUTPUT_TAIL_BYTES", "32768"))
+TOOL_OUTPUT_DIR = os.getenv("TOOL_OUTPUT_DIR", "./tool_outputs")
+
+# Live chunks are coalesced up to this size / interval, and stop after
+# LIVE_OUTPUT_MAX_BYTES per stream (the capture itself continues)
+LIVE_CHUNK_BYTES = 8192
+LIVE_CHUNK_SECONDS = 0.25
+LIVE_OUTPUT_MAX_BYTES = int(os.getenv("LIVE_OUTPUT_MAX_BYTES", "262144"))
+
+READ_CHUNK_BYTES = 65536
+KILL_DRAIN_SECONDS = 1.0  # Reading after a timeout kill, for pipes held by grandchildren
+
+# Listener of live output: (stream name, text)
+ChunkListener = Callable[[str, str], None]
+
+
+def decode_output(data: bytes) -> str:
+    """Bytes to text as text=True would (locale encoding, universal newlines)"""
+    text = data.decode(locale.getpreferredencoding(False), errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class StreamCapture:
+    """One output stream: head and tail kept in memory, overflow spilled to a file"""
+
+    def __init__(self, name: str, head_bytes: int = TOOL_OUTPUT_HEAD_BYTES,
+                 tail_bytes: int = TOOL_OUTPUT_TAIL_BYTES, spill_dir: str = TOOL_OUTPUT_DIR,
+                 spill_prefix: Optional[str] = None):
+        self.name = name
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.spill_dir = spill_dir
+        self.spill_prefix = spill_prefix or uuid.uuid4().hex
+        self.total_bytes = 0
+        self.spill_path: Optional[str] = None
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._spill = None
+
+    @property
+    def truncated(self) -> bool:
+        return self.total_bytes > self.head_bytes + self.tail_bytes
+
+    def write(self, data: bytes):
+        """Add output (any chunk size)"""
+        self.total_bytes += len(data)
+        if self._spill is not None:
+            self._spill.write(data)
+        room = self.head_bytes - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if not data:
+            return
+        self._tail += data
+        if self._spill is None and self.truncated:
+            self._start_spill()
+        if len(self._tail) > 2 * self.tail_bytes:
+            del self._tail[:len(self._tail) - self.tail_bytes]
+
+    def _start_spill(self):
+        """First overflow: nothing dropped yet, so head + tail is the full output"""
+        os.makedirs(self.spill_dir, exist_ok=True)
+        self.spill_path = os.path.abspath(os.path.join(self.spill_dir, f"{self.spill_prefix}.{self.name}.log"))
+        self._spill = open(self.spill_path, "wb")
+        self._spill.write(bytes(self._head))
+        self._spill.write(bytes(self._tail))
+
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+
+    def text(self) -> str:
+        """Captured text: full output, or head + omission marker + tail"""
+        if not self.truncated:
+            return decode_output(bytes(self._head) + bytes(self._tail))
+        tail = bytes(self._tail[-self.tail_bytes:]) if self.tail_bytes else b""
+        omitted = self.total_bytes - len(self._head) - len(tail)
+        marker = f"\n... [{omitted} bytes omitted; full {self.name}: {self.spill_path}] ...\n"
+        return decode_output(bytes(self._head)) + marker + decode_output(tail)
+
+
+class _LiveStream:
+    """Coalesces decoded chunks of one stream for a listener"""
+
+    def __init__(self, name: str, listener: ChunkListener):
+        self.name = name
+        self.listener = listener
+        self.sent_bytes = 0
+        self._decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))(errors="replace")
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self._flushed_at = time.monotonic()
+
+    def feed(self, data: bytes):
+        if self.sent_bytes >= LIVE_OUTPUT_MAX_BYTES:
+            return
+        data = data[:LIVE_OUTPUT_MAX_BYTES - self.sent_bytes]
+        self.sent_bytes += len(data)
+        self._pending.append(self._decoder.decode(data))
+        self._pending_bytes += len(data)
+        if self.sent_bytes >= LIVE_OUTPUT_MAX_BYTES:
+            self._pending.append(self._decoder.decode(b"", final=True))
+            self._pending.append(f"\n... [live {self.name} truncated] ...\n")
+            self.flush()
+        elif self._pending_bytes >= LIVE_CHUNK_BYTES or time.monotonic() - self._flushed_at >= LIVE_CHUNK_SECONDS:
+            self.flush()
+
+    def flush(self, final: bool = False):
+        if final and self.sent_bytes < LIVE_OUTPUT_MAX_BYTES:
+            self._pending.append(self._decoder.decode(b"", final=True))
+        text = "".join(self._pending)
+        self._pending = []
+        self._pending_bytes = 0
+        self._flushed_at = time.monotonic()
+        if text:
+            self.listener(self.name, text.replace("\r\n", "\n"))
+
+
+class CapturedProcess(subprocess.CompletedProcess):
+    """CompletedProcess whose stdout/stderr are the capped captures"""
+
+    def __init__(self, args, returncode: int, stdout: StreamCapture, stderr: StreamCapture):
+        super().__init__(args, returncode, stdout.text(), stderr.text())
+        self.output_bytes = stdout.total_bytes + stderr.total_bytes
+        self.stdout_path = stdout.spill_path
+        self.stderr_path = stderr.spill_path
+
+
+def run_streaming(args: Union[str, Sequence[str]], shell: bool, cwd: Optional[str], timeout: float,
+                  on_chunk: Optional[ChunkListener] = None,
+                  head_bytes: int = TOOL_OUTPUT_HEAD_BYTES, tail_bytes: int = TOOL_OUTPUT_TAIL_BYTES,
+                  spill_dir: str = TOOL_OUTPUT_DIR) -> CapturedProcess:
+    """
+    Run a command like subprocess.run(capture_output=True, text=True), streaming
+
+    Args:
+        on_chunk: Called with (stream, text) for live output while the command runs
+
+    Raises:
+        subprocess.TimeoutExpired: If the command exceeded timeout (it is killed)
+        OSError: As subprocess.run would (e.g. missing executable or cwd)
+    """
+    prefix = uuid.uuid4().hex
+    captures = {
+        name: StreamCapture(name, head_bytes, tail_bytes, spill_dir, prefix)
+        for name in ("stdout", "stderr")
+    }
+    live = {name: _LiveStream(name, on_chunk) for name in captures} if on_chunk else {}
+
+    proc = subprocess.Popen(
+        args, shell=shell, cwd=cwd,
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    deadline = time.monotonic() + timeout
+    timed_out = False
+    try:
+        with selectors.DefaultSelector() as selector:
+            selector.register(proc.stdout, selectors.EVENT_READ, "stdout")
+            selector.register(proc.stderr, selectors.EVENT_READ, "stderr")
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    if timed_out:
+                        break  # Pipes still held open by grandchildren
+                    proc.kill()
+                    timed_out = True
+                    deadline = time.monotonic() + KILL_DRAIN_SECONDS
+                    continue
+                for key, _ in selector.select(remaining):
+                    data = os.read(key.fileobj.fileno(), READ_CHUNK_BYTES)
+                    if not data:
+                        selector.unregister(key.fileobj)
+                        continue
+                    captures[key.data].write(data)
+                    if key.data in live:
+                        live[key.data].feed(data)
+        for stream in live.values():
+            stream.flush(final=True)
+        if timed_out:
+            proc.wait()
+            raise subprocess.TimeoutExpired(args, timeout)
+        returncode = proc.wait(max(deadline - time.monotonic(), 0))
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        proc.stdout.close()
+        proc.stderr.close()
+        for capture in captures.values():
+            capture.close()
+    return CapturedProcess(args, returncode, captures["stdout"], captures["stderr"])
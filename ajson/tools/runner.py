@@ -1,52 +1,160 @@
 """
 Safe tool runner with allowlist/denylist enforcement
 """
+import functools
+import re
+import shlex
 import subprocess
 import os
-from typing import Tuple, Optional
-
-
-# Denylist: 禁止コマンド・キーワード
-DENYLIST = [
-    # 破壊コマンド
-    "rm", "rd", "del", "delete",
-    "format", "mkfs",
-    # 権限変更
-    "chmod", "chown", "sudo", "su",
-    # プロセス管理
-    "kill", "pkill", "killall",
-    # ネットワーク
-    "curl", "wget", "nc", "netcat",
-    # システム操作
-    "reboot", "shutdown", "halt",
-    "mount", "umount",
-]
-
-# Allowlist: 許可コマンド
-ALLOWLIST = [
-    "python", "python3",
-    "pytest",
-    "git status", "git log", "git diff", "git show",
-    "ls", "cat", "echo", "pwd",
-    "grep", "find",
-]
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from ajson.keyword_scan import GATE_CATEGORY_PREFIX, get_keyword_scanner
+from ajson.policy_rules import get_rules
+from ajson.tools.exec_pool import get_exec_pool
+from ajson.tools.output_capture import ChunkListener, run_streaming
+
+
+# Denylist (禁止コマンド・キーワード) and allowlist (許可コマンド) live in the
+# shared rule file (ajson/config/policy_rules.json, "tools" section);
+# DENYLIST / ALLOWLIST module attributes are kept as read-only views of it.
+def __getattr__(name: str):
+    if name == "DENYLIST":
+        return get_rules().tools["denylist"]
+    if name == "ALLOWLIST":
+        return get_rules().tools["allowlist"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # 作業ディレクトリ（環境変数から取得、デフォルトは./workspace）
 WORK_DIR = os.getenv("WORK_DIR", "./workspace")
 
+# Characters shlex splits into operator tokens (pipes, chains, subshells, redirects)
+SHELL_OPERATOR_CHARS = "();<>|&"
+
+_QUOTE_CHARS = re.compile(r"[\"'\\]")
+_PLAIN_TOKEN = re.compile(r"[();<>|&]+|[^\s();<>|&]+")
+
+# Distinct command lines whose tokenization / denylist verdict is memoized
+TOKENIZE_CACHE_SIZE = 1024
+DENY_CACHE_SIZE = 1024
+
+RUN_TOOL_TIMEOUT_SECONDS = 30
+
+# Commands made only of plain words need no shell: sh would just exec them.
+# Anything sh could expand or interpret (quotes, $, globs, ~, {}, operators,
+# assignments, builtins and keywords whose behavior differs from /bin
+# programs) still goes through sh.
+_PLAIN_COMMAND = re.compile(r"[A-Za-z0-9_./:,+@%-]+(?:[ \t]+[A-Za-z0-9_./:,+@%=-]+)*")
+_SHELL_ONLY_WORDS = frozenset({
+    ".", ":", "[", "alias", "bg", "break", "case", "cd", "command", "continue",
+    "do", "done", "echo", "elif", "else", "esac", "eval", "exec", "exit", "export",
+    "false", "fg", "fi", "for", "getopts", "hash", "if", "jobs", "kill", "printf",
+    "pwd", "read", "readonly", "return", "set", "shift", "source", "test", "then",
+    "times", "trap", "true", "type", "ulimit", "umask", "unalias", "unset", "until",
+    "wait", "while",
+})
+
+# Work directories already created by this process
+_ensured_work_dirs = set()
+
+
+@functools.lru_cache(maxsize=TOKENIZE_CACHE_SIZE)
+def tokenize_command(command: str) -> Tuple[Tuple[str, ...], ...]:
+    """
+    Split a shell command line into its simple commands
+
+    Quotes and escapes are resolved (r"m" -> rm) and pipelines, && / ||
+    chains, ; lists and ( ) subshells are split at their operators.
+    A line shlex cannot parse (e.g. unbalanced quotes) falls back to
+    whitespace splitting with quotes and backslashes dropped.
+
+    Returns:
+        One argv tuple per simple command, in order
+    """
+    if not _QUOTE_CHARS.search(command):
+        # Nothing to unquote: same tokens as shlex, without its per-char lexer
+        tokens = _PLAIN_TOKEN.findall(command)
+    else:
+        lexer = shlex.shlex(command, posix=True, punctuation_chars=SHELL_OPERATOR_CHARS)
+        lexer.whitespace_split = True
+        lexer.commenters = ""  # Scan everything: shlex would also cut mid-word "#"
+        try:
+            tokens = list(lexer)
+        except ValueError:
+            tokens = command.replace('"', " ").replace("'", " ").replace("\\", "").split()
+
+    commands = []
+    argv = []
+    for token in tokens:
+        if token and token.strip(SHELL_OPERATOR_CHARS) == "":
+            if argv:
+                commands.append(tuple(argv))
+            argv = []
+        else:
+            argv.append(token)
+    if argv:
+        commands.append(tuple(argv))
+    return tuple(commands)
+
+
+class _DenyMatcher:
+    """tools denylist matched against argv tokens (one per rule version, memoized per command)"""
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = keywords
+        # First word -> (rank, words) of each keyword starting with it
+        self._by_word: Dict[str, List[Tuple[int, Tuple[str, ...]]]] = {}
+        for rank, keyword in enumerate(keywords):
+            words = tuple(keyword.lower().split())
+            if words:
+                self._by_word.setdefault(words[0], []).append((rank, words))
+        self.first = functools.lru_cache(maxsize=DENY_CACHE_SIZE)(self._first)
+
+    def _first(self, command: str) -> Optional[str]:
+        """First listed keyword hit by the command, or None"""
+        best = None
+        for argv in tokenize_command(command):
+            words = [token.lower() for token in argv]
+            for i, word in enumerate(words):
+                for name in _token_names(word):
+                    for rank, keyword in self._by_word.get(name, ()):
+                        if (best is None or rank < best) and tuple(words[i + 1:i + len(keyword)]) == keyword[1:]:
+                            best = rank
+        return None if best is None else self.keywords[best]
+
+
+def _token_names(token: str) -> Set[str]:
+    """Names a token stands for: itself, a path's basename (/bin/rm), a bare option's name (-delete)"""
+    names = {token}
+    if "/" in token:
+        names.add(token.rsplit("/", 1)[1])
+    if token.startswith("-") and "=" not in token:
+        names.add(token.lstrip("-"))
+    return names
+
 
 def check_denylist(command: str) -> Tuple[bool, Optional[str]]:
     """
     Check if command contains denied keywords
     
+    Keywords match argv tokens of the tokenized command: a token equal to
+    the keyword, a path to it ("/bin/rm") or a bare option naming it
+    ("find -delete"); multi-word keywords match consecutive tokens of one
+    simple command. So "rm" blocks "rm -rf x" and "ls; rm x", but not
+    "--norm", "git log --grep=rm" or "cat rm.txt".
+    
     Returns:
         (is_denied, reason)
     """
-    command_lower = command.lower()
-    for denied in DENYLIST:
-        if denied in command_lower:
-            return True, f"Denied keyword detected: '{denied}'"
-    return False, None
+    # Report the first listed keyword, as the rule order defines
+    keyword = get_rules().derived("tools.deny", _build_deny_matcher).first(command)
+    if keyword is None:
+        return False, None
+    return True, f"Denied keyword detected: '{keyword}'"
+
+
+def _build_deny_matcher(rules) -> _DenyMatcher:
+    return _DenyMatcher(rules.tools["denylist"])
 
 
 def check_allowlist(command: str) -> bool:
@@ -56,11 +164,17 @@ def check_allowlist(command: str) -> bool:
     Returns:
         True if allowed, False otherwise
     """
-    command_lower = command.lower().strip()
-    for allowed in ALLOWLIST:
-        if command_lower.startswith(allowed):
-            return True
-    return False
+    return get_rules().tools_allow.match(command.lower().strip()) is not None
+
+
+class ToolRunResult(NamedTuple):
+    """Outcome of run_tool_captured"""
+    success: bool
+    result: str  # Output (stdout/stderr capped to head + tail) or error message
+    error: Optional[str]
+    output_bytes: int = 0  # Full output size, before capping
+    stdout_path: Optional[str] = None  # Spill file with the full stream, if capped
+    stderr_path: Optional[str] = None
 
 
 def run_tool(command: str, work_dir: Optional[str] = None) -> Tuple[bool, str, Optional[str]]:
@@ -77,47 +191,108 @@ def run_tool(command: str, work_dir: Optional[str] = None) -> Tuple[bool, str, O
         - result: Command output or error message
         - error_reason: Reason for blocking (if blocked)
     """
+    return run_tool_captured(command, work_dir)[:3]
+
+
+def run_tool_captured(command: str, work_dir: Optional[str] = None,
+                      on_output: Optional[ChunkListener] = None) -> ToolRunResult:
+    """
+    run_tool with streaming output capture
+    
+    Output is read while the command runs: each stream keeps a bounded head
+    and tail (ajson/tools/output_capture.py), the full stream is spilled to
+    a file when that budget is exceeded, and live chunks go to on_output.
+    
+    Args:
+        command: Command to execute
+        work_dir: Working directory (defaults to WORK_DIR)
+        on_output: Called with (stream, text) while the command runs
+    """
     # Denylist check (最優先)
     is_denied, deny_reason = check_denylist(command)
     if is_denied:
-        return False, f"BLOCKED: {deny_reason}", deny_reason
+        return ToolRunResult(False, f"BLOCKED: {deny_reason}", deny_reason)
     
     # Allowlist check
     if not check_allowlist(command):
         reason = "Command not in allowlist"
-        return False, f"BLOCKED: {reason}", reason
+        return ToolRunResult(False, f"BLOCKED: {reason}", reason)
     
     # 作業ディレクトリの確保
     if work_dir is None:
         work_dir = WORK_DIR
     
-    # 作業ディレクトリが存在しない場合は作成
-    os.makedirs(work_dir, exist_ok=True)
-    
     # コマンド実行
     try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            cwd=work_dir,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        result = _run_command(command, work_dir, on_output)
         
         output = result.stdout
         if result.stderr:
             output += f"\nSTDERR: {result.stderr}"
         
+        error = None
         if result.returncode != 0:
-            return False, output, f"Command failed with exit code {result.returncode}"
+            error = f"Command failed with exit code {result.returncode}"
         
-        return True, output, None
+        return ToolRunResult(
+            error is None, output, error,
+            result.output_bytes, result.stdout_path, result.stderr_path
+        )
         
     except subprocess.TimeoutExpired:
-        return False, "Command timed out (30s limit)", "Timeout"
+        return ToolRunResult(False, "Command timed out (30s limit)", "Timeout")
     except Exception as e:
-        return False, f"Execution error: {str(e)}", str(e)
+        return ToolRunResult(False, f"Execution error: {str(e)}", str(e))
+
+
+def _plain_argv(command: str) -> Optional[list]:
+    """argv of a command sh would exec unchanged, else None"""
+    command = command.strip()
+    if not _PLAIN_COMMAND.fullmatch(command):
+        return None
+    argv = command.split()
+    if argv[0] in _SHELL_ONLY_WORDS:
+        return None
+    return argv
+
+
+def _run_command(command: str, work_dir: str,
+                 on_output: Optional[ChunkListener] = None) -> subprocess.CompletedProcess:
+    """
+    Run a shell command line in work_dir (warm executor pool if enabled)
+    
+    Plain commands skip the intermediate sh; an unknown program still goes
+    through sh so its "not found" result is unchanged. The work directory
+    is created once per process (and again if it disappears).
+    """
+    pool = get_exec_pool()
+    
+    def spawn(args, shell: bool):
+        if pool is not None:
+            return pool.run(args, cwd=work_dir, timeout=RUN_TOOL_TIMEOUT_SECONDS, shell=shell, on_chunk=on_output)
+        return run_streaming(args, shell=shell, cwd=work_dir, timeout=RUN_TOOL_TIMEOUT_SECONDS, on_chunk=on_output)
+    
+    argv = _plain_argv(command)
+    for attempt in (1, 2):
+        if work_dir not in _ensured_work_dirs:
+            # 作業ディレクトリが存在しない場合は作成
+            os.makedirs(work_dir, exist_ok=True)
+            _ensured_work_dirs.add(work_dir)
+        try:
+            if argv is not None:
+                try:
+                    result = spawn(argv, shell=False)
+                    if result.returncode < 0:
+                        result.returncode = 128 - result.returncode  # As sh reports a signal
+                    return result
+                except FileNotFoundError as e:
+                    if e.filename != argv[0]:
+                        raise
+            return spawn(command, shell=True)
+        except FileNotFoundError as e:
+            if attempt == 2 or e.filename != work_dir:
+                raise
+            _ensured_work_dirs.discard(work_dir)
 
 
 def detect_approval_gates(text: str) -> list:
@@ -127,22 +302,9 @@ def detect_approval_gates(text: str) -> list:
     Returns:
         List of detected gate types
     """
-    gates = []
-    text_lower = text.lower()
-    
-    gate_keywords = {
-        "deploy": ["deploy", "deployment", "publish", "release"],
-        "delete": ["delete", "remove", "drop table", "truncate"],
-        "database": ["create table", "alter table", "database", "db migration"],
-        "permission": ["grant", "revoke", "permission", "access control"],
-        "billing": ["charge", "payment", "billing", "invoice"],
-        "external": ["public", "external", "expose", "外部公開"],
-    }
-    
-    for gate_type, keywords in gate_keywords.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                gates.append(gate_type)
-                break
-    
-    return gates
+    # Gate keywords: shared rule file, "keywords.approval_gates" (in gate order)
+    hit = set(get_keyword_scanner().categories(text))
+    return [
+        gate_type for gate_type in get_rules().keywords["approval_gates"]
+        if GATE_CATEGORY_PREFIX + gate_type in hit
+    ]
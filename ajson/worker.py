@@ -0,0 +1,128 @@
+"""
+Standalone mission worker for AJSON MVP
+
+Runs the mission state machine outside the API process, so role calls,
+audits and report generation don't compete with request handling for the
+GIL. Workers coordinate purely through the SQLite SSOT: they claim jobs from
+the mission_jobs queue (one claim per mission), heartbeat them, and record
+their events in the mission_events outbox for the API's SSE streams.
+
+Usage:
+    ENGINE_MODE=worker uvicorn ajson.app:app      # API only enqueues
+    python -m ajson.worker --processes 4 --concurrency 2
+
+Any number of worker processes (on the same machine, sharing DB_PATH) can run
+side by side; a worker that dies has its missions re-queued by the others
+once its heartbeat goes stale.
+"""
+import argparse
+import logging
+import multiprocessing
+import signal
+import threading
+from typing import Iterable, List, Optional
+
+from ajson import db
+from ajson.engine import ENGINE_WORKERS, MissionEngine
+from ajson.tools.exec_pool import shutdown_exec_pool
+
+
+SHUTDOWN_TIMEOUT_SECONDS = 30.0
+
+logger = logging.getLogger("ajson.worker")
+
+
+def run_worker(concurrency: int = ENGINE_WORKERS, stop: Optional[threading.Event] = None,
+               shutdown_timeout: float = SHUTDOWN_TIMEOUT_SECONDS) -> bool:
+    """
+    Run one worker process until `stop` is set (or SIGINT/SIGTERM)
+
+    Args:
+        concurrency: Missions advanced concurrently by this process
+        stop: Event ending the worker (default: installed signal handlers)
+        shutdown_timeout: Seconds to drain in-flight missions on stop
+
+    Returns:
+        True if in-flight missions drained within the timeout
+    """
+    if stop is None:
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+
+    db.EVENT_OUTBOX = True
+    db.migrate()
+    engine = MissionEngine(max_workers=concurrency)
+    counts = engine.start()
+    logger.info("Worker %s started (concurrency=%d, recovered=%s)", engine.worker_id, concurrency, counts)
+
+    stop.wait()
+
+    logger.info("Worker %s stopping", engine.worker_id)
+    drained = engine.shutdown(timeout=shutdown_timeout)
+    shutdown_exec_pool()
+    db.close_connections()
+    return drained
+
+
+def _process_main(concurrency: int):
+    """Entry point of a child worker process"""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    run_worker(concurrency)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run AJSON missions from the SSOT job queue")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=ENGINE_WORKERS,
+        help=f"Missions advanced concurrently per process (default: {ENGINE_WORKERS})"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Worker processes to start (default: 1)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.processes <= 1:
+        _process_main(args.concurrency)
+        return 0
+
+    # Migrate once up front rather than racing N children to it
+    db.migrate()
+    db.close_connections()
+
+    ctx = multiprocessing.get_context("spawn")
+    children = [
+        ctx.Process(target=_process_main, args=(args.concurrency,), name=f"ajson-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for child in children:
+        child.start()
+
+    def forward(signum, _frame):
+        for child in children:
+            if child.is_alive():
+                child.terminate()  # SIGTERM: children drain, then exit
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C reaches the children directly
+
+    for child in children:
+        child.join()
+    return _exit_status(child.exitcode for child in children)
+
+
+def _exit_status(exitcodes: Iterable[Optional[int]]) -> int:
+    """Supervisor exit status: first nonzero child code (128+N for a child killed by signal N)"""
+    for code in exitcodes:
+        if code:
+            return 128 - code if code < 0 else code
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
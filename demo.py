@@ -2,10 +2,55 @@
 Demo script to execute sample missions via API
 """
 import httpx
+import json
 import time
 
 
 API_BASE_URL = "http://localhost:8000"
+STOP_STATUSES = ["DONE", "PENDING_APPROVAL", "ERROR"]
+
+
+def wait_for_stop(mission_id: int) -> dict:
+    """
+    Follow mission status until it stops (DONE / PENDING_APPROVAL / ERROR)
+    
+    Uses the SSE stream (GET /missions/{id}/events); falls back to polling
+    GET /missions/{id} once a second if the stream is unavailable.
+    
+    Returns:
+        Final lightweight mission snapshot
+    """
+    url = f"{API_BASE_URL}/missions/{mission_id}"
+    
+    try:
+        with httpx.stream("GET", f"{url}/events", timeout=None) as response:
+            if response.status_code == 200:
+                event_type = None
+                for line in response.iter_lines():
+                    if line.startswith("event: "):
+                        event_type = line[len("event: "):]
+                    elif line.startswith("data: "):
+                        data = json.loads(line[len("data: "):])
+                        if event_type == "snapshot":
+                            status = data["mission"]["status"]
+                        elif event_type == "mission_status":
+                            status = data["status"]
+                        else:
+                            continue
+                        print(f"  Current status: {status}")
+                        if status in STOP_STATUSES:
+                            return httpx.get(url, params={"include_content": "false"}).json()
+    except httpx.HTTPError:
+        pass
+    
+    # Fallback: poll
+    while True:
+        data = httpx.get(url, params={"include_content": "false"}).json()
+        status = data["mission"]["status"]
+        print(f"  Current status: {status}")
+        if status in STOP_STATUSES:
+            return data
+        time.sleep(1)
 
 
 def demo_normal_mission():
@@ -29,19 +74,10 @@ def demo_normal_mission():
     mission_id = response.json()["mission_id"]
     print(f"✓ Created mission {mission_id}")
     
-    # Poll until terminal state
-    print("\n➤ Polling mission status...")
-    while True:
-        response = httpx.get(f"{API_BASE_URL}/missions/{mission_id}")
-        data = response.json()
-        status = data["mission"]["status"]
-        
-        print(f"  Current status: {status}")
-        
-        if status in ["DONE", "PENDING_APPROVAL", "ERROR"]:
-            break
-        
-        time.sleep(1)
+    # Follow until terminal state
+    print("\n➤ Following mission status...")
+    data = wait_for_stop(mission_id)
+    status = data["mission"]["status"]
     
     # Show final state
     print(f"\n✓ Final status: {status}")
@@ -76,19 +112,10 @@ def demo_approval_mission():
     mission_id = response.json()["mission_id"]
     print(f"✓ Created mission {mission_id}")
     
-    # Poll until it stops at PENDING_APPROVAL
-    print("\n➤ Polling mission status...")
-    while True:
-        response = httpx.get(f"{API_BASE_URL}/missions/{mission_id}")
-        data = response.json()
-        status = data["mission"]["status"]
-        
-        print(f"  Current status: {status}")
-        
-        if status in ["DONE", "PENDING_APPROVAL", "ERROR"]:
-            break
-        
-        time.sleep(1)
+    # Follow until it stops at PENDING_APPROVAL
+    print("\n➤ Following mission status...")
+    data = wait_for_stop(mission_id)
+    status = data["mission"]["status"]
     
     # Show approval requests
     print(f"\n✓ Final status: {status}")
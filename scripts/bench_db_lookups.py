@@ -0,0 +1,140 @@
+"""
+SSOT lookup benchmark (per-mission reads vs. table size)
+
+Purpose:
+- Populate a throwaway SQLite SSOT with N missions (steps, tool runs,
+  approvals, artifacts, memories, messages per mission)
+- Time the per-mission lookups used by the orchestrator and console
+- Show lookup latency staying flat as row counts grow (indexed), and
+  growing linearly when the indexes are dropped (--no-indexes)
+
+Usage:
+    python scripts/bench_db_lookups.py
+    python scripts/bench_db_lookups.py --sizes 1000 10000 50000 --no-indexes
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ajson import db
+
+
+LOOKUPS = {
+    "steps": lambda mid, sid: db.get_steps_by_mission(mid),
+    "artifacts": lambda mid, sid: db.get_artifacts_by_mission(mid),
+    "memories": lambda mid, sid: db.get_memories_by_mission(mid),
+    "messages": lambda mid, sid: db.get_messages(mid),
+    "approvals": lambda mid, sid: db.get_pending_approvals(mid),
+    "tool_runs/step": lambda mid, sid: db.get_tool_runs_by_step(sid),
+    "tool_runs/mission": lambda mid, sid: db.get_tool_runs_by_mission(mid),
+}
+
+
+def populate(target: int, current: int):
+    """Grow the SSOT from `current` to `target` missions in bulk"""
+    conn = db.get_connection()
+    with db.transaction():
+        for i in range(current, target):
+            cur = conn.execute(
+                "INSERT INTO missions (title, description, status) VALUES (?, ?, ?)",
+                (f"bench {i}", "benchmark mission", "DONE")
+            )
+            mission_id = cur.lastrowid
+            for role in ("jarvis", "cody_pre_audit", "ants_worker", "cody_post_audit", "jarvis_finalize"):
+                step = conn.execute(
+                    "INSERT INTO steps (mission_id, role, input_data, output_data, status) VALUES (?, ?, ?, ?, ?)",
+                    (mission_id, role, "in", "out", "COMPLETED")
+                )
+                if role == "ants_worker":
+                    conn.execute(
+                        "INSERT INTO tool_runs (step_id, command, result) VALUES (?, ?, ?)",
+                        (step.lastrowid, "echo ok", "ok")
+                    )
+            conn.execute(
+                "INSERT INTO approvals (mission_id, gate_type, reason, status) VALUES (?, ?, ?, ?)",
+                (mission_id, "security", "bench", "APPROVED")
+            )
+            for artifact_type in ("plan", "final_report"):
+                conn.execute(
+                    "INSERT INTO artifacts (mission_id, artifact_type, path, content) VALUES (?, ?, ?, ?)",
+                    (mission_id, artifact_type, f"mission_{mission_id}.md", "content")
+                )
+            conn.execute(
+                "INSERT INTO memories (mission_id, key, value) VALUES (?, ?, ?)",
+                (mission_id, "k", "v")
+            )
+            conn.execute(
+                "INSERT INTO messages (mission_id, role, content) VALUES (?, ?, ?)",
+                (mission_id, "user", "hello")
+            )
+
+
+def drop_indexes():
+    """Drop the managed indexes (baseline comparison)"""
+    conn = db.get_connection()
+    rows = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+    ).fetchall()
+    for row in rows:
+        conn.execute(f"DROP INDEX {row[0]}")
+    conn.commit()
+
+
+def time_lookups(missions: int, samples: int) -> dict:
+    """Average microseconds per lookup over random missions"""
+    conn = db.get_connection()
+    ids = random.sample(range(1, missions + 1), min(samples, missions))
+    step_ids = {
+        mid: conn.execute(
+            "SELECT id FROM steps WHERE mission_id = ? AND role = 'ants_worker'", (mid,)
+        ).fetchone()[0]
+        for mid in ids
+    }
+
+    results = {}
+    for name, lookup in LOOKUPS.items():
+        start = time.perf_counter()
+        for mid in ids:
+            lookup(mid, step_ids[mid])
+        elapsed = time.perf_counter() - start
+        results[name] = elapsed / len(ids) * 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SSOT per-mission lookups')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 30000],
+                        help='Mission counts to measure at (ascending)')
+    parser.add_argument('--samples', type=int, default=200,
+                        help='Random missions looked up per size')
+    parser.add_argument('--no-indexes', action='store_true',
+                        help='Drop managed indexes to show the full-scan baseline')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db.DB_PATH = os.path.join(tmpdir, "bench.db")
+        db.migrate()
+        if args.no_indexes:
+            drop_indexes()
+
+        mode = "no indexes" if args.no_indexes else f"schema v{db.get_schema_version()}"
+        print(f"=== SSOT lookup benchmark ({mode}) — avg µs per lookup ===")
+        print(f"{'missions':>10} " + " ".join(f"{name:>18}" for name in LOOKUPS))
+
+        current = 0
+        for size in sorted(args.sizes):
+            populate(size, current)
+            current = size
+            timings = time_lookups(size, args.samples)
+            print(f"{size:>10} " + " ".join(f"{timings[name]:>18.1f}" for name in LOOKUPS))
+
+        db.close_connections()
+
+
+if __name__ == "__main__":
+    main()
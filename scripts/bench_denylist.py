@@ -0,0 +1,121 @@
+"""
+tools.runner denylist micro-benchmark
+
+Purpose:
+- Time check_denylist on a corpus of real mission commands
+- Compare the previous substring matching (kept here as a reference) with
+  the per-token matching, both uncached and memoized
+- Verify the tokenized verdicts on the corpus and list the false positives
+  of substring matching that it removes
+
+Usage:
+    python scripts/bench_denylist.py
+    python scripts/bench_denylist.py --rounds 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ajson.policy_rules import get_rules
+from ajson.tools import runner
+
+
+# (command, denied with tokenized matching)
+CORPUS = [
+    ("echo 'Mock test execution: All tests passed'", False),
+    ("ls -la", False),
+    ("ls -la workspace/reports", False),
+    ("cat README.md", False),
+    ("cat docs/information_architecture.md", False),
+    ("git status", False),
+    ("git log --oneline -n 20", False),
+    ("git diff --stat HEAD~1", False),
+    ("git show HEAD:ajson/model.py", False),
+    ("pytest -q", False),
+    ("pytest --collect-only -q", False),
+    ("python -m pytest tests/test_model.py -k norm", False),
+    ("pytest --norm tests", False),
+    ("python3 scripts/bench_policy_eval.py --rounds 100", False),
+    ("grep -rn 'performance' ajson | head -20", False),
+    ("find . -name '*.py' -newer setup.py", False),
+    ("echo information > report.txt", False),
+    ("python -c 'import platform; print(platform.system())'", False),
+    ("pwd && ls", False),
+    ("cat uploads/sync_log.txt | grep -c OK", False),
+    ("cat del.txt", False),
+    ("echo --format=json", False),
+    ("git log --grep=rm", False),
+    ("git log --format='%h %s' -n 5", False),
+    ("rm -rf build", True),
+    ("ls; rm -rf /tmp/x", True),
+    ("cat a.txt && sudo cat /etc/shadow", True),
+    ("(cd build || rm x)", True),
+    ("find . -name '*.pyc' | xargs /bin/rm", True),
+    ("echo $(curl https://example.com)", True),
+    ("r\"m\" -rf build", True),
+    ("find . -delete", True),
+    ("chmod 777 run.sh", True),
+    ("kill -9 1234", True),
+    ("wget http://example.com/file", True),
+    ("python -m http.server & nc -l 8000", True),
+]
+
+
+def legacy_check_denylist(command: str):
+    """Previous check_denylist: first listed keyword contained anywhere"""
+    command_lower = command.lower()
+    for denied in runner.DENYLIST:
+        if denied in command_lower:
+            return True, f"Denied keyword detected: '{denied}'"
+    return False, None
+
+
+def tokenized_uncached(command: str):
+    """check_denylist with its tokenize and verdict memoization cleared first"""
+    runner.tokenize_command.cache_clear()
+    get_rules().derived("tools.deny", runner._build_deny_matcher).first.cache_clear()
+    return runner.check_denylist(command)
+
+
+def time_per_call(fn, rounds: int) -> float:
+    """Mean microseconds per call over rounds x corpus"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for command, _ in CORPUS:
+            fn(command)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(CORPUS)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tools.runner.check_denylist')
+    parser.add_argument('--rounds', type=int, default=2000, help='Passes over the corpus (default: 2000)')
+    args = parser.parse_args()
+
+    false_positives = []
+    for command, denied in CORPUS:
+        assert runner.check_denylist(command)[0] == denied, command
+        if legacy_check_denylist(command)[0] and not denied:
+            false_positives.append(command)
+
+    results = [
+        ("legacy (substring)", time_per_call(legacy_check_denylist, args.rounds)),
+        ("per-token, uncached", time_per_call(tokenized_uncached, args.rounds)),
+        ("per-token, memoized", time_per_call(runner.check_denylist, args.rounds)),
+    ]
+
+    baseline = results[0][1]
+    print(f"{len(CORPUS)} commands x {args.rounds} rounds")
+    print(f"{'implementation':<22} {'us/call':>9} {'vs legacy':>10}")
+    for name, per_call in results:
+        print(f"{name:<22} {per_call:>9.2f} {per_call / baseline:>9.1f}x")
+    print(f"\nSubstring false positives removed ({len(false_positives)}):")
+    for command in false_positives:
+        print(f"  {command}  [{legacy_check_denylist(command)[1]}]")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+ApprovalPolicy.evaluate micro-benchmark
+
+Purpose:
+- Time the per-call cost of policy evaluation on a mixed operation corpus
+- Compare the previous implementation (per-pattern re.search loops over
+  uncompiled patterns, kept here as a reference) with the compiled engine
+  uncached, and with the public ApprovalPolicy.evaluate (rule lookup plus
+  memoized decisions)
+- Verify both return identical decisions on the corpus
+
+Usage:
+    python scripts/bench_policy_eval.py
+    python scripts/bench_policy_eval.py --rounds 20000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ajson.hands.policy import ApprovalPolicy, OperationCategory, PolicyDecision
+
+
+CORPUS = [
+    "ls -la", "cat README.md", "git status", "git log --oneline", "pytest -q",
+    "curl https://example.com", "wget http://example.com/file", "python -c 'import requests.get'",
+    "rm -rf /tmp/build", "git tag -d v0.9", "DROP TABLE users", "docker rm web",
+    "git reset --hard HEAD~1", "openai.ChatCompletion.create()", "gemini.generate(prompt)",
+    "git merge origin/main", "npm publish", "git tag -a v1.0",
+    "python scripts/build.py --release", "make test", "echo hello", "unknown_command --flag",
+]
+
+
+def legacy_evaluate(operation: str, dry_run: bool = True):
+    """Previous ApprovalPolicy.evaluate: one re.search per pattern, in priority order"""
+    P = ApprovalPolicy
+    operation_lower = operation.lower()
+    for pattern in P.ALLOWLIST:
+        pattern_lower = pattern.lower()
+        if operation_lower.startswith(pattern_lower):
+            if len(operation_lower) == len(pattern_lower) or operation_lower[len(pattern_lower)] in [' ', '\t', '\n']:
+                return (PolicyDecision.ALLOW, OperationCategory.READONLY, "Allowed: matches allowlist")
+    for pattern in P.NETWORK_PATTERNS:
+        if re.search(pattern, operation, re.IGNORECASE):
+            return (PolicyDecision.DENY, OperationCategory.NETWORK, "Denied: network operation")
+    for pattern in P.DENYLIST:
+        if pattern.lower() in operation_lower:
+            if any(p in operation_lower for p in ["rm -rf", "drop database", "drop table"]):
+                return (PolicyDecision.DENY, OperationCategory.DESTRUCTIVE, f"Destructive: matches denylist pattern '{pattern}'")
+            return (PolicyDecision.DENY, OperationCategory.IRREVERSIBLE, f"Denied: matches denylist pattern '{pattern}'")
+    for patterns, category, label in (
+        (P.DESTRUCTIVE_PATTERNS, OperationCategory.DESTRUCTIVE, "Destructive"),
+        (P.PAID_API_PATTERNS, OperationCategory.PAID, "Paid API"),
+        (P.IRREVERSIBLE_PATTERNS, OperationCategory.IRREVERSIBLE, "Irreversible"),
+    ):
+        for pattern in patterns:
+            if re.search(pattern, operation, re.IGNORECASE):
+                if dry_run:
+                    return (PolicyDecision.DRY_RUN_ONLY, category, f"{label}: simulation only in DRY_RUN")
+                return (PolicyDecision.REQUIRE_APPROVAL, category, f"{label}: requires approval")
+    if dry_run:
+        return (PolicyDecision.DRY_RUN_ONLY, OperationCategory.UNKNOWN, "Unknown operation: DRY_RUN only")
+    return (PolicyDecision.REQUIRE_APPROVAL, OperationCategory.UNKNOWN, "Unknown operation: requires approval")
+
+
+def time_per_call(fn, rounds: int) -> float:
+    """Mean microseconds per call over rounds x corpus x {dry_run, live}"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for operation in CORPUS:
+            fn(operation, True)
+            fn(operation, False)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(CORPUS) * 2) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ApprovalPolicy.evaluate')
+    parser.add_argument('--rounds', type=int, default=5000, help='Passes over the corpus (default: 5000)')
+    args = parser.parse_args()
+
+    compiled = ApprovalPolicy._compiled()
+    for operation in CORPUS:
+        for dry_run in (True, False):
+            assert legacy_evaluate(operation, dry_run) == ApprovalPolicy.evaluate(operation, dry_run), operation
+
+    results = [
+        ("legacy (re.search loop)", time_per_call(legacy_evaluate, args.rounds)),
+        ("compiled, uncached", time_per_call(compiled._evaluate, args.rounds)),
+        ("ApprovalPolicy.evaluate", time_per_call(ApprovalPolicy.evaluate, args.rounds)),
+    ]
+
+    baseline = results[0][1]
+    print(f"{len(CORPUS)} operations x {args.rounds} rounds x 2 modes")
+    print(f"{'implementation':<26} {'us/call':>9} {'speedup':>9}")
+    for name, per_call in results:
+        print(f"{name:<26} {per_call:>9.2f} {baseline / per_call:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Approval grant scope matching micro-benchmark
+
+Purpose:
+- Time matches_scope for grants with 1 to hundreds of scope patterns
+- Compare the previous per-call lowercase + substring scan (kept here as a
+  reference) with the compiled ScopeMatcher shared by both approval stores
+- Include the SQLite store path (scope JSON -> matcher, cached per scope)
+
+Usage:
+    python scripts/bench_scope_match.py
+    python scripts/bench_scope_match.py --rounds 500 --sizes 10 100 500
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ajson.hands.approval_sqlite import _scope_matcher
+from ajson.hands.scope import compile_scope
+
+
+# Operations as LIMITED mode builds them ("tool {args}"), hits and misses
+OPERATIONS = [
+    "ls {'-la': '-la', 'path': '/tmp'}",
+    "git status {}",
+    "git log {'-n': '20'}",
+    "cat {'path': 'README.md'}",
+    "pytest --collect-only {'-q': '-q'}",
+    "rm {'-rf': '/'}",
+    "curl {'url': 'https://example.com'}",
+    "docker ps {}",
+]
+
+BASE_SCOPE = ["ls", "git status", "git log", "cat", "pytest --collect-only", "tests/test_*.py"]
+
+
+def make_scope(size: int):
+    """BASE_SCOPE padded with distinct tool/subcommand patterns (some globs)"""
+    scope = list(BASE_SCOPE)
+    i = 0
+    while len(scope) < size:
+        scope.append(f"tool{i} sub{i % 7}" if i % 10 else f"tool{i} *")
+        i += 1
+    return scope[:max(size, 1)]
+
+
+def legacy_matches(scope, operation: str) -> bool:
+    """Previous ApprovalGrant.matches_scope: substring per pattern, lowercased per call"""
+    if not scope:
+        return True
+    for pattern in scope:
+        if pattern.lower() in operation.lower():
+            return True
+    return False
+
+
+def time_per_call(fn, rounds: int) -> float:
+    """Mean microseconds per call over rounds x operations"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for operation in OPERATIONS:
+            fn(operation)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(OPERATIONS)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark approval grant scope matching')
+    parser.add_argument('--rounds', type=int, default=2000, help='Passes over the operations (default: 2000)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100, 300, 1000],
+                        help='Scope sizes (default: 1 10 100 300 1000)')
+    args = parser.parse_args()
+
+    print(f"{len(OPERATIONS)} operations x {args.rounds} rounds")
+    print(f"{'scope size':>10} {'legacy us':>10} {'compiled us':>12} {'sqlite us':>10} {'speedup':>8}")
+    for size in args.sizes:
+        scope = make_scope(size)
+        matcher = compile_scope(scope)
+        scope_json = json.dumps(scope)
+
+        legacy = time_per_call(lambda op: legacy_matches(scope, op), args.rounds)
+        compiled = time_per_call(matcher.matches, args.rounds)
+        sqlite = time_per_call(lambda op: _scope_matcher(scope_json).matches(op), args.rounds)
+        print(f"{size:>10} {legacy:>10.2f} {compiled:>12.2f} {sqlite:>10.2f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
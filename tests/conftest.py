@@ -1,11 +1,11 @@
 import pytest
-import logging
 from ajson.hands.approval import ApprovalStore
 import ajson.hands.approval
 from ajson.hands.audit_logger import AuditLogger
 import ajson.hands.audit_logger
 from ajson.hands.screenshot_evidence import ScreenshotEvidence
 import ajson.hands.screenshot_evidence
+import ajson.engine
 
 @pytest.fixture(autouse=True)
 def reset_global_state():
@@ -15,17 +15,17 @@ def reset_global_state():
     original_store = ajson.hands.approval._global_store
     ajson.hands.approval._global_store = ApprovalStore()
     
-    # 2. Reset AuditLogger (clear handlers and global instance)
-    logger = logging.getLogger("ajson.audit")
-    for h in logger.handlers[:]:
-        logger.removeHandler(h)
-        h.close()
-    ajson.hands.audit_logger._audit_logger = None
+    # 2. Reset AuditLogger (stop the global writer)
+    ajson.hands.audit_logger.close_audit_logger()
     
     # 3. Reset ScreenshotEvidence
     ajson.hands.screenshot_evidence._screenshot_evidence = None
     
     yield
     
+    # 4. Drain and discard the mission engine so no dispatcher outlives the test
+    # (uses the module imported here: some tests re-import the ajson package)
+    ajson.engine.shutdown_engine(timeout=30)
+    
     # Restore original store (optional, mainly for safety)
     ajson.hands.approval._global_store = original_store
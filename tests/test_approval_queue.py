@@ -153,3 +153,50 @@ def test_global_store_singleton():
     store1 = get_approval_store()
     store2 = get_approval_store()
     assert store1 is store2
+
+
+def test_grant_expiry_is_epoch_float():
+    """Grants parse their expiry once; is_expired compares epoch seconds"""
+    store = ApprovalStore()
+    request = store.create_request("exp_test", "paid", "test")
+    grant = store.approve_request(
+        request.request_id,
+        ApprovalDecision(request_id=request.request_id, decision="approve", reason="Test", ttl_seconds=60)
+    )
+    
+    assert grant.expires_ts == datetime.fromisoformat(grant.expires_at).timestamp()
+    assert grant.is_expired(grant.expires_ts) is False
+    assert grant.is_expired(grant.expires_ts + 0.001) is True
+    assert "expires_ts" not in grant.to_dict()
+
+
+def test_expired_grants_and_old_decisions_are_evicted(monkeypatch):
+    """Expired grants and decided requests past retention leave the store"""
+    import ajson.hands.approval as approval
+    
+    now = [1_000_000.0]
+    monkeypatch.setattr(approval.time, "time", lambda: now[0])
+    store = ApprovalStore(decided_retention_seconds=100)
+    
+    approved = store.create_request("op1", "paid", "test")
+    denied = store.create_request("op2", "paid", "test")
+    pending = store.create_request("op3", "paid", "test")
+    grant = store.approve_request(
+        approved.request_id,
+        ApprovalDecision(request_id=approved.request_id, decision="approve", reason="ok", ttl_seconds=30)
+    )
+    store.deny_request(denied.request_id, ApprovalDecision(request_id=denied.request_id, decision="deny", reason="no"))
+    
+    assert store.list_pending_requests() == [pending]
+    assert store.list_active_grants() == [grant]
+    
+    now[0] += 31
+    assert store.get_grant(grant.grant_id) is None
+    assert store.list_active_grants() == [] and store.grants == {}
+    assert store.get_request(approved.request_id).status == ApprovalStatus.APPROVED.value
+    
+    now[0] += 100
+    assert store.get_request(approved.request_id) is None
+    assert store.get_request(denied.request_id) is None
+    assert set(store.requests) == {pending.request_id}
+    assert store.list_pending_requests() == [pending]
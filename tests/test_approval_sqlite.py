@@ -4,7 +4,9 @@ Tests for SQLite-backed approval store
 import pytest
 import tempfile
 import os
-from ajson.hands.approval_sqlite import SQLiteApprovalStore
+import threading
+import time
+from ajson.hands.approval_sqlite import SQLiteApprovalStore, _DELETE_EXPIRED_GRANTS, _SELECT_GRANT_SCOPE
 from ajson.hands.approval import ApprovalDecision
 
 
@@ -98,6 +100,10 @@ def test_verify_grant_scope():
         
         # Out of scope
         assert not store.verify_grant(grant.grant_id, "rm -rf /")
+        
+        # Batch: one lookup, one answer per operation
+        assert store.verify_grant_batch(grant.grant_id, ["ls -la", "rm -rf /", "git log"]) == [True, False, True]
+        assert store.verify_grant_batch("missing", ["ls"]) == [False]
 
 
 def test_persistence_across_instances():
@@ -127,16 +133,38 @@ def test_env_var_activation():
         os.environ['APPROVAL_STORE_DB'] = db_path
         
         try:
-            from ajson.hands.approval_sqlite import get_approval_store
+            from ajson.hands.approval_sqlite import get_approval_store, close_approval_store
             store = get_approval_store()
             
             # Check it's SQLite store by verifying db_path attribute exists
             assert hasattr(store, 'db_path')
             assert store.db_path == db_path
+            
+            # One process-wide instance per database
+            assert get_approval_store() is store
         finally:
             del os.environ['APPROVAL_STORE_DB']
+            close_approval_store()
 
 
+def test_path_change_keeps_old_store_open(monkeypatch):
+    """Switching APPROVAL_STORE_DB opens a second store; the first stays usable"""
+    from ajson.hands.approval_sqlite import get_approval_store, close_approval_store
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            monkeypatch.setenv('APPROVAL_STORE_DB', os.path.join(tmpdir, "a.db"))
+            first = get_approval_store()
+            monkeypatch.setenv('APPROVAL_STORE_DB', os.path.join(tmpdir, "b.db"))
+            second = get_approval_store()
+
+            assert second is not first
+            first.create_request("ls", "readonly", "test")
+            assert len(first.get_pending()) == 1
+            monkeypatch.setenv('APPROVAL_STORE_DB', os.path.join(tmpdir, "a.db"))
+            assert get_approval_store() is first
+        finally:
+            close_approval_store()
+
 
 def test_fallback_to_in_memory():
     """get_approval_store falls back to in-memory store"""
@@ -149,3 +177,89 @@ def test_fallback_to_in_memory():
     store = get_approval_store()
     
     assert isinstance(store, ApprovalStore)
+    assert get_approval_store() is store
+
+
+def _expire(store, grant_id):
+    """Move a grant's expiry into the past"""
+    with store._lock, store._conn as conn:
+        conn.execute("UPDATE grants SET expires_at = '2000-01-01T00:00:00' WHERE grant_id = ?", (grant_id,))
+
+
+def _approved_grant(store, scope):
+    request = store.create_request("ls -la", "readonly", "test")
+    decision = ApprovalDecision(request_id=request.request_id, decision="approve", reason="Test", scope=scope)
+    return store.approve_request(request.request_id, decision)
+
+
+def test_verify_grant_is_indexed_point_read():
+    """verify_grant reads by primary key; sweeps use the expires_at index"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = SQLiteApprovalStore(db_path=os.path.join(tmpdir, "test.db"))
+        try:
+            def plan(sql, params):
+                return " ".join(row["detail"] for row in store._conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+            
+            assert "USING INDEX sqlite_autoindex_grants_1 (grant_id=?)" in plan(_SELECT_GRANT_SCOPE, ("g", "now"))
+            assert "idx_grants_expires_at" in plan(_DELETE_EXPIRED_GRANTS, ("now",))
+            assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            store.close()
+
+
+def test_sweep_removes_expired_grants():
+    """Expired grants fail verification and are deleted by sweeps"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = SQLiteApprovalStore(db_path=os.path.join(tmpdir, "test.db"))
+        try:
+            live = _approved_grant(store, ["ls"])
+            expired = _approved_grant(store, ["ls"])
+            _expire(store, expired.grant_id)
+            
+            assert store.verify_grant(live.grant_id, "ls -la")
+            assert not store.verify_grant(expired.grant_id, "ls -la")
+            assert store.sweep_expired() == 1
+            assert [g.grant_id for g in store.get_active_grants()] == [live.grant_id]
+            
+            # Expiry as epoch seconds; revocation deletes the grant
+            assert store.verify_grant_until(live.grant_id, "ls -la") > time.time() + 3500
+            assert store.verify_grant_until(live.grant_id, "rm -rf /") is None
+            assert store.revoke_grant(live.grant_id) is True
+            assert store.revoke_grant(live.grant_id) is False
+            assert not store.verify_grant(live.grant_id, "ls -la")
+        finally:
+            store.close()
+
+
+def test_background_sweeper_and_shared_connection():
+    """The sweeper thread and concurrent readers share one connection"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = SQLiteApprovalStore(db_path=os.path.join(tmpdir, "test.db"), sweep_interval=0.05)
+        try:
+            grant = _approved_grant(store, ["ls"])
+            expired = _approved_grant(store, ["ls"])
+            _expire(store, expired.grant_id)
+            
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.extend(
+                    store.verify_grant(grant.grant_id, "ls") for _ in range(200)
+                ))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert len(results) == 800 and all(results)
+            
+            deadline = time.monotonic() + 2
+            while time.monotonic() < deadline:
+                with store._lock:
+                    left = store._conn.execute("SELECT COUNT(*) FROM grants").fetchone()[0]
+                if left == 1:
+                    break
+                time.sleep(0.02)
+            assert left == 1
+        finally:
+            store.close()
@@ -3,22 +3,42 @@ Tests for audit logger
 """
 import pytest
 import json
+import os
 import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from unittest.mock import Mock, patch
 from ajson.hands.audit_logger import AuditLogger
 
 
-def test_audit_logger_initialization():
+@pytest.fixture
+def make_logger():
+    """AuditLogger factory; every logger it builds is closed after the test"""
+    loggers = []
+
+    def make(log_dir, **kwargs):
+        logger = AuditLogger(log_dir=log_dir, **kwargs)
+        loggers.append(logger)
+        return logger
+
+    yield make
+    for logger in loggers:
+        assert logger.close()
+
+
+def test_audit_logger_initialization(make_logger):
     """Logger creates log directory"""
     with tempfile.TemporaryDirectory() as tmpdir:
-        logger = AuditLogger(log_dir=tmpdir)
+        logger = make_logger(tmpdir)
         assert Path(tmpdir).exists()
 
 
-def test_log_request_created():
+def test_log_request_created(make_logger):
     """Log approval request creation"""
     with tempfile.TemporaryDirectory() as tmpdir:
-        logger = AuditLogger(log_dir=tmpdir)
+        logger = make_logger(tmpdir)
         
         logger.log_request_created(
             request_id="req-123",
@@ -28,6 +48,7 @@ def test_log_request_created():
         )
         
         # Verify log file exists and contains event
+        logger.flush()
         log_files = list(Path(tmpdir).glob("audit_*.jsonl"))
         assert len(log_files) == 1
         
@@ -40,10 +61,10 @@ def test_log_request_created():
         assert events[0]["operation"] == "ls -la"
 
 
-def test_log_approval_granted():
+def test_log_approval_granted(make_logger):
     """Log approval grant"""
     with tempfile.TemporaryDirectory() as tmpdir:
-        logger = AuditLogger(log_dir=tmpdir)
+        logger = make_logger(tmpdir)
         
         logger.log_request_approved(
             request_id="req-123",
@@ -53,6 +74,7 @@ def test_log_approval_granted():
             decided_by="admin"
         )
         
+        logger.flush()
         log_files = list(Path(tmpdir).glob("audit_*.jsonl"))
         with open(log_files[0]) as f:
             events = [json.loads(line) for line in f]
@@ -62,10 +84,10 @@ def test_log_approval_granted():
         assert events[0]["scope"] == ["ls", "git"]
 
 
-def test_log_denial():
+def test_log_denial(make_logger):
     """Log approval denial"""
     with tempfile.TemporaryDirectory() as tmpdir:
-        logger = AuditLogger(log_dir=tmpdir)
+        logger = make_logger(tmpdir)
         
         logger.log_request_denied(
             request_id="req-123",
@@ -73,6 +95,7 @@ def test_log_denial():
             decided_by="admin"
         )
         
+        logger.flush()
         log_files = list(Path(tmpdir).glob("audit_*.jsonl"))
         with open(log_files[0]) as f:
             events = [json.loads(line) for line in f]
@@ -81,10 +104,10 @@ def test_log_denial():
         assert events[0]["reason"] == "Too risky"
 
 
-def test_log_grant_verification():
+def test_log_grant_verification(make_logger):
     """Log grant verification"""
     with tempfile.TemporaryDirectory() as tmpdir:
-        logger = AuditLogger(log_dir=tmpdir)
+        logger = make_logger(tmpdir)
         
         logger.log_grant_verification(
             grant_id="grant-456",
@@ -92,6 +115,7 @@ def test_log_grant_verification():
             valid=True
         )
         
+        logger.flush()
         log_files = list(Path(tmpdir).glob("audit_*.jsonl"))
         with open(log_files[0]) as f:
             events = [json.loads(line) for line in f]
@@ -100,10 +124,10 @@ def test_log_grant_verification():
         assert events[0]["valid"] is True
 
 
-def test_log_execution():
+def test_log_execution(make_logger):
     """Log tool execution"""
     with tempfile.TemporaryDirectory() as tmpdir:
-        logger = AuditLogger(log_dir=tmpdir)
+        logger = make_logger(tmpdir)
         
         logger.log_execution(
             grant_id="grant-456",
@@ -113,6 +137,7 @@ def test_log_execution():
             returncode=0
         )
         
+        logger.flush()
         log_files = list(Path(tmpdir).glob("audit_*.jsonl"))
         with open(log_files[0]) as f:
             events = [json.loads(line) for line in f]
@@ -122,10 +147,10 @@ def test_log_execution():
         assert events[0]["returncode"] == 0
 
 
-def test_log_security_violation():
+def test_log_security_violation(make_logger):
     """Log security violation"""
     with tempfile.TemporaryDirectory() as tmpdir:
-        logger = AuditLogger(log_dir=tmpdir)
+        logger = make_logger(tmpdir)
         
         logger.log_security_violation(
             violation_type="network_deny",
@@ -133,6 +158,7 @@ def test_log_security_violation():
             context={"operation": "curl https://example.com"}
         )
         
+        logger.flush()
         log_files = list(Path(tmpdir).glob("audit_*.jsonl"))
         with open(log_files[0]) as f:
             events = [json.loads(line) for line in f]
@@ -141,15 +167,16 @@ def test_log_security_violation():
         assert events[0]["violation_type"] == "network_deny"
 
 
-def test_multiple_events():
+def test_multiple_events(make_logger):
     """Log multiple events in sequence"""
     with tempfile.TemporaryDirectory() as tmpdir:
-        logger = AuditLogger(log_dir=tmpdir)
+        logger = make_logger(tmpdir)
         
         logger.log_request_created("req-1", "ls", "readonly", "test")
         logger.log_request_approved("req-1", "grant-1", ["ls"], 300, "admin")
         logger.log_execution("grant-1", "ls", {}, "success", 0)
         
+        logger.flush()
         log_files = list(Path(tmpdir).glob("audit_*.jsonl"))
         with open(log_files[0]) as f:
             events = [json.loads(line) for line in f]
@@ -158,3 +185,227 @@ def test_multiple_events():
         assert events[0]["event_type"] == "approval_request_created"
         assert events[1]["event_type"] == "approval_granted"
         assert events[2]["event_type"] == "tool_execution"
+
+
+def _events(tmpdir):
+    events = []
+    for log_file in sorted(Path(tmpdir).glob("audit_*.jsonl")):
+        with open(log_file) as f:
+            events.extend(json.loads(line) for line in f)
+    return events
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+@contextmanager
+def _stalled_full_queue(logger):
+    """
+    Writer stuck writing event "a" while event "b" fills the queue
+    (queue_max=1, flush_lines=1); yields the Event releasing it (set on exit)
+    """
+    release = threading.Event()
+    original = logger.writer._write
+
+    def slow_write(batch):
+        release.wait(5)
+        original(batch)
+
+    with patch.object(logger.writer, "_write", side_effect=slow_write):
+        try:
+            assert logger.writer.submit({"event_type": "a"})  # taken by the writer, stalls
+            _wait_for(lambda: logger.writer.stats()["queued"] == 0)
+            assert logger.writer.submit({"event_type": "b"})  # fills the queue
+            yield release
+        finally:
+            release.set()
+
+
+def test_logging_does_not_write_on_caller_thread(make_logger):
+    """Events are queued; the writer appends them in one batch"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logger = make_logger(tmpdir, flush_lines=100, flush_seconds=60)
+        for i in range(10):
+            logger.log_request_created(f"req-{i}", "ls", "readonly", "test")
+
+        assert _events(tmpdir) == []
+        assert logger.flush()
+        assert [e["request_id"] for e in _events(tmpdir)] == [f"req-{i}" for i in range(10)]
+        assert logger.writer.stats()["batches"] == 1
+        logger.close()
+
+
+def test_flush_on_batch_size_and_interval(make_logger):
+    """A full batch is written at once; a partial one after flush_seconds"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logger = make_logger(tmpdir, flush_lines=5, flush_seconds=60)
+        for i in range(5):
+            logger.log_request_denied(f"req-{i}", "no", "admin")
+        _wait_for(lambda: len(_events(tmpdir)) == 5)
+        logger.close()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logger = make_logger(tmpdir, flush_lines=100, flush_seconds=0.2)
+        logger.log_request_denied("req-1", "no", "admin")
+        _wait_for(lambda: len(_events(tmpdir)) == 1)
+        logger.close()
+
+
+def test_files_rotate_on_date_change(make_logger):
+    """Each event goes to the file of its own (local) date"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logger = make_logger(tmpdir)
+        day1 = time.mktime((2026, 3, 1, 23, 59, 59, 0, 0, -1))
+        day2 = time.mktime((2026, 3, 2, 0, 0, 1, 0, 0, -1))
+        logger.writer.submit({"event_type": "a"}, ts=day1)
+        logger.writer.submit({"event_type": "b"}, ts=day2)
+        logger.writer.submit({"event_type": "c"}, ts=day2)
+        logger.close()
+
+        names = sorted(p.name for p in Path(tmpdir).glob("audit_*.jsonl"))
+        assert names == ["audit_20260301.jsonl", "audit_20260302.jsonl"]
+        with open(Path(tmpdir) / "audit_20260302.jsonl") as f:
+            assert [json.loads(line)["event_type"] for line in f] == ["b", "c"]
+
+
+def test_full_queue_drops_and_records_count(make_logger):
+    """In drop mode a full queue never blocks; the loss is recorded"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logger = make_logger(tmpdir, queue_max=1, flush_lines=1)
+        with _stalled_full_queue(logger):
+            start = time.monotonic()
+            assert not any(logger.writer.submit({"event_type": "lost"}) for _ in range(3))
+            assert time.monotonic() - start < 0.1
+        assert logger.close()
+
+        assert logger.writer.stats()["dropped"] == 3
+        events = _events(tmpdir)
+        assert sorted(e["event_type"] for e in events) == ["a", "audit_events_dropped", "b"]
+        assert [e["count"] for e in events if e["event_type"] == "audit_events_dropped"] == [3]
+
+
+def test_block_mode_waits_for_room(make_logger):
+    """In block mode the caller waits instead of losing events"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logger = make_logger(tmpdir, queue_max=1, flush_lines=1, backpressure="block")
+        with _stalled_full_queue(logger) as release:
+            blocked = threading.Thread(target=logger.writer.submit, args=({"event_type": "c"},))
+            blocked.start()
+            blocked.join(0.2)
+            assert blocked.is_alive()
+            release.set()
+            blocked.join(5)
+            assert not blocked.is_alive()
+        assert logger.close()
+
+        assert [e["event_type"] for e in _events(tmpdir)] == ["a", "b", "c"]
+        assert logger.writer.stats()["dropped"] == 0
+
+
+def test_fsync_policy(make_logger, monkeypatch):
+    """AUDIT_FSYNC=batch syncs once per batch; never does not sync"""
+    calls = []
+    monkeypatch.setattr(os, "fsync", lambda fd: calls.append(fd))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logger = make_logger(tmpdir)
+        logger.log_request_denied("req-1", "no", "admin")
+        logger.flush()
+        assert calls == []
+        logger.close()
+
+        logger = make_logger(tmpdir, flush_lines=100, flush_seconds=60, fsync="batch")
+        for i in range(3):
+            logger.log_request_denied(f"req-{i}", "no", "admin")
+        logger.flush()
+        assert len(calls) == 1
+        logger.close()
+
+    with pytest.raises(ValueError, match="AUDIT_FSYNC"):
+        AuditLogger(log_dir=tmpdir, fsync="always")
+
+
+def test_unserializable_event_skips_only_itself(make_logger):
+    """One bad event does not lose the rest of its batch or the drop count"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logger = make_logger(tmpdir, flush_lines=100, flush_seconds=60)
+        circular = {}
+        circular["self"] = circular
+        logger.log_request_denied("req-1", "no", "admin")
+        logger.log_security_violation("loop", "circular context", circular)
+        logger.log_request_denied("req-2", "no", "admin")
+        logger.writer._unreported_drops = 2
+        logger.close()
+
+        events = _events(tmpdir)
+        assert [e.get("request_id") for e in events] == ["req-1", "req-2", None]
+        assert events[-1] == {**events[-1], "event_type": "audit_events_dropped", "count": 2}
+        assert logger.writer.stats()["errors"] == 1
+
+
+def test_full_queue_flush_and_close_honour_timeout(make_logger):
+    """flush/close give up on a full queue instead of blocking; close() can be retried"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logger = make_logger(tmpdir, queue_max=1, flush_lines=1)
+        with _stalled_full_queue(logger):
+            start = time.monotonic()
+            assert logger.flush(timeout=0.1) is False
+            assert logger.close(timeout=0.1) is False
+            assert time.monotonic() - start < 1.0
+        _wait_for(lambda: logger.writer.stats()["queued"] == 0)
+
+        assert logger.writer._thread.is_alive()
+        assert logger.close()  # Retries queuing the stop
+        assert not logger.writer._thread.is_alive()
+        assert logger.writer._file is None
+        assert [e["event_type"] for e in _events(tmpdir)] == ["a", "b"]
+
+
+def test_close_audit_logger_keeps_a_logger_that_did_not_stop(monkeypatch):
+    """The global logger is only dropped once its writer stopped"""
+    from ajson.hands import audit_logger
+
+    stuck = Mock(spec=AuditLogger)
+    stuck.close.side_effect = [False, True]
+    monkeypatch.setattr(audit_logger, "_audit_logger", stuck)
+
+    assert audit_logger.close_audit_logger() is False
+    assert audit_logger.get_audit_logger() is stuck
+    assert audit_logger.close_audit_logger() is True
+    assert audit_logger._audit_logger is None
+
+
+def test_submit_after_close_is_refused(make_logger):
+    """Nothing is accepted (and silently lost) once close() started"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logger = make_logger(tmpdir)
+        logger.writer.submit({"event_type": "a"})
+        assert logger.close()
+        assert logger.writer.submit({"event_type": "late"}) is False
+        assert logger.writer.stats()["dropped"] == 0
+        assert [e["event_type"] for e in _events(tmpdir)] == ["a"]
+
+
+def test_every_accepted_event_is_written_when_closing_concurrently(make_logger):
+    """submit() returning True means the event reaches the file, even racing close()"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logger = make_logger(tmpdir, flush_lines=10)
+        accepted = []
+
+        def producer(n):
+            for i in range(500):
+                if logger.writer.submit({"event_type": "e", "id": f"{n}-{i}"}):
+                    accepted.append(f"{n}-{i}")
+
+        threads = [threading.Thread(target=producer, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        time.sleep(0.005)
+        assert logger.close()
+        for t in threads:
+            t.join()
+
+        assert sorted(e["id"] for e in _events(tmpdir)) == sorted(accepted)
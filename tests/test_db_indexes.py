@@ -0,0 +1,50 @@
+"""
+Tests that SSOT hot queries are served by indexes (no full table scans)
+"""
+import pytest
+from ajson import db
+
+
+@pytest.fixture
+def indexed_db(tmp_path, monkeypatch):
+    """Point ajson.db at a fresh, fully migrated file database"""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "indexes.db"))
+    db.migrate()
+    yield db
+    db.close_connections()
+
+
+HOT_QUERIES = {
+    "steps": "SELECT * FROM steps WHERE mission_id = ? ORDER BY created_at",
+    "artifacts": "SELECT * FROM artifacts WHERE mission_id = ? ORDER BY created_at",
+    "memories": "SELECT * FROM memories WHERE mission_id = ? ORDER BY created_at",
+    "messages": "SELECT * FROM messages WHERE mission_id = ? ORDER BY id ASC",
+    "approvals": "SELECT * FROM approvals WHERE mission_id = ? AND status = 'PENDING' ORDER BY created_at",
+    "tool_runs": "SELECT * FROM tool_runs WHERE step_id = ? ORDER BY created_at",
+}
+
+
+def _plan(sql: str) -> str:
+    rows = db.get_connection().execute(f"EXPLAIN QUERY PLAN {sql}", (1,)).fetchall()
+    return " | ".join(row[3] for row in rows)
+
+
+@pytest.mark.parametrize("table", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(indexed_db, table):
+    """Per-mission lookups search an index instead of scanning the table"""
+    plan = _plan(HOT_QUERIES[table])
+    assert f"SCAN {table}" not in plan
+    assert "USING INDEX" in plan or "USING COVERING INDEX" in plan
+
+
+def test_tool_runs_by_mission_join_uses_indexes(indexed_db):
+    """tool_runs JOIN steps is driven by the mission and step indexes"""
+    plan = _plan("""
+        SELECT tr.* FROM tool_runs tr
+        JOIN steps s ON tr.step_id = s.id
+        WHERE s.mission_id = ?
+        ORDER BY tr.created_at
+    """)
+    assert "SCAN tr" not in plan and "SCAN s" not in plan
+    assert "idx_steps_mission_created" in plan
+    assert "idx_tool_runs_step_created" in plan
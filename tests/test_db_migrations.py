@@ -0,0 +1,73 @@
+"""
+Tests for versioned schema migrations in ajson.db
+"""
+import sqlite3
+import pytest
+from fastapi.testclient import TestClient
+from ajson import db
+from ajson.app import app
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    """Point ajson.db at an empty file database"""
+    path = str(tmp_path / "migrate.db")
+    monkeypatch.setattr(db, "DB_PATH", path)
+    yield path
+    db.close_connections()
+
+
+def test_migrate_records_schema_version(fresh_db):
+    """migrate() applies every migration and records the latest version"""
+    version = db.migrate()
+
+    assert version == db.MIGRATIONS[-1][0]
+    assert db.get_schema_version() == version
+
+    rows = db.get_connection().execute("SELECT version FROM schema_version ORDER BY version").fetchall()
+    assert [r[0] for r in rows] == [m[0] for m in db.MIGRATIONS]
+
+
+def test_migrate_is_idempotent(fresh_db):
+    """Re-running migrate() applies nothing twice"""
+    db.migrate()
+    db.migrate()
+
+    count = db.get_connection().execute("SELECT COUNT(*) FROM schema_version").fetchone()[0]
+    assert count == len(db.MIGRATIONS)
+
+
+def test_legacy_database_is_adopted(fresh_db):
+    """A database created before migrations gets versioned without data loss"""
+    conn = sqlite3.connect(fresh_db)
+    conn.execute("""
+        CREATE TABLE missions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("INSERT INTO missions (title, description, status) VALUES ('old', 'legacy', 'DONE')")
+    conn.commit()
+    conn.close()
+
+    db.migrate()
+
+    assert db.get_mission(1)["title"] == "old"
+    assert db.get_schema_version() == db.MIGRATIONS[-1][0]
+
+
+def test_crud_without_explicit_init(fresh_db):
+    """First pooled connection migrates the schema, so handlers skip DDL"""
+    mission_id = db.create_mission("No init", "schema on first connection")
+    assert db.get_mission(mission_id)["status"] == "CREATED"
+
+
+def test_lifespan_runs_migrations(fresh_db):
+    """App startup migrates the database before serving requests"""
+    with TestClient(app) as client:
+        assert db.get_schema_version() == db.MIGRATIONS[-1][0]
+        assert client.get("/healthz").status_code == 200
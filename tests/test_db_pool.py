@@ -0,0 +1,79 @@
+"""
+Tests for pooled SQLite connections in ajson.db
+"""
+import threading
+import pytest
+from ajson import db
+
+
+@pytest.fixture
+def pooled_db(tmp_path, monkeypatch):
+    """Point ajson.db at a fresh file database"""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "pool.db"))
+    db.init_db()
+    yield db
+    db.close_connections()
+
+
+def test_connection_reused_within_thread(pooled_db):
+    """Same thread gets the same long-lived connection"""
+    assert pooled_db.get_connection() is pooled_db.get_connection()
+
+
+def test_connection_per_thread(pooled_db):
+    """Each thread gets its own connection"""
+    main_conn = pooled_db.get_connection()
+    seen = []
+
+    def worker():
+        seen.append(pooled_db.get_connection())
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+
+    assert seen[0] is not main_conn
+
+
+def test_wal_and_pragmas_applied(pooled_db):
+    """Pooled connections use WAL with tuned pragmas"""
+    conn = pooled_db.get_connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -db.DB_CACHE_SIZE_KB
+
+
+def test_crud_visible_across_threads(pooled_db):
+    """Writes on one thread's connection are visible to another"""
+    mission_id = pooled_db.create_mission("Pool", "cross-thread")
+    result = {}
+
+    def worker():
+        result["mission"] = pooled_db.get_mission(mission_id)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+
+    assert result["mission"]["title"] == "Pool"
+
+
+def test_dead_thread_connections_reaped(pooled_db):
+    """Connections of exited threads are closed when new ones open"""
+    pooled_db.get_connection()
+
+    for _ in range(5):
+        t = threading.Thread(target=pooled_db.get_connection)
+        t.start()
+        t.join()
+
+    # Main thread + at most the last (dead, not yet reaped) worker
+    assert pooled_db.get_pool().size() <= 2
+
+
+def test_close_connections_reconnects(pooled_db):
+    """Shutdown closes the pool; later calls transparently reconnect"""
+    mission_id = pooled_db.create_mission("Before", "shutdown")
+    pooled_db.close_connections()
+
+    assert pooled_db.get_mission(mission_id)["title"] == "Before"
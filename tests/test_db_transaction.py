@@ -0,0 +1,78 @@
+"""
+Tests for db.transaction() unit-of-work batching
+"""
+import pytest
+from ajson import db, orchestrator
+from ajson.models import MissionStatus
+
+
+@pytest.fixture
+def tx_db(tmp_path, monkeypatch):
+    """Point ajson.db at a fresh file database"""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "tx.db"))
+    db.init_db()
+    yield db
+    db.close_connections()
+
+
+def _count_commits(conn):
+    """Install a trace callback counting COMMIT statements"""
+    commits = []
+    conn.set_trace_callback(lambda sql: commits.append(sql) if sql.strip().upper() == "COMMIT" else None)
+    return commits
+
+
+def test_transaction_commits_once(tx_db):
+    """All writes in the block land in a single commit"""
+    mission_id = tx_db.create_mission("Tx", "batch")
+    commits = _count_commits(tx_db.get_connection())
+
+    with tx_db.transaction():
+        step_id = tx_db.create_step(mission_id, "jarvis", "input")
+        tx_db.update_step(step_id, "output", "COMPLETED")
+        tx_db.create_artifact(mission_id, "plan", "plan.md", "content")
+        tx_db.update_mission_status(mission_id, MissionStatus.PLANNED)
+
+    assert len(commits) == 1
+    assert tx_db.get_mission(mission_id)["status"] == MissionStatus.PLANNED
+
+
+def test_transaction_rolls_back_on_error(tx_db):
+    """An exception discards every write in the block"""
+    mission_id = tx_db.create_mission("Tx", "rollback")
+
+    with pytest.raises(RuntimeError):
+        with tx_db.transaction():
+            tx_db.create_step(mission_id, "jarvis", "input")
+            tx_db.update_mission_status(mission_id, MissionStatus.PLANNED)
+            raise RuntimeError("crash mid-transition")
+
+    assert tx_db.get_mission(mission_id)["status"] == MissionStatus.CREATED
+    assert tx_db.get_steps_by_mission(mission_id) == []
+
+
+def test_nested_transaction_joins_outer(tx_db):
+    """Inner blocks join the outer transaction and do not commit early"""
+    mission_id = tx_db.create_mission("Tx", "nested")
+
+    with pytest.raises(RuntimeError):
+        with tx_db.transaction():
+            with tx_db.transaction():
+                tx_db.update_mission_status(mission_id, MissionStatus.PLANNED)
+            raise RuntimeError("outer fails")
+
+    assert tx_db.get_mission(mission_id)["status"] == MissionStatus.CREATED
+
+
+def test_full_run_one_commit_per_state(tx_db):
+    """CREATED→DONE needs exactly one commit per transition"""
+    mission_id = tx_db.create_mission("Tx", "Run pytest tests")
+    commits = _count_commits(tx_db.get_connection())
+
+    transitions = 0
+    while tx_db.get_mission(mission_id)["status"] != MissionStatus.DONE:
+        orchestrator.execute_mission(mission_id)
+        transitions += 1
+
+    assert transitions == 6
+    assert len(commits) == transitions
@@ -50,6 +50,54 @@ def test_denylist_blocks_curl():
     assert "curl" in error.lower()
 
 
+@pytest.mark.parametrize("command,keyword", [
+    ("ls; rm -rf build", "rm"),
+    ("cat a.txt && sudo ls", "sudo"),
+    ("(cd build || rm x)", "rm"),
+    ("ls | xargs /bin/rm", "rm"),
+    ("echo $(curl example.com)", "curl"),
+    ('r"m" -rf build', "rm"),
+    ("find . -delete", "delete"),
+    ('echo "unclosed; kill 1', "kill"),
+    ("echo 'x' a#b; rm x", "rm"),
+])
+def test_denylist_tokenized_commands(command, keyword):
+    """Test: Denied words are found in every part of a pipeline/chain/subshell"""
+    assert runner.check_denylist(command) == (True, f"Denied keyword detected: '{keyword}'")
+
+
+@pytest.mark.parametrize("command", [
+    "pytest --norm",
+    "echo information",
+    "python -m pytest tests/test_model.py",
+    "grep -rn performance src",
+    "cat README.md | grep -i sync",
+    "cat del.txt",
+    "echo --format=json",
+    "git log --grep=rm",
+    "ls rd-notes/ ./format.py",
+])
+def test_denylist_ignores_substrings(command):
+    """Test: Denied keywords inside longer words are not blocked"""
+    assert runner.check_denylist(command) == (False, None)
+
+
+def test_denylist_multi_word_keywords():
+    """Test: Multi-word keywords match consecutive tokens of one simple command"""
+    matcher = runner._DenyMatcher(("git push", "rm"))
+    assert matcher.first("ls && GIT  push origin") == "git push"
+    assert matcher.first("/usr/bin/git push; rm x") == "git push"  # First listed wins
+    assert matcher.first("git; push") is None
+    assert matcher.first("git status push") is None
+
+
+def test_tokenize_command():
+    """Test: Commands split into argv per simple command"""
+    assert runner.tokenize_command("ls -la && cat 'a b.txt' | grep x; (pwd)") == (
+        ("ls", "-la"), ("cat", "a b.txt"), ("grep", "x"), ("pwd",),
+    )
+
+
 def test_allowlist_accepts_echo():
     """Test: 'echo' command is allowed"""
     success, result, error = runner.run_tool("echo 'Hello World'")
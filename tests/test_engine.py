@@ -0,0 +1,138 @@
+"""
+Tests for the mission execution engine (ajson/engine.py)
+"""
+import threading
+import time
+import pytest
+from ajson import db, orchestrator
+from ajson.engine import MissionEngine, JOB_STALE_SECONDS
+from ajson.models import MissionStatus
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """Fresh database and a private engine"""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "engine.db"))
+    engine = MissionEngine(max_workers=2)
+    yield engine
+    engine.shutdown(timeout=10)
+    db.close_connections()
+
+
+def _drain(engine, timeout=10):
+    """Wait until the queue is empty and no run is in flight"""
+    deadline = time.time() + timeout
+    while db.count_mission_jobs() and time.time() < deadline:
+        time.sleep(0.02)
+    assert engine.wait_idle(timeout=timeout)
+
+
+def test_submit_runs_mission_to_done(engine):
+    """A submitted mission is driven to DONE in the background"""
+    mission_id = db.create_mission("Engine", "Run pytest tests")
+
+    assert engine.submit(mission_id)
+    _drain(engine)
+
+    assert db.get_mission(mission_id)["status"] == MissionStatus.DONE
+    assert not engine.is_active(mission_id)
+
+
+def test_run_stops_at_pending_approval(engine):
+    """Dangerous missions stop at the approval gate"""
+    mission_id = db.create_mission("Engine", "Deploy application to production")
+
+    assert engine.run_to_terminal(mission_id) == MissionStatus.PENDING_APPROVAL
+    assert db.get_mission(mission_id)["status"] == MissionStatus.PENDING_APPROVAL
+
+
+def test_mission_loaded_once_per_run(engine, monkeypatch):
+    """Statuses are handed along in memory instead of re-reading the mission"""
+    mission_id = db.create_mission("Engine", "Run pytest tests")
+    reads = []
+    get_mission = db.get_mission
+    monkeypatch.setattr(db, "get_mission", lambda mid: reads.append(mid) or get_mission(mid))
+
+    assert engine.run_to_terminal(mission_id) == MissionStatus.DONE
+    assert reads == [mission_id]
+
+
+def test_duplicate_submit_does_not_run_concurrently(engine, monkeypatch):
+    """Only one executor advances a mission; a re-submit reruns it afterwards"""
+    mission_id = db.create_mission("Engine", "Run pytest tests")
+    started = threading.Event()
+    release = threading.Event()
+    running = []
+    peak = []
+    advance = orchestrator.advance_mission
+
+    def slow_advance(mission):
+        running.append(mission["id"])
+        peak.append(len(running))
+        started.set()
+        release.wait(timeout=10)
+        try:
+            return advance(mission)
+        finally:
+            running.pop()
+
+    monkeypatch.setattr(orchestrator, "advance_mission", slow_advance)
+
+    assert engine.submit(mission_id)
+    assert started.wait(timeout=10)
+    assert engine.submit(mission_id)
+    assert engine.run_to_terminal(mission_id) is None  # Lease held elsewhere
+    release.set()
+    _drain(engine)
+
+    assert max(peak) == 1
+    assert db.get_mission(mission_id)["status"] == MissionStatus.DONE
+
+
+def test_failure_marks_mission_error(engine, monkeypatch):
+    """An exception during a transition sets ERROR and releases the lease"""
+    mission_id = db.create_mission("Engine", "Run pytest tests")
+
+    def boom(mission):
+        raise RuntimeError("role crashed")
+
+    monkeypatch.setattr(orchestrator, "advance_mission", boom)
+
+    assert engine.run_to_terminal(mission_id) == MissionStatus.ERROR
+    assert db.get_mission(mission_id)["status"] == MissionStatus.ERROR
+    assert not engine.is_active(mission_id)
+
+
+def test_shutdown_drains_and_keeps_queue(engine, tmp_path):
+    """shutdown() finishes in-flight runs; queued jobs survive for the next engine"""
+    mission_ids = [db.create_mission("Engine", f"Run pytest tests {i}") for i in range(6)]
+    for mission_id in mission_ids:
+        engine.submit(mission_id)
+
+    assert engine.shutdown(timeout=10)
+    assert not engine.submit(db.create_mission("Engine", "late"))
+    assert db.count_mission_jobs(db.JOB_CLAIMED) == 0
+
+    successor = MissionEngine(max_workers=2)
+    try:
+        successor.start()
+        _drain(successor)
+    finally:
+        successor.shutdown(timeout=10)
+
+    assert all(db.get_mission(m)["status"] == MissionStatus.DONE for m in mission_ids)
+
+
+def test_start_resumes_missions_of_dead_worker(engine):
+    """A claim whose worker stopped heartbeating is re-queued and finished"""
+    mission_id = db.create_mission("Engine", "Run pytest tests")
+    db.enqueue_mission_job(mission_id)
+    db.claim_mission_job("dead-worker", now=time.time() - JOB_STALE_SECONDS - 1)
+    orphan_id = db.create_mission("Engine", "Run pytest tests")  # Never enqueued
+
+    counts = engine.start()
+    _drain(engine)
+
+    assert counts["requeued"] == 1 and counts["orphaned"] == 1
+    assert db.get_mission(mission_id)["status"] == MissionStatus.DONE
+    assert db.get_mission(orphan_id)["status"] == MissionStatus.DONE
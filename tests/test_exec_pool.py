@@ -0,0 +1,148 @@
+"""
+Tests for the warm subprocess executor pool (ajson/tools/exec_pool.py)
+"""
+import subprocess
+import sys
+import time
+import pytest
+from ajson.hands.approval import ApprovalDecision, ApprovalStore
+from ajson.hands.runner import ToolRunner
+from ajson.tools import exec_pool, runner
+from ajson.tools.exec_pool import ExecutorPool
+from unittest.mock import patch
+
+
+PPID = [sys.executable, "-c", "import os; print(os.getppid())"]
+
+
+@pytest.fixture
+def pool():
+    pool = ExecutorPool(size=2, max_commands=5)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def global_pool(monkeypatch):
+    """Enable the process-wide pool for runner code paths"""
+    monkeypatch.setattr(exec_pool, "TOOL_EXEC_POOL", True)
+    yield
+    exec_pool.shutdown_exec_pool()
+
+
+def test_runs_with_requested_cwd_and_shell(pool, tmp_path):
+    """Same cwd/shell semantics as subprocess.run, plus latency"""
+    (tmp_path / "a.txt").write_text("x")
+
+    result = pool.run("pwd; ls *.txt", cwd=str(tmp_path), timeout=5, shell=True)
+    assert result.returncode == 0
+    assert result.stdout == f"{tmp_path}\na.txt\n"
+    assert result.latency_ms >= result.exec_ms > 0
+
+    result = pool.run(["echo", "$HOME;", "*"], cwd=str(tmp_path), timeout=5)
+    assert result.stdout == "$HOME; *\n"  # shell=False: nothing is expanded
+
+
+def test_workers_stay_warm(pool, tmp_path):
+    """Commands reuse a worker until it retires after max_commands"""
+    pids = [pool.run(PPID, cwd=str(tmp_path), timeout=5).stdout for _ in range(7)]
+
+    assert len(set(pids[:5])) == 1
+    assert pids[5] != pids[0] and pids[5] == pids[6]
+    assert pool.stats()[str(tmp_path)]["spawned"] == 2
+
+
+def test_timeout_and_errors_match_subprocess(pool, tmp_path):
+    """Timeouts and OS errors surface as subprocess.run would raise them"""
+    with pytest.raises(subprocess.TimeoutExpired):
+        pool.run(["sleep", "5"], cwd=str(tmp_path), timeout=0.2)
+    with pytest.raises(FileNotFoundError):
+        pool.run(["no_such_program_xyz"], cwd=str(tmp_path), timeout=5)
+    with pytest.raises(FileNotFoundError):
+        pool.run(["ls"], cwd=str(tmp_path / "missing"), timeout=5)
+
+    assert pool.run(["true"], cwd=str(tmp_path), timeout=5).returncode == 0
+    stats = pool.stats()[str(tmp_path)]
+    assert stats["timeouts"] == 1 and stats["commands"] == 3 and stats["spawned"] == 1
+
+
+def test_dead_worker_is_replaced(pool, tmp_path):
+    """A worker killed between commands is replaced transparently"""
+    first = pool.run(PPID, cwd=str(tmp_path), timeout=5).stdout
+    workspace = pool.workspace(str(tmp_path))
+    workspace._idle[0].proc.kill()
+    workspace._idle[0].proc.wait()
+
+    second = pool.run(PPID, cwd=str(tmp_path), timeout=5).stdout
+    assert second != first
+
+
+def test_run_tool_uses_pool(global_pool, tmp_path):
+    """run_tool keeps its checks and output format on pooled workers"""
+    work_dir = str(tmp_path / "ws")
+
+    assert runner.run_tool("echo 'Hello World'", work_dir) == (True, "Hello World\n", None)
+    assert runner.run_tool("ls", work_dir) == (True, "", None)
+    assert runner.run_tool("sudo ls", work_dir)[0] is False
+
+    stats = exec_pool.get_exec_pool().stats()
+    assert stats[work_dir]["commands"] == 2
+
+
+def test_run_tool_plain_commands_skip_shell(tmp_path):
+    """Plain commands exec directly; shell syntax and builtins still use sh"""
+    assert runner._plain_argv("git log --oneline -n 5") == ["git", "log", "--oneline", "-n", "5"]
+    for command in ("echo hi", "ls *.py", "cat a.txt | grep x", "FOO=1 ls", "ls ~", "cat 'a b'", "ls $HOME"):
+        assert runner._plain_argv(command) is None
+
+    work_dir = str(tmp_path)
+    success, output, error = runner.run_tool("python3 -c", work_dir)
+    assert not success and "exit code 2" in error
+    success, output, error = runner.run_tool("ls no_such_dir", work_dir)
+    assert not success and "exit code 2" in error
+
+
+def test_run_tool_recreates_missing_work_dir(tmp_path):
+    """A work directory removed after first use is created again"""
+    work_dir = tmp_path / "ws"
+    assert runner.run_tool("ls", str(work_dir))[0]
+    work_dir.rmdir()
+    assert runner.run_tool("ls", str(work_dir))[0]
+
+
+def test_execute_limited_uses_pool(global_pool):
+    """LIMITED execution runs argv (no shell) in /tmp on a pooled worker"""
+    store = ApprovalStore()
+    request = store.create_request("ls -la", "readonly", "test")
+    grant = store.approve_request(
+        request.request_id,
+        ApprovalDecision(request_id=request.request_id, decision="approve", reason="Test", scope=["ls"])
+    )
+
+    with patch('ajson.hands.approval.get_approval_store', return_value=store):
+        result = ToolRunner(dry_run=False).execute_tool_limited(grant.grant_id, "ls", {"-d": "-d", "path": "/tmp"})
+
+    assert result["returncode"] == 0 and result["stdout"] == "/tmp\n"
+    assert result["latency_ms"] > 0
+    assert exec_pool.get_exec_pool().stats()["/tmp"]["commands"] == 1
+
+
+def test_chunk_and_response_in_one_read(tmp_path):
+    """A response arriving in the same pipe read as a chunk is not missed"""
+    script = (
+        "import sys; sys.stdin.readline(); "
+        "sys.stdout.write('{\"chunk\": \"x\", \"stream\": \"stdout\"}\\n{\"returncode\": 0}\\n'); "
+        "sys.stdout.flush(); sys.stdin.readline()"
+    )
+    worker = exec_pool._Worker.__new__(exec_pool._Worker)
+    worker.proc = subprocess.Popen([sys.executable, "-c", script], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    worker.commands = 0
+    worker._pending = bytearray()
+    chunks = []
+
+    try:
+        response = worker.request({}, deadline=time.monotonic() + 5, on_chunk=lambda s, c: chunks.append(c))
+    finally:
+        worker.kill()
+
+    assert response == {"returncode": 0} and chunks == ["x"]
@@ -0,0 +1,123 @@
+"""
+Tests for batch LIMITED execution (ToolRunner.execute_batch, /api/hands/execute_batch)
+"""
+import asyncio
+import subprocess
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from ajson.api.execute import router
+from ajson.hands import runner as hands_runner
+from ajson.hands.approval import ApprovalDecision, ApprovalStore
+from ajson.hands.policy import PolicyDeniedError
+from ajson.hands.runner import ToolRunner
+
+
+def _grant(store: ApprovalStore, scope):
+    request = store.create_request("ls -d", "readonly", "test")
+    decision = ApprovalDecision(request_id=request.request_id, decision="approve", reason="Test", scope=scope)
+    return store.approve_request(request.request_id, decision)
+
+
+def _ls(path: str):
+    return {"tool_name": "ls", "args": {"-d": "-d", "path": path}}
+
+
+def _slow_run(argv, **kwargs):
+    time.sleep(0.3)
+    return subprocess.CompletedProcess(argv, 0, f"{argv[-1]}\n", "")
+
+
+def test_batch_results_in_order_with_one_grant_lookup():
+    """Each operation gets an execute_tool_limited result, in request order"""
+    store = ApprovalStore()
+    grant = _grant(store, ["ls"])
+
+    with patch('ajson.hands.approval.get_approval_store', return_value=store), \
+            patch.object(store, "get_grant", wraps=store.get_grant) as get_grant:
+        results = ToolRunner(dry_run=False).execute_batch(grant.grant_id, [_ls("/"), _ls("/tmp"), _ls("/")])
+
+    assert get_grant.call_count == 1
+    assert [r["stdout"] for r in results] == ["/\n", "/tmp\n", "/\n"]
+    assert all(r["executed"] and r["returncode"] == 0 and r["grant_id"] == grant.grant_id for r in results)
+
+
+def test_batch_runs_in_parallel():
+    """Independent commands overlap, bounded by max_parallel"""
+    store = ApprovalStore()
+    grant = _grant(store, ["ls"])
+    tool = ToolRunner(dry_run=False)
+    operations = [_ls(f"/d{i}") for i in range(4)]
+
+    with patch('ajson.hands.approval.get_approval_store', return_value=store), \
+            patch.object(hands_runner.subprocess, "run", side_effect=_slow_run):
+        started = time.monotonic()
+        results = tool.execute_batch(grant.grant_id, operations, max_parallel=4)
+        parallel = time.monotonic() - started
+
+        started = time.monotonic()
+        tool.execute_batch(grant.grant_id, operations, max_parallel=2)
+        bounded = time.monotonic() - started
+
+    assert [r["stdout"] for r in results] == [f"/d{i}\n" for i in range(4)]
+    assert parallel < 0.55 <= bounded
+
+
+def test_batch_rejected_before_anything_runs():
+    """One failing operation rejects the whole batch, naming it"""
+    store = ApprovalStore()
+    grant = _grant(store, ["ls", "rm", "curl"])
+    tool = ToolRunner(dry_run=False)
+
+    with patch('ajson.hands.approval.get_approval_store', return_value=store), \
+            patch.object(hands_runner.subprocess, "run", side_effect=AssertionError("executed")):
+        with pytest.raises(ValueError, match=r"operations\[1\]: Operation not in allowlist"):
+            tool.execute_batch(grant.grant_id, [_ls("/"), {"tool_name": "rm", "args": {"-rf": "/"}}])
+        with pytest.raises(ValueError, match=r"operations\[0\]: Invalid or expired grant"):
+            tool.execute_batch(grant.grant_id, [{"tool_name": "cat", "args": {"path": "a"}}])
+        with pytest.raises(PolicyDeniedError):
+            tool.execute_batch(grant.grant_id, [_ls("/"), {"tool_name": "curl", "args": {"url": "https://example.com"}}])
+        with pytest.raises(ValueError, match="no operations"):
+            tool.execute_batch(grant.grant_id, [])
+        with pytest.raises(ValueError, match="max"):
+            tool.execute_batch(grant.grant_id, [_ls("/")] * (hands_runner.MAX_BATCH_OPERATIONS + 1))
+
+
+def test_batch_async_matches_sync():
+    """execute_batch_async gives the same results as execute_batch"""
+    store = ApprovalStore()
+    grant = _grant(store, ["ls"])
+    tool = ToolRunner(dry_run=False)
+    operations = [_ls("/tmp"), _ls("/")]
+
+    with patch('ajson.hands.approval.get_approval_store', return_value=store):
+        sync_results = tool.execute_batch(grant.grant_id, operations)
+        async_results = asyncio.run(tool.execute_batch_async(grant.grant_id, operations))
+
+    for result in sync_results + async_results:
+        result.pop("latency_ms")
+    assert async_results == sync_results
+
+
+def test_batch_endpoint():
+    """POST /api/hands/execute_batch returns ordered results or rejects the batch"""
+    store = ApprovalStore()
+    grant = _grant(store, ["ls"])
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    with patch('ajson.hands.approval.get_approval_store', return_value=store):
+        response = client.post("/api/hands/execute_batch", json={
+            "grant_id": grant.grant_id, "operations": [_ls("/tmp"), _ls("/")]
+        })
+        rejected = client.post("/api/hands/execute_batch", json={
+            "grant_id": grant.grant_id, "operations": [_ls("/"), {"tool_name": "rm", "args": {"-rf": "/"}}]
+        })
+
+    assert response.status_code == 200
+    assert response.json()["grant_id"] == grant.grant_id
+    assert [r["stdout"] for r in response.json()["results"]] == ["/tmp\n", "/\n"]
+    assert rejected.status_code == 400 and "operations[1]" in rejected.json()["detail"]
@@ -0,0 +1,153 @@
+"""
+Tests for the asyncio execution path of LIMITED mode (execute_tool_limited_async)
+"""
+import asyncio
+import os
+import subprocess
+import threading
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from ajson.api.execute import router
+from ajson.hands import runner as hands_runner
+from ajson.hands.approval import ApprovalDecision, ApprovalStore
+from ajson.hands.runner import ToolRunner, run_limited_async
+
+
+def _grant(store: ApprovalStore, operation: str, scope):
+    request = store.create_request(operation, "readonly", "test")
+    decision = ApprovalDecision(request_id=request.request_id, decision="approve", reason="Test", scope=scope)
+    return store.approve_request(request.request_id, decision)
+
+
+def _running(marker: str) -> bool:
+    """True if a process with marker in its command line is alive"""
+    for pid in os.listdir("/proc"):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                if marker.encode() in f.read():
+                    return True
+        except (OSError, ValueError):
+            continue
+    return False
+
+
+def test_async_matches_sync_result():
+    """Same checks and result shape as the blocking path"""
+    store = ApprovalStore()
+    grant = _grant(store, "ls -d", ["ls"])
+    tool = ToolRunner(dry_run=False)
+
+    with patch('ajson.hands.approval.get_approval_store', return_value=store):
+        sync_result = tool.execute_tool_limited(grant.grant_id, "ls", {"-d": "-d", "path": "."})
+        async_result = asyncio.run(tool.execute_tool_limited_async(grant.grant_id, "ls", {"-d": "-d", "path": "."}))
+
+        with pytest.raises(ValueError, match="not in allowlist"):
+            asyncio.run(tool.execute_tool_limited_async(_grant(store, "rm", ["rm"]).grant_id, "rm", {"-rf": "/"}))
+    with pytest.raises(ValueError, match="Invalid or expired grant"):
+        asyncio.run(tool.execute_tool_limited_async("invalid-id", "ls", {}))
+
+    sync_result.pop("latency_ms")
+    async_result.pop("latency_ms")
+    assert async_result == sync_result
+    assert async_result["stdout"] == ".\n"
+
+
+def test_event_loop_stays_responsive():
+    """The loop keeps running other work while a command runs"""
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.05)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        returncode, _, _ = await run_limited_async(["sleep", "0.5"])
+        task.cancel()
+        return returncode, ticks
+
+    returncode, ticks = asyncio.run(scenario())
+    assert returncode == 0 and ticks >= 5
+
+
+def test_concurrency_is_bounded(monkeypatch):
+    """At most LIMITED_EXEC_CONCURRENCY commands run at once"""
+    monkeypatch.setattr(hands_runner, "LIMITED_EXEC_CONCURRENCY", 1)
+
+    async def scenario():
+        start = time.monotonic()
+        await asyncio.gather(run_limited_async(["sleep", "0.3"]), run_limited_async(["sleep", "0.3"]))
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) >= 0.6
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc")
+def test_timeout_and_cancellation_kill_the_command():
+    """Timed-out and cancelled commands do not outlive the call"""
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(run_limited_async(["sleep", "7.301"], timeout=0.2))
+    assert not _running("7.301")
+
+    async def cancelled():
+        task = asyncio.create_task(run_limited_async(["sleep", "7.302"]))
+        await asyncio.sleep(0.2)
+        assert _running("7.302")
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancelled())
+    assert not _running("7.302")
+
+
+def test_endpoint_uses_async_path():
+    """POST /api/hands/execute_limited awaits the async runner"""
+    store = ApprovalStore()
+    grant = _grant(store, "ls -d", ["ls"])
+    app = FastAPI()
+    app.include_router(router)
+
+    with patch('ajson.hands.approval.get_approval_store', return_value=store), \
+            patch.object(ToolRunner, "execute_tool_limited", side_effect=AssertionError("blocking path used")):
+        response = TestClient(app).post("/api/hands/execute_limited", json={
+            "grant_id": grant.grant_id, "tool_name": "ls", "args": {"-d": "-d", "path": "."}
+        })
+
+    assert response.status_code == 200
+    assert response.json()["stdout"] == ".\n"
+
+
+def test_disk_touching_checks_run_off_the_loop():
+    """Grant verification and the result cache lookup run in a worker thread"""
+    store = ApprovalStore()
+    grant = _grant(store, "ls -d", ["ls"])
+    tool = ToolRunner(dry_run=False)
+    threads = {}
+    authorize, cached_run = ToolRunner._authorize_limited, ToolRunner._cached_run
+
+    def recording_authorize(self, *args):
+        threads["authorize"] = threading.current_thread()
+        return authorize(self, *args)
+
+    def recording_cached_run(*args):
+        threads["cached_run"] = threading.current_thread()
+        return cached_run(*args)
+
+    async def scenario():
+        with patch.object(ToolRunner, "_authorize_limited", recording_authorize), \
+                patch.object(ToolRunner, "_cached_run", staticmethod(recording_cached_run)):
+            result = await tool.execute_tool_limited_async(grant.grant_id, "ls", {"-d": "-d", "path": "."})
+        return result, threading.current_thread()
+
+    with patch('ajson.hands.approval.get_approval_store', return_value=store):
+        result, loop_thread = asyncio.run(scenario())
+
+    assert result["stdout"] == ".\n"
+    assert threads["authorize"] is not loop_thread
+    assert threads["cached_run"] is not loop_thread
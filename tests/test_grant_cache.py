@@ -0,0 +1,124 @@
+"""
+Tests for the verified-grant cache (ajson/hands/grant_cache.py)
+"""
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from ajson import db
+from ajson.api.approvals import router as approvals_router
+from ajson.api.execute import router as execute_router
+from ajson.hands import grant_cache
+from ajson.hands.approval import ApprovalDecision, ApprovalStore
+from ajson.hands.grant_cache import VerifiedGrantCache, revoke_grant
+from ajson.hands.runner import ToolRunner
+
+EVALUATION = ("allow", "readonly", "Allowed: matches allowlist")
+
+
+@pytest.fixture
+def ssot(tmp_path, monkeypatch):
+    """Fresh SSOT and an enabled global cache polling on every lookup"""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "grants.db"))
+    monkeypatch.setattr(grant_cache, "GRANT_CACHE", True)
+    monkeypatch.setattr(grant_cache, "GRANT_REVOCATION_POLL_SECONDS", 0)
+    monkeypatch.setattr(grant_cache, "_grant_cache", None)
+    db.init_db()
+    yield
+    monkeypatch.setattr(grant_cache, "_grant_cache", None)
+    db.close_connections()
+
+
+@pytest.fixture
+def store():
+    store = ApprovalStore()
+    with patch('ajson.hands.approval.get_approval_store', return_value=store):
+        yield store
+
+
+def _grant(store: ApprovalStore, ttl_seconds: int = 300):
+    request = store.create_request("ls -d", "readonly", "test")
+    decision = ApprovalDecision(
+        request_id=request.request_id, decision="approve", reason="Test", scope=["ls"], ttl_seconds=ttl_seconds
+    )
+    return store.approve_request(request.request_id, decision)
+
+
+def test_repeated_grant_served_from_cache(ssot, store):
+    """Only the first execute of an operation reaches the store"""
+    grant = _grant(store)
+    tool = ToolRunner(dry_run=False)
+    args = {"-d": "-d", "path": "/tmp"}
+
+    with patch.object(store, "verify_grant_until", wraps=store.verify_grant_until) as verify:
+        results = [tool.execute_tool_limited(grant.grant_id, "ls", args) for _ in range(3)]
+        with pytest.raises(ValueError, match="Invalid or expired grant"):
+            tool.execute_tool_limited(grant.grant_id, "cat", {"path": "x"})  # Out of scope: never cached
+
+    assert verify.call_count == 2
+    assert all(r["stdout"] == "/tmp\n" for r in results)
+    assert grant_cache.get_grant_cache().stats() == {
+        "entries": 1, "hits": 2, "misses": 2, "hit_ratio": 0.5, "expirations": 0, "revocations": 0, "evictions": 0
+    }
+
+
+def test_entries_end_at_grant_expiry_and_rule_reload(ssot, monkeypatch):
+    """Hits stop exactly when the grant expires, and on a rule reload"""
+    cache = VerifiedGrantCache(ttl_seconds=60, poll_seconds=0)
+    cache.put("g1", "ls {}", time.time() + 0.1, EVALUATION)
+    cache.put("g2", "ls {}", time.time() + 60, EVALUATION)
+    assert cache.get("g1", "ls {}") == EVALUATION
+
+    time.sleep(0.15)
+    assert cache.get("g1", "ls {}") is None
+
+    monkeypatch.setattr(grant_cache, "get_rules", lambda: object())
+    assert cache.get("g2", "ls {}") is None
+    assert cache.stats()["expirations"] == 2 and cache.stats()["entries"] == 0
+
+
+def test_revocation_is_immediate_in_process(ssot, store):
+    """revoke_grant drops the grant from the store and the cache"""
+    grant = _grant(store)
+    tool = ToolRunner(dry_run=False)
+    args = {"-d": "-d", "path": "/tmp"}
+    tool.execute_tool_limited(grant.grant_id, "ls", args)
+
+    assert revoke_grant(grant.grant_id) is True
+    with pytest.raises(ValueError, match="Invalid or expired grant"):
+        tool.execute_tool_limited(grant.grant_id, "ls", args)
+
+    assert revoke_grant(grant.grant_id) is False
+    assert [r["grant_id"] for r in db.get_grant_revocations_after(0)] == [grant.grant_id]
+    assert grant_cache.get_grant_cache().stats()["revocations"] == 1
+
+
+def test_revocation_reaches_other_processes(ssot):
+    """A revocation recorded in the SSOT invalidates every process's cache"""
+    other = VerifiedGrantCache(poll_seconds=0)  # Another worker's cache
+    other.put("g1", "ls {}", time.time() + 60, EVALUATION)
+    other.put("g2", "ls {}", time.time() + 60, EVALUATION)
+    assert other.get("g1", "ls {}") == EVALUATION
+
+    db.record_grant_revocation("g1")
+
+    assert other.get("g1", "ls {}") is None
+    assert other.get("g2", "ls {}") == EVALUATION
+    other.put("g1", "ls {}", time.time() + 60, EVALUATION)  # A verification racing the revocation
+    assert other.get("g1", "ls {}") is None
+
+
+def test_revoke_and_stats_endpoints(ssot, store):
+    """POST /api/approvals/grants/{id}/revoke and GET /api/hands/grant_cache"""
+    grant = _grant(store)
+    app = FastAPI()
+    app.include_router(approvals_router)
+    app.include_router(execute_router)
+    client = TestClient(app)
+
+    assert client.post(f"/api/approvals/grants/{grant.grant_id}/revoke").json() == {
+        "status": "revoked", "grant_id": grant.grant_id
+    }
+    assert client.post(f"/api/approvals/grants/{grant.grant_id}/revoke").status_code == 404
+    assert client.get("/api/hands/grant_cache").json()["enabled"] is True
@@ -0,0 +1,73 @@
+"""
+Tests for the shared Aho–Corasick keyword scanner (ajson/keyword_scan.py)
+"""
+from ajson import keyword_scan
+from ajson.keyword_scan import KeywordHit, KeywordScanner, get_keyword_scanner
+from ajson.llm import mock
+from ajson.policy_rules import get_rules
+from ajson.tools import runner
+
+
+def test_reports_every_hit_with_category_and_offset():
+    """Overlapping and suffix keywords are all reported, in one pass"""
+    scanner = KeywordScanner([("he", "a"), ("she", "a"), ("his", "b"), ("hers", "b")])
+
+    assert scanner.scan("uSHErs") == (
+        KeywordHit("she", "a", 1, 1, 4),
+        KeywordHit("he", "a", 0, 2, 4),
+        KeywordHit("hers", "b", 1, 2, 6),
+    )
+    assert scanner.scan("nothing here") == (KeywordHit("he", "a", 0, 8, 10),)
+    assert scanner.scan("") == ()
+
+
+def test_keyword_in_several_categories():
+    """One keyword can belong to several tables; rank is per table"""
+    scanner = KeywordScanner([("rm", "deny"), ("sudo", "deny"), ("sudo", "danger")])
+
+    hits = scanner.scan("sudo rm")
+    assert [(h.keyword, h.category, h.rank) for h in hits] == [
+        ("sudo", "deny", 1), ("sudo", "danger", 0), ("rm", "deny", 0),
+    ]
+    assert scanner.first("sudo rm", "deny").keyword == "rm"  # First listed, not first seen
+    assert scanner.categories("sudo rm") == ["deny", "danger"]
+    assert scanner.first("sudo rm", "gate:deploy") is None
+    assert scanner.first("pseudo --norm", "deny") is not None
+    assert scanner.first("pseudo --norm", "deny", whole_words=True) is None
+
+
+def test_shared_scanner_built_once_per_rule_version():
+    """All call sites use one scanner compiled from the current rule snapshot"""
+    scanner = get_keyword_scanner()
+    assert scanner is get_rules().derived("keyword_scanner", None)
+
+    runner.check_denylist("sudo ls")
+    runner.detect_approval_gates("deploy to production")
+    mock.get_cody_pre_audit("Description: deploy\n\nPlan: ...")
+    assert get_keyword_scanner() is scanner
+
+
+def test_call_sites_report_first_listed_keyword():
+    """Reasons keep naming the first keyword of each table's order"""
+    assert runner.check_denylist("sudo rm file") == (True, "Denied keyword detected: 'rm'")
+    assert runner.detect_approval_gates("Publish the DB migration and expose it") == ["deploy", "database", "external"]
+
+    result = mock.get_cody_pre_audit("Description: rm old files, then deploy\n\nPlan: sudo")
+    assert result["approved"] is False
+    assert "'deploy'" in result["reason"]
+    assert mock.get_cody_pre_audit("Description: run tests\n\nPlan: sudo rm")["approved"] is True
+
+
+def test_scan_memoized_per_text():
+    """The same mission text is scanned once across call sites"""
+    scanner = get_keyword_scanner()
+    text = "Description: delete the public bucket " + keyword_scan.__name__
+    before = scanner.scan.cache_info()
+
+    runner.detect_approval_gates(text)
+    scanner.first(text, keyword_scan.CATEGORY_DANGER)
+    scanner.first(text, keyword_scan.CATEGORY_DENY, whole_words=True)
+
+    after = scanner.scan.cache_info()
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 2
@@ -0,0 +1,124 @@
+"""
+Tests for mission push events (event bus + GET /missions/{id}/events)
+"""
+import asyncio
+import json
+import pytest
+from fastapi.testclient import TestClient
+from ajson import db, orchestrator
+from ajson.app import app, _mission_event_stream
+from ajson.events import get_event_bus
+from ajson.models import MissionStatus
+
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def events_db(tmp_path, monkeypatch):
+    """Point ajson.db at a fresh file database"""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "events.db"))
+    yield db
+    db.close_connections()
+
+
+def _parse_sse(chunks):
+    """Parse SSE text into [(event_type, data)]"""
+    events = []
+    for block in "".join(chunks).split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_events_published_after_commit_only(events_db):
+    """Writes inside transaction() publish on commit; rollback publishes nothing"""
+    mission_id = db.create_mission("Events", "commit")
+
+    async def scenario():
+        bus = get_event_bus()
+        sub = bus.subscribe(mission_id)
+        try:
+            def committed():
+                with db.transaction():
+                    db.create_step(mission_id, "jarvis", "in")
+                    assert sub.queue.empty()
+                    db.update_mission_status(mission_id, MissionStatus.PLANNED)
+
+            def rolled_back():
+                with pytest.raises(RuntimeError):
+                    with db.transaction():
+                        db.update_mission_status(mission_id, MissionStatus.ERROR)
+                        raise RuntimeError("abort")
+
+            await asyncio.to_thread(committed)
+            await asyncio.to_thread(rolled_back)
+            await asyncio.sleep(0)
+
+            received = []
+            while not sub.queue.empty():
+                received.append(sub.queue.get_nowait())
+            return received
+        finally:
+            bus.unsubscribe(sub)
+
+    received = asyncio.run(scenario())
+    assert [e["type"] for e in received] == ["step", "mission_status"]
+    assert received[1]["data"]["status"] == MissionStatus.PLANNED
+
+
+def test_live_stream_follows_mission_to_done(events_db):
+    """Stream starts with a snapshot and emits every transition until DONE"""
+    mission_id = db.create_mission("Events", "Run pytest tests")
+
+    async def scenario():
+        bus = get_event_bus()
+        sub = bus.subscribe(mission_id)
+        snapshot = db.get_mission_snapshot(mission_id, include_content=False)
+
+        def drive():
+            while db.get_mission(mission_id)["status"] != MissionStatus.DONE:
+                orchestrator.execute_mission(mission_id)
+
+        chunks = []
+        runner = asyncio.create_task(asyncio.to_thread(drive))
+        async for chunk in _mission_event_stream(mission_id, sub, snapshot):
+            chunks.append(chunk)
+        await runner
+        return chunks, bus.has_subscribers(mission_id)
+
+    chunks, still_subscribed = asyncio.run(scenario())
+    events = _parse_sse(chunks)
+
+    assert events[0][0] == "snapshot"
+    statuses = [data["status"] for kind, data in events if kind == "mission_status"]
+    assert statuses == [
+        MissionStatus.PLANNED, MissionStatus.PRE_AUDIT, MissionStatus.EXECUTE,
+        MissionStatus.POST_AUDIT, MissionStatus.FINALIZE, MissionStatus.DONE,
+    ]
+    assert {"step", "step_updated", "artifact"} <= {kind for kind, _ in events}
+    assert not still_subscribed
+
+
+def test_stream_for_finished_mission_sends_snapshot_and_ends(events_db):
+    """A DONE mission's stream is just the snapshot"""
+    mission_id = db.create_mission("Events", "Run pytest tests")
+    while db.get_mission(mission_id)["status"] != MissionStatus.DONE:
+        orchestrator.execute_mission(mission_id)
+
+    response = client.get(f"/missions/{mission_id}/events")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse([response.text])
+    assert [kind for kind, _ in events] == ["snapshot"]
+    assert events[0][1]["mission"]["status"] == MissionStatus.DONE
+    assert not get_event_bus().has_subscribers(mission_id)
+
+
+def test_stream_unknown_mission_404(events_db):
+    """Unknown mission is a 404 and leaves no subscription behind"""
+    response = client.get("/missions/99999/events")
+    assert response.status_code == 404
+    assert not get_event_bus().has_subscribers(99999)
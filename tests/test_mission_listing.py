@@ -0,0 +1,97 @@
+"""
+Tests for cursor-paginated mission listing (GET /missions)
+"""
+import pytest
+from fastapi.testclient import TestClient
+from ajson import db
+from ajson.app import app
+from ajson.models import MissionStatus
+
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def listing_db(tmp_path, monkeypatch):
+    """Fresh database with 25 missions spread over three days"""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "listing.db"))
+    conn = db.get_connection()
+    for i in range(25):
+        mission_id = db.create_mission(f"Mission {i}", "x" * 1000)
+        # Several missions share a timestamp to exercise the id tiebreaker
+        conn.execute(
+            "UPDATE missions SET created_at = ?, status = ? WHERE id = ?",
+            (f"2026-01-0{1 + i // 10} 12:00:0{i % 3}",
+             MissionStatus.DONE if i % 2 else MissionStatus.CREATED,
+             mission_id)
+        )
+    conn.commit()
+    yield db
+    db.close_connections()
+
+
+def _all_pages(**params):
+    ids, cursor, pages = [], None, 0
+    while True:
+        query = dict(params, limit=7)
+        if cursor:
+            query["cursor"] = cursor
+        data = client.get("/missions", params=query).json()
+        ids.extend(m["id"] for m in data["missions"])
+        pages += 1
+        cursor = data["next_cursor"]
+        if not cursor:
+            return ids, pages
+
+
+def test_pages_cover_all_missions_newest_first(listing_db):
+    """Walking every page returns each mission once in (created_at, id) DESC order"""
+    ids, pages = _all_pages()
+
+    expected = [r[0] for r in db.get_connection().execute(
+        "SELECT id FROM missions ORDER BY created_at DESC, id DESC"
+    ).fetchall()]
+    assert ids == expected
+    assert pages == 4
+
+
+def test_listing_returns_summary_columns_only(listing_db):
+    """Large fields such as description are not part of the listing"""
+    mission = client.get("/missions", params={"limit": 1}).json()["missions"][0]
+    assert set(mission) == set(db.MISSION_LIST_COLUMNS)
+
+
+def test_filter_by_status(listing_db):
+    """status filter composes with pagination"""
+    ids, _ = _all_pages(status=MissionStatus.DONE)
+    assert len(ids) == 12
+    assert all(db.get_mission(i)["status"] == MissionStatus.DONE for i in ids)
+
+
+def test_filter_by_date_range(listing_db):
+    """created_after is inclusive, created_before exclusive"""
+    ids, _ = _all_pages(created_after="2026-01-02T00:00:00", created_before="2026-01-03T00:00:00")
+    assert len(ids) == 10
+    assert all(db.get_mission(i)["created_at"].startswith("2026-01-02") for i in ids)
+
+
+def test_invalid_cursor_rejected(listing_db):
+    """Malformed cursor is a 400"""
+    response = client.get("/missions", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_listing_is_index_backed(listing_db):
+    """Keyset page query is an index range scan without a sort step"""
+    cursor = db.encode_mission_cursor("2026-01-02 12:00:00", 15)
+    created_at, mission_id = db.decode_mission_cursor(cursor)
+    for where, params in [
+        ("WHERE (created_at, id) < (?, ?)", (created_at, mission_id)),
+        ("WHERE status = ? AND (created_at, id) < (?, ?)", (MissionStatus.DONE, created_at, mission_id)),
+    ]:
+        plan = " | ".join(r[3] for r in db.get_connection().execute(
+            f"EXPLAIN QUERY PLAN SELECT id FROM missions {where} ORDER BY created_at DESC, id DESC LIMIT 8",
+            params
+        ).fetchall())
+        assert "idx_missions_" in plan
+        assert "TEMP B-TREE" not in plan
@@ -0,0 +1,137 @@
+"""
+Tests for the durable mission job queue (db.mission_jobs)
+"""
+import pytest
+from ajson import db
+from ajson.models import MissionStatus
+
+
+@pytest.fixture
+def queue_db(tmp_path, monkeypatch):
+    """Point ajson.db at a fresh file database"""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "queue.db"))
+    yield db
+    db.close_connections()
+
+
+def test_enqueue_is_idempotent_while_queued(queue_db):
+    """Enqueueing a mission twice yields one queued job"""
+    mission_id = db.create_mission("Queue", "enqueue")
+
+    first = db.enqueue_mission_job(mission_id)
+    assert db.enqueue_mission_job(mission_id) == first
+    assert db.count_mission_jobs(db.JOB_QUEUED) == 1
+
+
+def test_claim_heartbeat_ack(queue_db):
+    """A claimed job is held by its worker until acked"""
+    mission_id = db.create_mission("Queue", "claim")
+    job_id = db.enqueue_mission_job(mission_id)
+
+    job = db.claim_mission_job("w1", now=100.0)
+    assert job["id"] == job_id and job["claimed_by"] == "w1" and job["attempts"] == 1
+    assert db.claim_mission_job("w2") is None
+
+    assert db.heartbeat_mission_jobs("w1", [job_id], now=200.0) == 1
+    assert db.heartbeat_mission_jobs("w2", [job_id]) == 0
+    assert not db.ack_mission_job(job_id, "w2")
+    assert db.ack_mission_job(job_id, "w1")
+    assert db.count_mission_jobs() == 0
+
+
+def test_claim_is_oldest_first(queue_db):
+    """Jobs are claimed in FIFO order"""
+    first, second = (db.create_mission("Queue", str(i)) for i in range(2))
+    db.enqueue_mission_job(first)
+    db.enqueue_mission_job(second)
+
+    assert db.claim_mission_job("w1")["mission_id"] == first
+    assert db.claim_mission_job("w1")["mission_id"] == second
+
+
+def test_one_claim_per_mission(queue_db):
+    """A re-enqueued running mission waits until the running job is acked"""
+    mission_id = db.create_mission("Queue", "rerun")
+    db.enqueue_mission_job(mission_id)
+    job = db.claim_mission_job("w1")
+
+    rerun_id = db.enqueue_mission_job(mission_id)
+    assert rerun_id != job["id"]
+    assert db.claim_mission_job("w2") is None
+
+    db.ack_mission_job(job["id"], "w1")
+    assert db.claim_mission_job("w2")["id"] == rerun_id
+
+
+def test_claim_for_specific_mission(queue_db):
+    """mission_id filter claims only that mission's job"""
+    first, second = (db.create_mission("Queue", str(i)) for i in range(2))
+    db.enqueue_mission_job(first)
+    db.enqueue_mission_job(second)
+
+    assert db.claim_mission_job("w1", mission_id=second)["mission_id"] == second
+
+
+def test_stale_claims_requeued(queue_db):
+    """Claims without a recent heartbeat go back to the queue"""
+    fresh, stale = (db.create_mission("Queue", str(i)) for i in range(2))
+    db.enqueue_mission_job(fresh)
+    db.enqueue_mission_job(stale)
+    db.claim_mission_job("alive", mission_id=fresh, now=1000.0)
+    db.claim_mission_job("dead", mission_id=stale, now=900.0)
+
+    counts = db.requeue_stale_mission_jobs(stale_after=60, max_attempts=3, now=1000.0)
+
+    assert counts == {"requeued": 1, "dropped": 0, "failed": 0}
+    job = db.claim_mission_job("new")
+    assert job["mission_id"] == stale and job["attempts"] == 2
+
+
+def test_stale_claim_dropped_when_rerun_queued(queue_db):
+    """A stale claim is dropped if the mission already has a queued job"""
+    mission_id = db.create_mission("Queue", "dup")
+    db.enqueue_mission_job(mission_id)
+    db.claim_mission_job("dead", now=0.0)
+    db.enqueue_mission_job(mission_id)
+
+    counts = db.requeue_stale_mission_jobs(stale_after=60, max_attempts=3, now=1000.0)
+
+    assert counts["dropped"] == 1
+    assert db.count_mission_jobs() == db.count_mission_jobs(db.JOB_QUEUED) == 1
+
+
+def test_poison_job_marks_mission_error(queue_db):
+    """A job that exhausts its attempts fails the mission instead of looping"""
+    mission_id = db.create_mission("Queue", "poison")
+    db.enqueue_mission_job(mission_id)
+    for attempt in range(3):
+        db.claim_mission_job("dead", now=0.0)
+        counts = db.requeue_stale_mission_jobs(stale_after=60, max_attempts=3, now=1000.0)
+
+    assert counts["failed"] == 1
+    assert db.count_mission_jobs() == 0
+    assert db.get_mission(mission_id)["status"] == MissionStatus.ERROR
+
+
+def test_release_returns_job_to_queue(queue_db):
+    """A worker shutting down hands its job back"""
+    mission_id = db.create_mission("Queue", "release")
+    db.enqueue_mission_job(mission_id)
+    job = db.claim_mission_job("w1")
+
+    assert db.release_mission_job(job["id"], "w1")
+    assert db.claim_mission_job("w2")["id"] == job["id"]
+
+
+def test_orphaned_active_missions_enqueued(queue_db):
+    """Active missions without a job are queued; stopped ones are not"""
+    active = db.create_mission("Queue", "active")
+    db.update_mission_status(active, MissionStatus.EXECUTE)
+    done = db.create_mission("Queue", "done")
+    db.update_mission_status(done, MissionStatus.DONE)
+    queued = db.create_mission("Queue", "queued")
+    db.enqueue_mission_job(queued)
+
+    assert db.enqueue_orphaned_missions() == 1
+    assert db.enqueue_orphaned_missions() == 0
+    assert db.claim_mission_job("w1", mission_id=active) is not None
@@ -0,0 +1,80 @@
+"""
+Tests for the consolidated mission snapshot (GET /missions/{id})
+"""
+import pytest
+from fastapi.testclient import TestClient
+from ajson import db, orchestrator
+from ajson.app import app
+
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def done_mission(tmp_path, monkeypatch):
+    """Fresh database with one mission driven to DONE"""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "snapshot.db"))
+    mission_id = db.create_mission("Snapshot", "Run pytest tests")
+    while db.get_mission(mission_id)["status"] != "DONE":
+        orchestrator.execute_mission(mission_id)
+    yield mission_id
+    db.close_connections()
+
+
+def test_snapshot_matches_individual_queries(done_mission):
+    """Snapshot equals the four separate lookups"""
+    snapshot = db.get_mission_snapshot(done_mission)
+
+    assert snapshot["mission"] == db.get_mission(done_mission)
+    assert snapshot["steps"] == db.get_steps_by_mission(done_mission)
+    assert snapshot["approvals"] == db.get_pending_approvals(done_mission)
+    assert snapshot["artifacts"] == db.get_artifacts_by_mission(done_mission)
+
+
+def test_snapshot_single_read_transaction(done_mission):
+    """All reads run inside one BEGIN ... COMMIT"""
+    statements = []
+    conn = db.get_connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        db.get_mission_snapshot(done_mission)
+    finally:
+        conn.set_trace_callback(None)
+
+    assert statements[0] == "BEGIN"
+    assert statements[-1] == "COMMIT"
+    assert sum(1 for s in statements if s.startswith("SELECT")) == 4
+
+
+def test_snapshot_missing_mission(done_mission):
+    """Unknown mission returns None"""
+    assert db.get_mission_snapshot(99999) is None
+
+
+def test_light_snapshot_omits_large_fields(done_mission):
+    """include_content=false drops step input/output and artifact content"""
+    data = client.get(f"/missions/{done_mission}", params={"include_content": "false"}).json()
+
+    assert data["steps"] and data["artifacts"]
+    assert all(set(s) == set(db.STEP_SUMMARY_COLUMNS) for s in data["steps"])
+    assert all(set(a) == set(db.ARTIFACT_SUMMARY_COLUMNS) for a in data["artifacts"])
+
+
+def test_large_fields_fetched_separately(done_mission):
+    """Step and artifact detail endpoints return the full rows"""
+    data = client.get(f"/missions/{done_mission}", params={"include_content": "false"}).json()
+    step_id = data["steps"][0]["id"]
+    artifact_id = data["artifacts"][0]["id"]
+
+    step = client.get(f"/missions/{done_mission}/steps/{step_id}").json()
+    assert step["output_data"] == db.get_step(step_id)["output_data"]
+
+    artifact = client.get(f"/missions/{done_mission}/artifacts/{artifact_id}").json()
+    assert artifact["content"].startswith("# Mission Plan")
+
+
+def test_detail_endpoints_scoped_to_mission(done_mission):
+    """A step/artifact of another mission is a 404"""
+    step_id = db.get_steps_by_mission(done_mission)[0]["id"]
+    assert client.get(f"/missions/{done_mission + 1}/steps/{step_id}").status_code == 404
+    assert client.get(f"/missions/{done_mission}/artifacts/99999").status_code == 404
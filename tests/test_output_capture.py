@@ -0,0 +1,105 @@
+"""
+Tests for streaming, size-capped tool output capture (ajson/tools/output_capture.py)
+"""
+import subprocess
+import sys
+import pytest
+from ajson import db, orchestrator
+from ajson.models import MissionStatus
+from ajson.tools import exec_pool, output_capture, runner
+from ajson.tools.output_capture import StreamCapture, run_streaming
+
+
+@pytest.fixture
+def small_caps(tmp_path, monkeypatch):
+    """10-byte head and tail, spill files under tmp_path"""
+    spill_dir = tmp_path / "spill"
+    monkeypatch.setattr(output_capture, "TOOL_OUTPUT_HEAD_BYTES", 10)
+    monkeypatch.setattr(output_capture, "TOOL_OUTPUT_TAIL_BYTES", 10)
+    monkeypatch.setattr(output_capture, "TOOL_OUTPUT_DIR", str(spill_dir))
+    monkeypatch.setattr(runner, "run_streaming", lambda *a, **kw: run_streaming(
+        *a, head_bytes=10, tail_bytes=10, spill_dir=str(spill_dir), **kw
+    ))
+    return spill_dir
+
+
+def test_stream_capture_keeps_head_and_tail(tmp_path):
+    """Small output is kept whole; large output keeps head + tail and spills all"""
+    capture = StreamCapture("stdout", head_bytes=4, tail_bytes=4, spill_dir=str(tmp_path))
+    capture.write(b"abcdefgh")
+    assert not capture.truncated and capture.text() == "abcdefgh" and capture.spill_path is None
+
+    for chunk in (b"ij", b"klmnopqrstuvwxyz" * 10, b"0123"):
+        capture.write(chunk)
+    capture.close()
+
+    assert capture.truncated and capture.total_bytes == 174
+    assert capture.text() == f"abcd\n... [166 bytes omitted; full stdout: {capture.spill_path}] ...\n0123"
+    with open(capture.spill_path, "rb") as f:
+        assert f.read() == b"abcdefghij" + b"klmnopqrstuvwxyz" * 10 + b"0123"
+
+
+def test_run_streaming_matches_subprocess_run(tmp_path):
+    """Same stdout/stderr/returncode as capture_output=True, text=True"""
+    script = "import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"
+    expected = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+
+    result = run_streaming([sys.executable, "-c", script], shell=False, cwd=str(tmp_path), timeout=10)
+
+    assert (result.returncode, result.stdout, result.stderr) == (3, expected.stdout, expected.stderr)
+    assert result.output_bytes == 8 and result.stdout_path is None
+
+
+def test_run_streaming_live_chunks_and_timeout(tmp_path):
+    """Chunks reach the listener while the command runs; timeouts kill it"""
+    chunks = []
+    script = "import time\nfor i in range(3):\n    print(i, flush=True); time.sleep(0.3)"
+    run_streaming([sys.executable, "-c", script], shell=False, cwd=str(tmp_path), timeout=10,
+                  on_chunk=lambda stream, text: chunks.append((stream, text)))
+
+    assert "".join(text for _, text in chunks) == "0\n1\n2\n"
+    assert len(chunks) >= 2  # Not one chunk at exit
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_streaming("sleep 5", shell=True, cwd=str(tmp_path), timeout=0.3)
+
+
+@pytest.mark.parametrize("pooled", [False, True])
+def test_run_tool_caps_output(small_caps, tmp_path, monkeypatch, pooled):
+    """run_tool stores a capped result and records the spill file"""
+    monkeypatch.setattr(exec_pool, "TOOL_EXEC_POOL", pooled)
+    chunks = []
+    (tmp_path / "big.py").write_text("print('x' * 100)")
+
+    run = runner.run_tool_captured(
+        "python3 big.py", str(tmp_path),
+        on_output=lambda stream, text: chunks.append(text)
+    )
+    exec_pool.shutdown_exec_pool()
+
+    assert run.success and run.output_bytes == 101
+    assert run.result.startswith("xxxxxxxxxx\n... [81 bytes omitted; full stdout: ")
+    assert run.result.endswith("xxxxxxxxx\n")
+    assert run.stdout_path.startswith(str(small_caps)) and run.stderr_path is None
+    with open(run.stdout_path) as f:
+        assert f.read() == "x" * 100 + "\n"
+    assert "".join(chunks) == "x" * 100 + "\n"
+
+
+def test_execute_transition_records_capture(tmp_path, monkeypatch):
+    """The EXECUTE step stores the tool run with its output size"""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "capture.db"))
+    monkeypatch.setattr(runner, "WORK_DIR", str(tmp_path / "ws"))
+    db.init_db()
+    try:
+        mission_id = db.create_mission("Run tests", "Run the test suite")
+        db.update_mission_status(mission_id, MissionStatus.PRE_AUDIT)
+
+        assert orchestrator.advance_mission(db.get_mission(mission_id)) == MissionStatus.EXECUTE
+
+        (tool_run,) = db.get_tool_runs_by_mission(mission_id)
+        assert tool_run["result"] == "Mock test execution: All tests passed\n"
+        assert tool_run["output_bytes"] == len(tool_run["result"])
+        assert tool_run["stdout_path"] is None
+    finally:
+        db.close_connections()
@@ -0,0 +1,94 @@
+"""
+Tests for the compiled, memoized ApprovalPolicy engine
+"""
+import pytest
+from ajson.hands import policy as policy_module
+from ajson.hands.policy import ApprovalPolicy, OperationCategory, PolicyDecision
+from ajson.hands.runner import ToolRunner
+
+
+@pytest.mark.parametrize("operation,dry_run,expected", [
+    ("ls", True, (PolicyDecision.ALLOW, OperationCategory.READONLY, "Allowed: matches allowlist")),
+    ("LS\t-la", False, (PolicyDecision.ALLOW, OperationCategory.READONLY, "Allowed: matches allowlist")),
+    ("lsblk", True, (PolicyDecision.DRY_RUN_ONLY, OperationCategory.UNKNOWN, "Unknown operation: DRY_RUN only")),
+    ("git status && git merge x", False, (PolicyDecision.ALLOW, OperationCategory.READONLY, "Allowed: matches allowlist")),
+    ("echo https://x", False, (PolicyDecision.DENY, OperationCategory.NETWORK, "Denied: network operation")),
+    ("docker rm x && rm -rf /", True, (PolicyDecision.DENY, OperationCategory.DESTRUCTIVE, "Destructive: matches denylist pattern 'rm -rf'")),
+    ("sudo git reset --hard", True, (PolicyDecision.DENY, OperationCategory.IRREVERSIBLE, "Denied: matches denylist pattern 'git reset --hard'")),
+    ("rm   -rf build", False, (PolicyDecision.REQUIRE_APPROVAL, OperationCategory.DESTRUCTIVE, "Destructive: requires approval")),
+    ("Gemini.Generate()", True, (PolicyDecision.DRY_RUN_ONLY, OperationCategory.PAID, "Paid API: simulation only in DRY_RUN")),
+    ("npm   publish", False, (PolicyDecision.REQUIRE_APPROVAL, OperationCategory.IRREVERSIBLE, "Irreversible: requires approval")),
+    ("make", False, (PolicyDecision.REQUIRE_APPROVAL, OperationCategory.UNKNOWN, "Unknown operation: requires approval")),
+])
+def test_decisions_follow_priority_order(operation, dry_run, expected):
+    """Compiled categories keep the allowlist > network > denylist > ... priority"""
+    assert ApprovalPolicy.evaluate(operation, dry_run=dry_run) == expected
+
+
+def test_evaluate_is_memoized():
+    """Repeated operation strings are served from the cache"""
+    compiled = ApprovalPolicy._compiled()
+    before = compiled.evaluate.cache_info()
+
+    for _ in range(3):
+        ApprovalPolicy.evaluate("make memoized-target", dry_run=False)
+
+    after = compiled.evaluate.cache_info()
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 2
+
+
+def test_subclass_rules_compiled_separately():
+    """A subclass with its own lists gets its own compiled rules"""
+    class StrictPolicy(ApprovalPolicy):
+        ALLOWLIST = ["echo"]
+
+    assert StrictPolicy.evaluate("echo hi")[0] == PolicyDecision.ALLOW
+    assert StrictPolicy.evaluate("ls")[0] == PolicyDecision.DRY_RUN_ONLY
+    assert ApprovalPolicy.evaluate("echo hi")[0] == PolicyDecision.DRY_RUN_ONLY
+
+
+def test_recompile_picks_up_edited_rules():
+    """recompile() rebuilds the regexes and drops memoized decisions"""
+    class EditablePolicy(ApprovalPolicy):
+        IRREVERSIBLE_PATTERNS = []
+
+    assert EditablePolicy.evaluate("npm publish")[1] == OperationCategory.UNKNOWN
+    EditablePolicy.IRREVERSIBLE_PATTERNS = [r"npm\s+publish"]
+    EditablePolicy.recompile()
+    assert EditablePolicy.evaluate("npm publish")[1] == OperationCategory.IRREVERSIBLE
+
+
+def test_execute_tool_evaluates_once(monkeypatch):
+    """execute_tool derives the legacy approval fields from its single evaluation"""
+    calls = []
+    evaluate = ApprovalPolicy.evaluate.__func__
+
+    def counting(cls, operation, dry_run=True):
+        calls.append(operation)
+        return evaluate(cls, operation, dry_run)
+
+    monkeypatch.setattr(ApprovalPolicy, "evaluate", classmethod(counting))
+
+    result = ToolRunner(dry_run=True).execute_tool("rm", {"-rf": "/tmp/x"})
+
+    assert len(calls) == 1
+    assert result["status"] == "blocked" and result["requires_approval"] is False
+
+
+def test_denylist_case_fold_matches_baseline():
+    """A case fold that only IGNORECASE sees ("ſ" ~ "s") is not a denylist hit"""
+    decision, category, _ = ApprovalPolicy.evaluate("git reſet --hard", dry_run=False)
+    assert (decision, category) == (PolicyDecision.REQUIRE_APPROVAL, OperationCategory.DESTRUCTIVE)
+    decision, _, reason = ApprovalPolicy.evaluate("GIT RESET --HARD", dry_run=False)
+    assert decision == PolicyDecision.DENY and "'git reset --hard'" in reason
+
+
+def test_override_detection_is_off_the_hot_path(monkeypatch):
+    """evaluate() does not re-inspect the class for overrides on each call"""
+    ApprovalPolicy.evaluate("ls -la")
+    def getattr_static(*args):
+        raise AssertionError("class inspected per call")
+
+    monkeypatch.setattr(policy_module.inspect, "getattr_static", getattr_static)
+    assert ApprovalPolicy.evaluate("ls -la")[0] == PolicyDecision.ALLOW
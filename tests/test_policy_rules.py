@@ -0,0 +1,117 @@
+"""
+Tests for the shared, hot-reloadable policy rule file (ajson/policy_rules.py)
+"""
+import json
+import logging
+import os
+import pytest
+from ajson import policy_rules
+from ajson.hands.policy import ApprovalPolicy, OperationCategory
+from ajson.policy_rules import PolicyRulesError, RuleFile, RuleSet
+from ajson.tools import runner
+
+
+with open(policy_rules.RULES_PATH) as f:
+    SHIPPED_RULES = json.load(f)
+
+
+def _write(path, data):
+    """Write rules and bump mtime so the change is seen within the same tick"""
+    path.write_text(json.dumps(data))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def rule_file(tmp_path, monkeypatch):
+    """A private copy of the shipped rules, checked for changes on every call"""
+    path = tmp_path / "policy_rules.json"
+    _write(path, SHIPPED_RULES)
+    rule_file = RuleFile(str(path), check_interval=0)
+    monkeypatch.setattr(policy_rules, "_rule_file", rule_file)
+    return path
+
+
+def _edited(section, key, values):
+    data = json.loads(json.dumps(SHIPPED_RULES))
+    data[section][key] = values
+    return data
+
+
+def test_engines_share_one_snapshot():
+    """Both policy engines read their lists from the same compiled rule set"""
+    rules = policy_rules.get_rules()
+
+    assert runner.DENYLIST is rules.tools["denylist"]
+    assert ApprovalPolicy.ALLOWLIST is rules.hands["allowlist"]
+    assert ApprovalPolicy._compiled() is rules.derived("hands.policy", None)
+
+
+def test_reload_on_file_change(rule_file):
+    """Edits apply to both engines without a restart"""
+    assert ApprovalPolicy.evaluate("npm publish")[1] == OperationCategory.IRREVERSIBLE
+    assert runner.check_denylist("echo hi") == (False, None)
+
+    data = _edited("hands", "irreversible_patterns", [])
+    data["tools"]["denylist"].append("echo")
+    _write(rule_file, data)
+
+    assert ApprovalPolicy.evaluate("npm publish")[1] == OperationCategory.UNKNOWN
+    assert runner.check_denylist("echo hi") == (True, "Denied keyword detected: 'echo'")
+
+
+def test_inflight_snapshot_unaffected_by_reload(rule_file):
+    """A snapshot taken before a reload keeps evaluating with its own rules"""
+    before = policy_rules.get_rules()
+    _write(rule_file, _edited("tools", "denylist", ["echo"]))
+    after = policy_rules.get_rules()
+
+    assert after is not before
+    assert before.tools_deny.search("sudo ls") and not before.tools_deny.search("echo")
+    assert after.tools_deny.search("echo") and not after.tools_deny.search("sudo ls")
+
+
+def test_one_compile_per_change(rule_file, monkeypatch):
+    """Unchanged or previously seen content reuses its compiled snapshot"""
+    compiles = []
+    from_bytes = RuleSet.from_bytes.__func__
+    monkeypatch.setattr(RuleSet, "from_bytes", classmethod(lambda cls, raw: compiles.append(1) or from_bytes(cls, raw)))
+    original = policy_rules.get_rules()
+
+    _write(rule_file, SHIPPED_RULES)  # Touched, same content
+    assert policy_rules.get_rules() is original
+
+    _write(rule_file, _edited("tools", "allowlist", ["echo"]))
+    edited = policy_rules.get_rules()
+    for _ in range(3):
+        ApprovalPolicy.evaluate("ls")
+    assert edited is not original and len(compiles) == 1
+    assert edited.derived("hands.policy", None) is ApprovalPolicy._compiled()
+
+    _write(rule_file, SHIPPED_RULES)  # Reverted
+    assert policy_rules.get_rules() is original and len(compiles) == 1
+
+
+def test_invalid_file_keeps_previous_rules(rule_file, caplog):
+    """A broken edit is logged and ignored"""
+    original = policy_rules.get_rules()
+
+    rule_file.write_text("{not json")
+    with caplog.at_level(logging.ERROR, logger="ajson.policy_rules"):
+        assert policy_rules.get_rules() is original
+    assert "Keeping previous policy rules" in caplog.text
+
+    _write(rule_file, _edited("hands", "network_patterns", ["(unclosed"]))
+    assert policy_rules.get_rules() is original
+
+
+@pytest.mark.parametrize("data,message", [
+    ({"tools": {"denylist": [], "allowlist": []}}, "Missing rule section 'hands'"),
+    (_edited("tools", "denylist", "rm"), "must be a list of strings"),
+    (_edited("hands", "paid_api_patterns", ["[bad"]), "Invalid pattern"),
+    (_edited("keywords", "approval_gates", ["deploy"]), "must map names to lists of strings"),
+])
+def test_rule_validation(data, message):
+    """Malformed rule data is rejected with a clear error"""
+    with pytest.raises(PolicyRulesError, match=message):
+        RuleSet(data)
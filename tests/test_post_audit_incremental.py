@@ -0,0 +1,101 @@
+"""
+Tests for the incremental (windowed, checkpointed) post-audit
+"""
+import pytest
+from ajson import db, orchestrator
+from ajson.models import MissionStatus, StepStatus
+from ajson.roles import cody
+
+
+@pytest.fixture
+def audit_db(tmp_path, monkeypatch):
+    """Point ajson.db at a fresh file database"""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "audit.db"))
+    yield db
+    db.close_connections()
+
+
+def _runs(*results):
+    return [{"id": i + 1, "command": "echo", "result": r} for i, r in enumerate(results)]
+
+
+def _add_runs(mission_id, *results):
+    step_id = db.create_step(mission_id, "ants_worker", "extra", StepStatus.COMPLETED)
+    return [db.create_tool_run(step_id, "echo", result) for result in results]
+
+
+def test_windows_bounded_by_runs_and_chars():
+    """Windows respect both bounds and never split a run"""
+    runs = _runs("a", "b", "c", "x" * 100, "d")
+
+    assert [len(w) for w in cody.iter_audit_windows(runs, max_runs=2, max_chars=10_000)] == [2, 2, 1]
+    assert [len(w) for w in cody.iter_audit_windows(runs, max_runs=10, max_chars=50)] == [3, 1, 1]
+
+
+def test_scan_stops_at_first_rejection():
+    """The running verdict short-circuits: later runs are not consumed"""
+    consumed = []
+
+    def stream():
+        for run in _runs("ok", "BLOCKED", "ok", "ok"):
+            consumed.append(run["id"])
+            yield run
+
+    verdict = cody.post_audit_incremental(stream(), max_runs=1)
+
+    assert not verdict["approved"]
+    assert verdict["last_tool_run_id"] == 2 and verdict["runs_audited"] == 2
+    assert consumed == [1, 2, 3]  # Third run only peeked to close the window
+
+
+def test_empty_stream_is_approved():
+    """Nothing to audit passes"""
+    verdict = cody.post_audit_incremental(iter(()))
+    assert verdict["approved"] and verdict["runs_audited"] == 0 and verdict["last_tool_run_id"] is None
+
+
+def test_iter_tool_runs_pages(audit_db):
+    """Paged iteration returns every run after the checkpoint, in order"""
+    mission_id = db.create_mission("Audit", "pages")
+    run_ids = _add_runs(mission_id, *"abcde")
+
+    assert [r["id"] for r in db.iter_tool_runs_by_mission(mission_id, page_size=2)] == run_ids
+    assert [r["id"] for r in db.iter_tool_runs_by_mission(mission_id, after_id=run_ids[2], page_size=2)] == run_ids[3:]
+
+
+def test_post_audit_persists_verdict_checkpoint(audit_db):
+    """The post-audit step records its verdict and last audited run"""
+    mission_id = db.create_mission("Audit", "Run pytest tests")
+    while db.get_mission(mission_id)["status"] != MissionStatus.POST_AUDIT:
+        orchestrator.execute_mission(mission_id)
+
+    verdict = db.get_latest_audit_verdict(mission_id)
+    runs = db.get_tool_runs_by_mission(mission_id)
+    step = db.get_step(verdict["step_id"])
+    assert verdict["approved"] and verdict["runs_audited"] == len(runs) == 1
+    assert verdict["last_tool_run_id"] == runs[-1]["id"]
+    assert step["role"] == "cody_post_audit"
+
+
+def test_reaudit_only_scans_new_runs(audit_db):
+    """A second post-audit starts after the checkpoint and gates on new runs"""
+    mission_id = db.create_mission("Audit", "Run pytest tests")
+    while db.get_mission(mission_id)["status"] != MissionStatus.POST_AUDIT:
+        orchestrator.execute_mission(mission_id)
+    first = db.get_latest_audit_verdict(mission_id)
+
+    new_ids = _add_runs(mission_id, "fine", "BLOCKED: rm")
+    db.update_mission_status(mission_id, MissionStatus.EXECUTE)
+    assert orchestrator.execute_mission(mission_id) == MissionStatus.PENDING_APPROVAL
+
+    second = db.get_latest_audit_verdict(mission_id)
+    assert second["id"] != first["id"]
+    assert second["runs_audited"] == 2
+    assert second["last_tool_run_id"] == new_ids[-1]
+    assert not second["approved"] and second["gate_type"] == "execution_error"
+
+    # Nothing new since: the next re-audit scans no runs and passes
+    db.update_mission_status(mission_id, MissionStatus.EXECUTE)
+    assert orchestrator.execute_mission(mission_id) == MissionStatus.POST_AUDIT
+    third = db.get_latest_audit_verdict(mission_id)
+    assert third["runs_audited"] == 0 and third["last_tool_run_id"] == new_ids[-1]
@@ -0,0 +1,122 @@
+"""
+Tests for the read-only result cache (ajson/hands/result_cache.py)
+"""
+import asyncio
+import os
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from ajson.api.execute import router
+from ajson.hands import result_cache
+from ajson.hands.approval import ApprovalDecision, ApprovalStore
+from ajson.hands.policy import OperationCategory
+from ajson.hands.result_cache import ResultCache, workspace_fingerprint
+from ajson.hands.runner import ToolRunner
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    """Fresh global cache with TOOL_RESULT_CACHE=1"""
+    monkeypatch.setattr(result_cache, "TOOL_RESULT_CACHE", True)
+    monkeypatch.setattr(result_cache, "_result_cache", None)
+    yield
+    monkeypatch.setattr(result_cache, "_result_cache", None)
+
+
+def _touch(path, mtime):
+    path.write_text(path.read_text() + "x" if path.exists() else "x")
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_fingerprint_tracks_workspace(tmp_path):
+    """Fingerprint changes with cwd entries, named paths and git state"""
+    (tmp_path / "a.txt").write_text("a")
+    argv = ["cat", "a.txt"]
+    before = workspace_fingerprint(argv, str(tmp_path))
+    assert workspace_fingerprint(argv, str(tmp_path)) == before
+
+    _touch(tmp_path / "a.txt", 1_000_000_000)
+    after_edit = workspace_fingerprint(argv, str(tmp_path))
+    assert after_edit != before
+
+    (tmp_path / "b.txt").write_text("b")
+    after_add = workspace_fingerprint(argv, str(tmp_path))
+    assert after_add != after_edit
+
+    (tmp_path / ".git").mkdir()
+    sub = tmp_path / "src"
+    sub.mkdir()
+    in_repo = workspace_fingerprint(["git", "status"], str(sub))
+    _touch(tmp_path / ".git" / "index", 2_000_000_000)
+    assert workspace_fingerprint(["git", "status"], str(sub)) != in_repo
+
+
+def test_ttl_lru_and_counters(monkeypatch):
+    """Entries expire after the TTL; the least recently used is evicted"""
+    cache = ResultCache(ttl_seconds=60, max_entries=2)
+    cache.put("a", (0, "A", ""))
+    cache.put("b", (0, "B", ""))
+    assert cache.get("a") == (0, "A", "")
+    cache.put("c", (0, "C", ""))  # Evicts b (a was used more recently)
+
+    assert cache.get("b") is None and cache.get("c") == (0, "C", "")
+
+    now = time.monotonic()
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now + 61)
+    assert cache.get("a") is None
+
+    assert cache.stats() == {
+        "entries": 1, "hits": 2, "misses": 2, "expirations": 1, "evictions": 1, "hit_rate": 0.5
+    }
+
+
+def test_disabled_by_default():
+    """Without TOOL_RESULT_CACHE=1 nothing is cached"""
+    assert result_cache.get_result_cache() is None
+    assert ToolRunner._cached_run(["ls"], OperationCategory.READONLY) == (None, None, None)
+
+
+def test_readonly_runs_served_from_cache(enabled, tmp_path):
+    """A repeated probe spawns nothing until the workspace changes"""
+    store = ApprovalStore()
+    request = store.create_request("ls", "readonly", "test")
+    grant = store.approve_request(
+        request.request_id,
+        ApprovalDecision(request_id=request.request_id, decision="approve", reason="Test", scope=["ls"])
+    )
+    tool = ToolRunner(dry_run=False)
+    args = {"path": str(tmp_path)}
+    (tmp_path / "a.txt").write_text("a")
+
+    with patch('ajson.hands.approval.get_approval_store', return_value=store):
+        first = tool.execute_tool_limited(grant.grant_id, "ls", args)
+        with patch("ajson.hands.runner.subprocess.run", side_effect=AssertionError("spawned")), \
+                patch("ajson.hands.runner.run_limited_async", side_effect=AssertionError("spawned")):
+            second = tool.execute_tool_limited(grant.grant_id, "ls", args)
+            third = asyncio.run(tool.execute_tool_limited_async(grant.grant_id, "ls", args))
+
+        (tmp_path / "b.txt").write_text("b")
+        os.utime(tmp_path, ns=(3_000_000_000, 3_000_000_000))  # Coarse fs clocks: force a new dir mtime
+        fourth = asyncio.run(tool.execute_tool_limited_async(grant.grant_id, "ls", args))
+
+    assert "cached" not in first and first["stdout"] == "a.txt\n"
+    assert second["cached"] and third["cached"] and second["stdout"] == third["stdout"] == "a.txt\n"
+    assert "cached" not in fourth and fourth["stdout"] == "a.txt\nb.txt\n"
+    assert result_cache.get_result_cache().stats()["hits"] == 2
+
+    # Only READONLY operations use the cache
+    assert ToolRunner._cached_run(["ls"], OperationCategory.UNKNOWN) == (None, None, None)
+
+
+def test_stats_endpoint(enabled):
+    """GET /api/hands/result_cache exposes the counters"""
+    app = FastAPI()
+    app.include_router(router)
+
+    response = TestClient(app).get("/api/hands/result_cache")
+
+    assert response.json() == {
+        "enabled": True, "entries": 0, "hits": 0, "misses": 0, "expirations": 0, "evictions": 0, "hit_rate": 0.0
+    }
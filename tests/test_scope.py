@@ -0,0 +1,87 @@
+"""
+Tests for the approval grant scope language (ajson/hands/scope.py)
+"""
+import os
+import tempfile
+import pytest
+from ajson.hands.approval import ApprovalDecision, ApprovalStore
+from ajson.hands.approval_sqlite import SQLiteApprovalStore
+from ajson.hands.scope import ScopeMatcher, compile_scope, literal
+
+
+@pytest.mark.parametrize("scope, operation, expected", [
+    (["ls"], "ls", True),
+    (["ls"], "ls -la", True),
+    (["ls"], "LS   -la", True),
+    (["ls"], "lsblk", False),
+    (["ls"], "echo ls", False),  # Prefix, not substring
+    (["git status"], "git status --short", True),
+    (["git status"], "git statusx", False),
+    (["git status"], "git push", False),
+    (["git *"], "git push origin main", True),
+    (["git *"], "gitk", False),
+    (["pytest tests/test_*.py"], "pytest tests/test_api.py", True),
+    (["pytest tests/test_*.py"], "pytest tests/test_api.py -x", False),  # Globs match the whole operation
+    (["cat ?.txt"], "cat a.txt", True),
+    (["*"], "rm -rf /", True),
+    ([], "ls", False),
+    (["", "  "], "ls", False),
+])
+def test_scope_language(scope, operation, expected):
+    """Prefix patterns on word boundaries, whole-operation globs, '*'"""
+    assert compile_scope(scope).matches(operation) is expected
+
+
+def test_large_scope_and_sharing():
+    """Hundreds of patterns; grants with the same scope share one matcher"""
+    scope = [f"tool{i} sub{i}" for i in range(500)] + ["deploy-*"]
+    matcher = compile_scope(scope)
+
+    assert matcher.matches("tool499 sub499 --flag")
+    assert not matcher.matches("tool499 sub1")
+    assert matcher.matches("deploy-staging now")
+    assert compile_scope(list(scope)) is matcher
+    assert isinstance(matcher, ScopeMatcher)
+
+
+def test_both_stores_share_the_scope_language():
+    """The in-memory and SQLite stores give the same verdicts"""
+    scope = ["ls", "git status", "git log *"]
+    operations = ["ls -la", "lsblk", "git status", "git log -n 5", "git push", "rm -rf /"]
+
+    memory = ApprovalStore()
+    request = memory.create_request("ls", "readonly", "test")
+    decision = ApprovalDecision(request_id=request.request_id, decision="approve", reason="Test", scope=scope)
+    memory_grant = memory.approve_request(request.request_id, decision)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sqlite = SQLiteApprovalStore(db_path=os.path.join(tmpdir, "test.db"))
+        try:
+            request = sqlite.create_request("ls", "readonly", "test")
+            sqlite_grant = sqlite.approve_request(request.request_id, decision)
+            sqlite_verdicts = sqlite.verify_grant_batch(sqlite_grant.grant_id, operations)
+        finally:
+            sqlite.close()
+
+    memory_verdicts = memory.verify_grant_batch(memory_grant.grant_id, operations)
+    assert memory_verdicts == sqlite_verdicts == [True, False, True, True, False, False]
+
+
+@pytest.mark.parametrize("operation", ["[ -f setup.py ] && echo ok", "cat data[1].csv", "ls *.py", "echo what?"])
+def test_default_scope_matches_its_own_operation(operation):
+    """A grant without an explicit scope covers the requested operation, glob characters and all"""
+    store = ApprovalStore()
+    request = store.create_request(operation, "readonly", "test")
+    decision = ApprovalDecision(request_id=request.request_id, decision="approve", reason="Test")
+    grant = store.approve_request(request.request_id, decision)
+
+    assert store.verify_grant(grant.grant_id, operation)
+    assert not store.verify_grant(grant.grant_id, "cat data1.csv")
+
+
+def test_literal_pattern():
+    """literal() escapes glob characters instead of matching with them"""
+    matcher = compile_scope([literal("cat data[1].csv")])
+    assert matcher.matches("cat data[1].csv")
+    assert not matcher.matches("cat data1.csv")
+    assert compile_scope([literal("git status")]).matches("git status --short")  # Still a prefix
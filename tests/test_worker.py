@@ -0,0 +1,162 @@
+"""
+Tests for multi-process worker mode (ajson/worker.py, event outbox + relay)
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from ajson import db, engine
+from ajson.app import app
+from ajson.event_relay import MissionEventRelay
+from ajson.events import get_event_bus
+from ajson.models import MissionStatus
+from ajson.worker import _exit_status, run_worker
+
+
+client = TestClient(app)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def worker_db(tmp_path, monkeypatch):
+    """Fresh file database; outbox setting restored afterwards"""
+    path = str(tmp_path / "worker.db")
+    monkeypatch.setattr(db, "DB_PATH", path)
+    monkeypatch.setattr(db, "EVENT_OUTBOX", False)
+    yield path
+    db.close_connections()
+
+
+def _wait_for(predicate, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_api_only_enqueues_in_worker_mode(worker_db, monkeypatch):
+    """POST /missions queues a job and leaves execution to the workers"""
+    monkeypatch.setattr(engine, "ENGINE_MODE", "worker")
+
+    mission_id = client.post("/missions", json={"title": "Queued", "description": "Run pytest tests"}).json()["mission_id"]
+
+    assert db.count_mission_jobs(db.JOB_QUEUED) == 1
+    assert db.get_mission(mission_id)["status"] == MissionStatus.CREATED
+    assert engine._engine is None
+
+
+def test_run_worker_drives_queue_and_writes_outbox(worker_db):
+    """An in-process worker runs queued missions and records their events"""
+    mission_id = db.create_mission("Worker", "Run pytest tests")
+    db.enqueue_mission_job(mission_id)
+    stop = threading.Event()
+    thread = threading.Thread(target=run_worker, kwargs={"concurrency": 2, "stop": stop})
+    thread.start()
+    try:
+        assert _wait_for(lambda: db.get_mission(mission_id)["status"] == MissionStatus.DONE)
+    finally:
+        stop.set()
+        thread.join(timeout=30)
+
+    events = db.get_mission_events_after(0)
+    statuses = [e["data"]["status"] for e in events if e["type"] == "mission_status"]
+    assert statuses[-1] == MissionStatus.DONE
+    assert {"step", "step_updated", "artifact"} <= {e["type"] for e in events}
+
+
+def test_rolled_back_changes_leave_no_outbox_event(worker_db, monkeypatch):
+    """Outbox rows are part of the write's transaction"""
+    monkeypatch.setattr(db, "EVENT_OUTBOX", True)
+    mission_id = db.create_mission("Worker", "rollback")
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.update_mission_status(mission_id, MissionStatus.ERROR)
+            raise RuntimeError("abort")
+
+    assert db.get_mission_events_after(0) == []
+
+
+def test_relay_publishes_outbox_events_to_subscribers(worker_db, monkeypatch):
+    """Events written by another process reach local subscribers"""
+    mission_id = db.create_mission("Worker", "relay")
+    relay = MissionEventRelay()
+    relay._cursor = db.get_latest_mission_event_id()
+
+    async def scenario():
+        bus = get_event_bus()
+        sub = bus.subscribe(mission_id)
+        try:
+            monkeypatch.setattr(db, "EVENT_OUTBOX", True)
+            db.update_mission_status(mission_id, MissionStatus.PLANNED)
+            db.create_step(mission_id, "jarvis", "in")
+            monkeypatch.setattr(db, "EVENT_OUTBOX", False)
+            await asyncio.sleep(0)
+            while not sub.queue.empty():
+                sub.queue.get_nowait()  # Drop the local copies
+
+            assert relay.poll() == 2
+            await asyncio.sleep(0)
+            return [sub.queue.get_nowait()["type"] for _ in range(sub.queue.qsize())]
+        finally:
+            bus.unsubscribe(sub)
+
+    assert asyncio.run(scenario()) == ["mission_status", "step"]
+    assert relay.poll() == 0
+
+
+def test_prune_mission_events(worker_db, monkeypatch):
+    """Old outbox events are pruned"""
+    monkeypatch.setattr(db, "EVENT_OUTBOX", True)
+    mission_id = db.create_mission("Worker", "prune")
+    db.update_mission_status(mission_id, MissionStatus.PLANNED)
+
+    assert db.prune_mission_events(older_than=60) == 0
+    assert db.prune_mission_events(older_than=60, now=time.time() + 120) == 1
+
+
+def test_worker_processes_share_queue(worker_db):
+    """Several `python -m ajson.worker` processes run each mission exactly once"""
+    db.migrate()
+    mission_ids = [db.create_mission("Worker", f"Run pytest tests {i}") for i in range(6)]
+    for mission_id in mission_ids:
+        db.enqueue_mission_job(mission_id)
+
+    env = dict(os.environ, DB_PATH=worker_db, JOB_POLL_SECONDS="0.05", PYTHONPATH=REPO_ROOT)
+    workers = [
+        subprocess.Popen([sys.executable, "-m", "ajson.worker", "--concurrency", "2"], env=env, cwd=REPO_ROOT)
+        for _ in range(2)
+    ]
+    try:
+        assert _wait_for(
+            lambda: all(db.get_mission(m)["status"] == MissionStatus.DONE for m in mission_ids),
+            timeout=60
+        )
+    finally:
+        for worker in workers:
+            worker.terminate()
+        exit_codes = [worker.wait(timeout=30) for worker in workers]
+
+    assert exit_codes == [0, 0]
+    assert db.count_mission_jobs() == 0
+    for mission_id in mission_ids:
+        roles = [s["role"] for s in db.get_steps_by_mission(mission_id)]
+        assert roles.count("jarvis") == 1, roles
+
+
+@pytest.mark.parametrize("exitcodes, status", [
+    ([0, 0], 0),
+    ([0, -9, 0], 137),  # OOM-killed child
+    ([0, 3, 1], 3),
+    ([None, 0], 0),
+])
+def test_supervisor_exit_status(exitcodes, status):
+    """Any failed or signal-killed child makes the supervisor fail"""
+    assert _exit_status(exitcodes) == status